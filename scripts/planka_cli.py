@@ -1,22 +1,177 @@
+import base64
+import contextvars
+import io
+import itertools
 import json
 import os
+import re
 import shutil
+import socket
 import sys
-from datetime import datetime
+import threading
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import click
 import typer
-from plankapy.v2 import Card, Planka
-from rich.console import Console
-from rich.table import Table
 from typer.core import TyperGroup
 
+if TYPE_CHECKING:
+    # httpx, plankapy and rich are imported where they are first needed, so `--help`,
+    # `login`, `logout`, shell completion and daemon forwarding never load them.
+    import sqlite3
+
+    import httpx
+    from plankapy.v2 import Card, Planka
+    from plankapy.v2 import List as PlankaList
+    from rich.table import Table
+
 TOKEN_ENV_VAR = "PLANKATOKENS"
 DEFAULT_TOKEN_DIR = Path.home() / ".config" / "planka-cli" / "tokens"
 CREDENTIALS_FILENAME = "credentials.json"
+SESSION_FILENAME = "session.json"
+CONFIG_FILENAME = "config.json"
+# Named profiles live in their own directories under the tokenstore's profiles/ directory.
+PROFILES_DIRNAME = "profiles"
+DEFAULT_PROFILE = "default"
+PROFILE_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+# Transport settings; config.json's "http" object and PLANKA_HTTP_<NAME> env vars override them.
+HTTP_CONFIG_DEFAULTS: dict[str, Union[int, float]] = {
+    "connect_timeout": 5.0,
+    "read_timeout": 30.0,
+    "max_connections": 10,
+    "keepalive_expiry": 30.0,
+    "retries": 3,
+    "backoff": 0.5,
+    "max_backoff": 30.0,
+    # Opt-in response cache for GETs; TTLs are seconds a response is served without asking.
+    "cache": False,
+    "cache_max_bytes": 50 * 1024 * 1024,
+    "cache_ttl_projects": 300.0,
+    "cache_ttl_boards": 60.0,
+    "cache_ttl_lists": 60.0,
+    "cache_ttl_cards": 30.0,
+    "cache_ttl_comments": 30.0,
+    "cache_ttl_notifications": 15.0,
+    "cache_ttl_users": 300.0,
+}
+CACHE_FILENAME = "cache.sqlite3"
+CACHE_STAT_NAMES = ("hits", "revalidated", "misses", "bytes_saved")
+HTTP_RETRY_STATUSES = {429, 502, 503, 504}
+HTTP_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+SESSION_EXPIRY_SKEW_SECONDS = 60
+INDEX_FILENAME = "index.json"
+INDEX_FIELDS: dict[str, tuple[str, ...]] = {
+    "boards": ("id", "name", "projectId", "position"),
+    "lists": ("id", "name", "boardId", "position", "type"),
+    "cards": ("id", "name", "listId", "boardId", "position"),
+}
+INDEX_PATH_PATTERN = re.compile(r"/api/(boards|lists|cards)/([^/]+)$")
+# Most ID suggestions offered per Tab press.
+COMPLETION_LIMIT = 100
+# Gap between consecutive card positions, as used by Planka and plankapy.
+POSITION_GAP = 65536
+COMMENTS_PAGE_SIZE = 50
+BOARD_EXPORT_VERSION = 1
+# Board payload collections, in the order an import has to recreate them.
+BOARD_EXPORT_KINDS = ("labels", "lists", "cards", "cardLabels", "taskLists", "tasks", "attachments")
+BOARD_IMPORT_BATCH = 64
+# Attachment transfers move files through memory this many bytes at a time.
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+MIRROR_FILENAME = "mirror.sqlite3"
+# Board-scoped mirror tables: table -> (key in getBoard's `included`, column -> schema field).
+MIRROR_BOARD_TABLES: dict[str, tuple[str, dict[str, str]]] = {
+    "lists": ("lists", {"name": "name", "position": "position", "type": "type"}),
+    "cards": (
+        "cards",
+        {
+            "list_id": "listId",
+            "name": "name",
+            "position": "position",
+            "comments_count": "commentsCount",
+        },
+    ),
+    "labels": ("labels", {"name": "name", "color": "color"}),
+    "board_memberships": ("boardMemberships", {"user_id": "userId", "role": "role"}),
+    "card_labels": ("cardLabels", {"card_id": "cardId", "label_id": "labelId"}),
+    "card_memberships": ("cardMemberships", {"card_id": "cardId", "user_id": "userId"}),
+    "attachments": ("attachments", {"card_id": "cardId", "name": "name"}),
+}
 TOKENSTORE_OVERRIDE: Optional[str] = None
+VERBOSE = False
+OUTPUT_FORMATS = ("table", "json", "ndjson", "tsv")
+OUTPUT_FORMAT = "table"
+OUTPUT_FIELDS: Optional[list[str]] = None
+OFFLINE = False
+NO_CACHE = False
+CACHE_REFRESH = False
+SESSION_STATS: dict[str, int] = {"reused": 0, "logins": 0, "refreshes": 0}
+HTTP_STATS: dict[str, int] = {"requests": 0, "retries": 0, "bytes_sent": 0, "bytes_received": 0}
+CACHE_STATS: dict[str, int] = dict.fromkeys(CACHE_STAT_NAMES, 0)
+PLANKA_SESSIONS: dict[tuple[str, str, str], "Planka"] = {}
+COMMAND_ERRORS: list[str] = []
+ID_INDEX_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+# Indexes changed by the running command, written once by flush_id_index when it ends.
+ID_INDEX_PENDING: dict[Path, dict] = {}
+JSON_FILE_CACHE: dict[Path, tuple[tuple[int, int], object]] = {}
+# The profile whose tokenstore directory is in use. A context variable, so --all-profiles
+# workers (and the fan-outs they start) each see their own.
+ACTIVE_PROFILE: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "ACTIVE_PROFILE", default=None
+)
+# Fan-out workers update the index and counters from several threads.
+ID_INDEX_LOCK = threading.RLock()
+STATS_LOCK = threading.Lock()
+# True in fan-out workers: a fan-out started there runs serially, so nested fan-outs (a
+# card per worker, its sub-resources within) stay within --concurrency threads in total.
+IN_FAN_OUT: contextvars.ContextVar[bool] = contextvars.ContextVar("IN_FAN_OUT", default=False)
+DEFAULT_CONCURRENCY = 8
+CONCURRENCY = DEFAULT_CONCURRENCY
+# How fan-out commands run their parallel reads: a thread pool, or one asyncio client.
+ENGINES = ("threads", "async")
+ENGINE = "threads"
+DAEMON_SOCKET_FILENAME = "daemon.sock"
+# Files that belong to one profile, removed by logout. config.json and the daemon socket
+# live in the tokenstore root and are shared by every profile.
+PROFILE_FILENAMES = (
+    CREDENTIALS_FILENAME,
+    SESSION_FILENAME,
+    INDEX_FILENAME,
+    CACHE_FILENAME,
+    MIRROR_FILENAME,
+)
+SQLITE_SIDE_FILE_SUFFIXES = ("-journal", "-wal", "-shm")
+DAEMON_DISABLE_ENV_VAR = "PLANKA_NO_DAEMON"
+# Command paths that always run in-process: local state, or long-running and streaming
+# output that the daemon could only return once the command has finished.
+DAEMON_LOCAL_COMMANDS = {
+    ("daemon",),
+    ("login",),
+    ("logout",),
+    ("batch",),
+    ("notifications", "watch"),
+    ("cards", "attach"),
+    ("cards", "attachments"),
+}
+# How long a client waits for a busy daemon to pick up its command before running in-process.
+DAEMON_ACCEPT_TIMEOUT = 0.5
+# Global options that take a separate value, so argv scanning can skip over it.
+GLOBAL_VALUE_OPTIONS = {
+    "--output",
+    "--fields",
+    "--concurrency",
+    "--engine",
+    "--trace-file",
+    "--profile",
+}
+# Completed HTTP requests while --trace is on (None when off), timed from TRACE_EPOCH.
+TRACE_EVENTS: Optional[list[dict]] = None
+TRACE_FILE: Optional[Path] = None
+TRACE_EPOCH = 0.0
+TRACE_SLOWEST = 5
 
 
 class HelpOnUnknownCommandGroup(TyperGroup):
@@ -27,34 +182,317 @@ class HelpOnUnknownCommandGroup(TyperGroup):
             ctx.exit(2)
         return command
 
+    def _main_shell_completion(self, ctx_args, prog_name: str, complete_var=None) -> None:
+        complete_var = complete_var or f"_{prog_name}_COMPLETE".replace("-", "_").upper()
+        if os.environ.get(complete_var):
+            install_plain_completion()
+        super()._main_shell_completion(ctx_args, prog_name, complete_var)
+
+
+def install_plain_completion() -> None:
+    """Register zsh and fish completion that prints help texts as they are.
+
+    Typer's own classes render every help text through rich to strip markup, which imports
+    rich on each Tab press and costs more than the rest of completion. This CLI's help
+    texts carry no markup. Typer's classes are internal (pyproject pins typer and click
+    below their next minor releases); if they move, Typer's own completion is kept.
+    """
+    import click.shell_completion
+
+    try:
+        from typer import _completion_classes
+
+        zsh_base, fish_base = _completion_classes.ZshComplete, _completion_classes.FishComplete
+    except (ImportError, AttributeError):
+        return
+
+    class ZshComplete(zsh_base):
+        def format_completion(self, item: click.shell_completion.CompletionItem) -> str:
+            def escape(text: str) -> str:
+                return (
+                    text.replace('"', '""')
+                    .replace("'", "''")
+                    .replace("$", "\\$")
+                    .replace("`", "\\`")
+                    .replace(":", r"\\:")
+                )
+
+            if item.help:
+                return f'"{escape(item.value)}":"{escape(item.help)}"'
+            return f'"{escape(item.value)}"'
+
+    class FishComplete(fish_base):
+        def format_completion(self, item: click.shell_completion.CompletionItem) -> str:
+            if item.help:
+                return f"{item.value}\t{' '.join(item.help.split())}"
+            return f"{item.value}"
+
+    click.shell_completion.add_completion_class(ZshComplete, "zsh")
+    click.shell_completion.add_completion_class(FishComplete, "fish")
+
+
+class LazyConsole:
+    """A rich Console that is only built (and rich only imported) on first use."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.console = None
+
+    def __getattr__(self, name: str):
+        if self.console is None:
+            from rich.console import Console
+
+            self.console = Console(**self.options)
+        return getattr(self.console, name)
+
 
 app = typer.Typer(cls=HelpOnUnknownCommandGroup)
-console = Console()
+console = LazyConsole()
+err_console = LazyConsole(stderr=True)
 projects_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage projects")
 boards_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage boards")
 lists_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage lists")
 cards_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage cards")
+attachments_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage card attachments")
 notifications_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage notifications")
+daemon_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage the background daemon")
+cache_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage the response cache")
+profiles_app = typer.Typer(cls=HelpOnUnknownCommandGroup, help="Manage named profiles")
 app.add_typer(projects_app, name="projects")
 app.add_typer(boards_app, name="boards")
 app.add_typer(lists_app, name="lists")
 app.add_typer(cards_app, name="cards")
+cards_app.add_typer(attachments_app, name="attachments")
 app.add_typer(notifications_app, name="notifications")
+app.add_typer(daemon_app, name="daemon")
+app.add_typer(cache_app, name="cache")
+app.add_typer(profiles_app, name="profiles")
 
 
 @app.callback(invoke_without_command=True)
 def main(
     ctx: typer.Context,
     tokenstore: Optional[str] = typer.Option(None, "--tokenstore", help="Token storage path."),
+    profile: Optional[str] = typer.Option(
+        None,
+        "--profile",
+        envvar="PLANKA_PROFILE",
+        help="Use the named profile's credentials and caches (see `profiles list`).",
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Print diagnostics to stderr."),
+    output: str = typer.Option(
+        "table",
+        "--output",
+        click_type=click.Choice(OUTPUT_FORMATS),
+        help="Output format for listings.",
+    ),
+    fields: Optional[str] = typer.Option(
+        None, "--fields", help="Comma-separated fields to output (e.g. id,name)."
+    ),
+    offline: bool = typer.Option(
+        False, "--offline", help="Answer read commands from the local mirror (see `sync`)."
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_CONCURRENCY,
+        "--concurrency",
+        min=1,
+        help="Maximum parallel requests when walking projects, boards or cards.",
+    ),
+    engine: str = typer.Option(
+        "threads",
+        "--engine",
+        envvar="PLANKA_ENGINE",
+        click_type=click.Choice(ENGINES),
+        help="Run parallel reads on a thread pool or on one asyncio connection pool.",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the response cache."),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Revalidate cached responses instead of trusting their TTL."
+    ),
+    trace: bool = typer.Option(
+        False, "--trace", help="Time every HTTP request and print a summary to stderr."
+    ),
+    trace_file: Optional[Path] = typer.Option(
+        None,
+        "--trace-file",
+        dir_okay=False,
+        help="With tracing, also write a Chrome trace-event JSON file (implies --trace).",
+    ),
 ):
     """Planka CLI."""
-    global TOKENSTORE_OVERRIDE
+    global TOKENSTORE_OVERRIDE, VERBOSE, OUTPUT_FORMAT, OUTPUT_FIELDS, OFFLINE, CONCURRENCY
+    global NO_CACHE, CACHE_REFRESH, TRACE_EVENTS, TRACE_FILE, TRACE_EPOCH, ENGINE
     TOKENSTORE_OVERRIDE = tokenstore
+    reset_stats()
+    ctx.call_on_close(flush_id_index)
+    OFFLINE = offline
+    CONCURRENCY = concurrency
+    ENGINE = engine
+    if profile is not None and profile != DEFAULT_PROFILE:
+        if not PROFILE_NAME_PATTERN.fullmatch(profile):
+            raise typer.BadParameter(
+                "Use letters, digits, '.', '_' and '-'.", param_hint="--profile"
+            )
+        ACTIVE_PROFILE.set(profile)
+    else:
+        ACTIVE_PROFILE.set(None)
+    NO_CACHE = no_cache
+    CACHE_REFRESH = refresh
+    VERBOSE = verbose
+    OUTPUT_FORMAT = output
+    OUTPUT_FIELDS = (
+        [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    )
+    TRACE_FILE = trace_file
+    TRACE_EVENTS = [] if trace or trace_file else None
+    if TRACE_EVENTS is not None:
+        TRACE_EPOCH = time.perf_counter()
+        ctx.call_on_close(report_trace)
+    if verbose:
+        ctx.call_on_close(print_verbose_stats)
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
 
 
-def get_token_dir(tokenstore: Optional[str] = None) -> Path:
+def reset_stats() -> None:
+    """Zero the --verbose counters, so a daemon reports each command on its own."""
+    with STATS_LOCK:
+        for stats in (SESSION_STATS, HTTP_STATS, CACHE_STATS):
+            stats.update(dict.fromkeys(stats, 0))
+
+
+def print_verbose_stats() -> None:
+    if any(SESSION_STATS.values()):
+        state = "reused" if SESSION_STATS["reused"] else "new"
+        err_console.print(
+            f"[dim]Session: {state} (reused={SESSION_STATS['reused']}, "
+            f"logins={SESSION_STATS['logins']}, refreshes={SESSION_STATS['refreshes']})[/dim]"
+        )
+    if HTTP_STATS["requests"]:
+        err_console.print(
+            f"[dim]HTTP: {HTTP_STATS['requests']} requests, {HTTP_STATS['retries']} retries, "
+            f"{HTTP_STATS['bytes_sent']} bytes sent, "
+            f"{HTTP_STATS['bytes_received']} bytes received[/dim]"
+        )
+    if any(CACHE_STATS.values()):
+        err_console.print(
+            f"[dim]Cache: {CACHE_STATS['hits']} hits, {CACHE_STATS['revalidated']} revalidated, "
+            f"{CACHE_STATS['misses']} misses, {CACHE_STATS['bytes_saved']} bytes saved[/dim]"
+        )
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    import math
+
+    rank = math.ceil(fraction * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def trace_endpoint(event: dict) -> str:
+    """Method and path with IDs folded, so /api/cards/1 and /api/cards/2 group together."""
+    segments = ["{id}" if part.isdigit() else part for part in event["path"].split("/")]
+    return f"{event['method']} {'/'.join(segments)}"
+
+
+def report_trace() -> None:
+    """Print the --trace summary and write the Chrome trace file, if one was asked for."""
+    events = sorted(TRACE_EVENTS or [], key=lambda event: event["start"])
+    wall = time.perf_counter() - TRACE_EPOCH
+    if TRACE_FILE is not None:
+        write_chrome_trace(TRACE_FILE, events, wall)
+    if not events:
+        err_console.print(f"[dim]Trace: no HTTP requests ({wall * 1000:.0f} ms).[/dim]")
+        return
+    durations = sorted(event["duration"] for event in events)
+    cached = sum(1 for event in events if event.get("cache"))
+    err_console.print(
+        f"[dim]Trace: {len(events)} requests ({cached} from cache) in {wall * 1000:.0f} ms; "
+        f"latency total {sum(durations) * 1000:.0f} ms, p50 {percentile(durations, 0.5) * 1000:.0f} "
+        f"ms, p95 {percentile(durations, 0.95) * 1000:.0f} ms; "
+        f"{sum(event['bytes'] for event in events)} bytes received[/dim]"
+    )
+    endpoints: dict[str, dict] = {}
+    for event in events:
+        entry = endpoints.setdefault(
+            trace_endpoint(event), {"calls": 0, "total": 0.0, "max": 0.0, "callers": {}}
+        )
+        entry["calls"] += 1
+        entry["total"] += event["duration"]
+        entry["max"] = max(entry["max"], event["duration"])
+        entry["callers"][event["caller"]] = None
+    table = make_table("Slowest endpoints")
+    table.add_column("Endpoint", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Called from")
+    ranked = sorted(endpoints.items(), key=lambda item: item[1]["total"], reverse=True)
+    for endpoint, entry in ranked[:TRACE_SLOWEST]:
+        table.add_row(
+            endpoint,
+            str(entry["calls"]),
+            f"{entry['total'] * 1000:.0f}",
+            f"{entry['max'] * 1000:.0f}",
+            ", ".join(entry["callers"]),
+        )
+    err_console.print(table)
+
+
+def write_chrome_trace(path: Path, events: list[dict], wall: float) -> None:
+    """Write complete ("X") events in the Chrome trace-event format (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    trace_events = [
+        {
+            "name": " ".join(sys.argv[1:]) or "planka-cli",
+            "cat": "command",
+            "ph": "X",
+            "ts": 0,
+            "dur": round(wall * 1e6),
+            "pid": pid,
+            "tid": threading.main_thread().ident,
+        }
+    ]
+    for event in events:
+        trace_events.append(
+            {
+                "name": f"{event['method']} {event['path']}",
+                "cat": "http",
+                "ph": "X",
+                "ts": round(event["start"] * 1e6),
+                "dur": round(event["duration"] * 1e6),
+                "pid": pid,
+                "tid": event["thread"],
+                "args": {
+                    key: event[key]
+                    for key in ("status", "bytes", "caller", "cache")
+                    if key in event
+                },
+            }
+        )
+    try:
+        path.write_text(json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}))
+    except OSError as exc:
+        err_console.print(f"[red]Could not write trace file {path}: {exc}[/red]")
+
+
+def diagnostics_console():
+    """Where errors go: stdout for tables, stderr when stdout carries JSON, NDJSON or TSV."""
+    return console if OUTPUT_FORMAT == "table" else err_console
+
+
+def print_error(message: object, label: str = "Error") -> None:
+    COMMAND_ERRORS.append(str(message))
+    diagnostics_console().print(f"[bold red]{label}:[/bold red] {message}")
+
+
+def print_not_found(message: str) -> None:
+    COMMAND_ERRORS.append(message)
+    diagnostics_console().print(f"[red]{message}[/red]")
+
+
+def get_token_root(tokenstore: Optional[str] = None) -> Path:
+    """The tokenstore itself: default profile files, config.json and the profiles/ directory."""
     if tokenstore:
         return Path(tokenstore).expanduser().resolve()
     if TOKENSTORE_OVERRIDE:
@@ -65,721 +503,4419 @@ def get_token_dir(tokenstore: Optional[str] = None) -> Path:
     return DEFAULT_TOKEN_DIR
 
 
-def get_credentials_path(tokenstore: Optional[str] = None) -> Path:
-    return get_token_dir(tokenstore) / CREDENTIALS_FILENAME
+def get_token_dir(tokenstore: Optional[str] = None) -> Path:
+    """Where the active profile keeps credentials, session, ID index, cache and mirror."""
+    profile = ACTIVE_PROFILE.get()
+    root = get_token_root(tokenstore)
+    return root / PROFILES_DIRNAME / profile if profile else root
 
 
-def load_stored_credentials(tokenstore: Optional[str] = None) -> dict[str, str]:
-    credentials_path = get_credentials_path(tokenstore)
-    if not credentials_path.exists():
-        return {}
+def list_profiles(tokenstore: Optional[str] = None) -> list[str]:
+    """Profile names with stored credentials; "default" stands for the tokenstore itself."""
+    root = get_token_root(tokenstore)
+    profiles = [DEFAULT_PROFILE] if (root / CREDENTIALS_FILENAME).exists() else []
     try:
-        data = json.loads(credentials_path.read_text())
-    except json.JSONDecodeError as exc:
-        console.print(
-            f"[bold red]Error:[/bold red] Invalid credentials file at {credentials_path}: {exc}"
-        )
-        raise typer.Exit(1) from exc
-    if not isinstance(data, dict):
-        console.print(
-            f"[bold red]Error:[/bold red] Credentials file at {credentials_path} must be a JSON object."
-        )
-        raise typer.Exit(1)
-    return {str(key): str(value) for key, value in data.items()}
+        entries = sorted((root / PROFILES_DIRNAME).iterdir())
+    except OSError:
+        entries = []
+    profiles.extend(
+        entry.name
+        for entry in entries
+        if PROFILE_NAME_PATTERN.fullmatch(entry.name)
+        and entry.name != DEFAULT_PROFILE
+        and (entry / CREDENTIALS_FILENAME).exists()
+    )
+    return profiles
 
 
-def get_env_config() -> tuple[Optional[str], Optional[str], Optional[str]]:
-    planka_url = os.getenv("PLANKA_URL")
-    planka_username = os.getenv("PLANKA_USERNAME")
-    planka_password = os.getenv("PLANKA_PASSWORD")
+def read_json_file(path: Path) -> object:
+    """Parse a JSON file, reusing the last parse while its mtime and size are unchanged.
 
-    if planka_url and planka_username and planka_password:
-        return planka_url, planka_username, planka_password
+    Credentials and settings are read once per process even when a daemon or batch runs
+    many commands, and still picked up as soon as `login` rewrites them.
+    """
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = JSON_FILE_CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    data = json.loads(path.read_text())
+    JSON_FILE_CACHE[path] = (key, data)
+    return data
 
-    stored = load_stored_credentials()
-    if not planka_url:
-        planka_url = stored.get("PLANKA_URL")
-    if not planka_username:
-        planka_username = stored.get("PLANKA_USERNAME")
-    if not planka_password:
-        planka_password = stored.get("PLANKA_PASSWORD")
 
-    return planka_url, planka_username, planka_password
+def get_credentials_path(tokenstore: Optional[str] = None) -> Path:
+    return get_token_dir(tokenstore) / CREDENTIALS_FILENAME
 
 
-def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
-    if value is None:
-        return None
-    candidate = value.strip()
-    if candidate.endswith("Z"):
-        candidate = f"{candidate[:-1]}+00:00"
-    try:
-        return datetime.fromisoformat(candidate)
-    except ValueError as exc:
-        raise typer.BadParameter(
-            "Invalid datetime. Use ISO-8601 like 2025-01-31 or 2025-01-31T10:30:00Z."
-        ) from exc
+def get_session_path(tokenstore: Optional[str] = None) -> Path:
+    return get_token_dir(tokenstore) / SESSION_FILENAME
 
 
-def parse_position(value: Optional[str]) -> Optional[Union[str, int]]:
-    if value is None:
-        return None
-    normalized = value.strip().lower()
-    if normalized in ("top", "bottom"):
-        return normalized
+def token_expiry(token: str) -> Optional[float]:
+    """Return the `exp` claim of a JWT access token without verifying it."""
     try:
-        return int(value)
-    except ValueError as exc:
-        raise typer.BadParameter("Position must be 'top', 'bottom', or an integer.") from exc
-
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
 
-def find_list(planka: Planka, list_id: str):
-    for project in planka.projects:
-        for board in project.boards:
-            for list_item in board.lists:
-                if list_item.id == list_id:
-                    return list_item
-    return None
 
+def load_session(planka_url: str, planka_username: str) -> dict:
+    """Load the cached session for this URL/user, or {} if missing, stale, or expired."""
+    session_path = get_session_path()
+    try:
+        data = json.loads(session_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or not isinstance(data.get("token"), str):
+        return {}
+    if data.get("url") != planka_url or data.get("username") != planka_username:
+        return {}
+    expires_at = data.get("expires_at")
+    if (
+        isinstance(expires_at, (int, float))
+        and expires_at - SESSION_EXPIRY_SKEW_SECONDS < time.time()
+    ):
+        return {}
+    return data
 
-def find_list_with_board(planka: Planka, list_id: str):
-    """Find a list and return both the list and its parent board."""
-    for project in planka.projects:
-        for board in project.boards:
-            for list_item in board.lists:
-                if list_item.id == list_id:
-                    return list_item, board
-    return None, None
 
+def write_file_atomic(path: Path, text: str) -> None:
+    """Replace path with text in one step, so a concurrent reader sees the old file or the
+    new one, never half of it. The file is only readable by the user."""
+    import tempfile
 
-def get_card_by_id(planka: Planka, card_id: str) -> Optional[Card]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
     try:
-        card_data = planka.endpoints.getCard(card_id)["item"]
-    except Exception:
-        return None
-    return Card(card_data, planka)
+        with os.fdopen(fd, "w") as temp_file:
+            temp_file.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
 
 
-def make_table(title: str) -> Table:
-    return Table(
-        title=title,
-        show_header=True,
-        header_style="bold",
-        show_edge=False,
-        show_lines=False,
-        box=None,
-    )
-
+def save_session(session: dict) -> None:
+    try:
+        write_file_atomic(get_session_path(), json.dumps(session, indent=2) + "\n")
+    except OSError:
+        # A session we cannot persist only costs a login on the next run.
+        pass
 
-def render_notifications(title: str, notifications: list) -> None:
-    if not notifications:
-        console.print("No notifications found.")
-        return
 
-    table = make_table(title)
-    table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-    table.add_column("Type", style="magenta")
-    table.add_column("Read", justify="center")
-    table.add_column("Created At", justify="right")
-    table.add_column("Card ID", justify="right")
+def clear_session() -> None:
+    try:
+        get_session_path().unlink()
+    except OSError:
+        pass
 
-    for notification in notifications:
-        card_id = notification.schema.get("cardId")
-        table.add_row(
-            str(notification.id),
-            str(notification.type),
-            "yes" if notification.is_read else "no",
-            str(notification.created_at),
-            str(card_id),
-        )
 
-    console.print(table)
+def get_index_path(tokenstore: Optional[str] = None) -> Path:
+    return get_token_dir(tokenstore) / INDEX_FILENAME
 
 
-def get_planka() -> Planka:
-    planka_url, planka_username, planka_password = get_env_config()
-    if not planka_url or not planka_username or not planka_password:
-        credentials_path = get_credentials_path()
-        console.print(
-            "[bold red]Error:[/bold red] Missing credentials. "
-            f"Set PLANKA_URL, PLANKA_USERNAME, and PLANKA_PASSWORD or run "
-            f"`planka-cli login --url ... --username ... --password ...` "
-            f"to write {credentials_path}."
-        )
-        sys.exit(1)
+def empty_id_index(planka_url: str) -> dict:
+    return {"url": planka_url, **{kind: {} for kind in INDEX_FIELDS}}
 
-    try:
-        planka = Planka(planka_url)
-        planka.login(username=planka_username, password=planka_password)
-        return planka
-    except Exception as e:
-        console.print(f"[bold red]Connection Error:[/bold red] {e}")
-        sys.exit(1)
 
+def load_id_index(planka_url: Optional[str] = None) -> dict:
+    """Load the ID index, starting over when it belongs to another instance.
 
-@app.command()
-def login(
-    url: str = typer.Option(..., "--url", "-u", help="Planka base URL"),
-    username: str = typer.Option(..., "--username", "-n", help="Planka username"),
-    password: str = typer.Option(..., "--password", "-p", help="Planka password"),
-):
-    """Store credentials in ~/.config/planka-cli/tokens/credentials.json."""
-    credentials_path = get_credentials_path()
+    Changes not yet flushed by this command take precedence over the file.
+    """
+    index_path = get_index_path()
+    data = ID_INDEX_PENDING.get(index_path)
     try:
-        credentials_path.parent.mkdir(parents=True, exist_ok=True)
-        credentials_path.write_text(
-            json.dumps(
-                {
-                    "PLANKA_URL": url,
-                    "PLANKA_USERNAME": username,
-                    "PLANKA_PASSWORD": password,
-                },
-                indent=2,
-            )
-            + "\n"
-        )
-    except OSError as e:
-        console.print(f"[bold red]Error:[/bold red] Could not write {credentials_path}: {e}")
-        raise typer.Exit(1)
+        if data is None:
+            stat = index_path.stat()
+            cached = ID_INDEX_CACHE.get(index_path)
+            if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+                data = cached[1]
+            else:
+                data = json.loads(index_path.read_text())
+                ID_INDEX_CACHE[index_path] = ((stat.st_mtime_ns, stat.st_size), data)
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or (planka_url is not None and data.get("url") != planka_url):
+        return empty_id_index(planka_url or "")
+    for kind in INDEX_FIELDS:
+        if not isinstance(data.get(kind), dict):
+            data[kind] = {}
+    return data
 
-    try:
-        os.chmod(credentials_path, 0o600)
-    except OSError:
-        pass
 
-    console.print(f"[green]Saved credentials to[/green] {credentials_path}")
+def save_id_index(index: dict) -> None:
+    """Stage a changed index; it is written once, when the command ends."""
+    with ID_INDEX_LOCK:
+        ID_INDEX_PENDING[get_index_path()] = index
 
 
-@app.command()
-def logout():
-    """Delete the stored ~/.config/planka-cli/tokens/credentials.json file."""
-    token_dir = get_token_dir()
-    credentials_path = get_credentials_path()
-    if not credentials_path.exists():
-        console.print(f"No stored credentials found at {credentials_path}")
-        return
+def flush_id_index() -> None:
+    """Write every index the command changed, each in one atomic replace."""
+    with ID_INDEX_LOCK:
+        pending = dict(ID_INDEX_PENDING)
+        ID_INDEX_PENDING.clear()
+        for index_path, index in pending.items():
+            try:
+                write_file_atomic(index_path, json.dumps(index, separators=(",", ":")))
+                stat = index_path.stat()
+                ID_INDEX_CACHE[index_path] = ((stat.st_mtime_ns, stat.st_size), index)
+            except OSError:
+                # The index is only a cache; lookups fall back to targeted fetches.
+                pass
 
-    try:
-        shutil.rmtree(token_dir)
-    except OSError as e:
-        console.print(f"[bold red]Error:[/bold red] Could not delete {credentials_path}: {e}")
-        raise typer.Exit(1)
 
-    console.print("[green]Logged out.[/green] Removed stored credentials.")
+def index_put(planka: "Planka", kind: str, schemas) -> None:
+    """Merge freshly fetched schemas into the ID index."""
+    with ID_INDEX_LOCK:
+        index = load_id_index(str(planka.client.base_url))
+        for schema in schemas:
+            if isinstance(schema, dict) and schema.get("id"):
+                entry = {key: schema[key] for key in INDEX_FIELDS[kind] if key in schema}
+                index[kind][str(schema["id"])] = entry
+        save_id_index(index)
 
 
-@app.command()
-def status():
-    """Check connection and print current user info."""
-    planka = get_planka()
-    try:
-        user = planka.me
-        console.print(
-            f"[green]Connected![/green] Logged in as: [bold]{user.username}[/bold] (ID: {user.id})"
-        )
-        if user.name:
-            console.print(f"Name: {user.name}")
-        console.print(f"Email: {user.email}")
-    except Exception as e:
-        console.print(f"[bold red]Error fetching status:[/bold red] {e}")
+def index_get(planka: "Planka", kind: str, item_id: str) -> Optional[dict]:
+    # Under the lock, so a fan-out worker never reads the file while another rewrites it.
+    with ID_INDEX_LOCK:
+        entry = load_id_index(str(planka.client.base_url))[kind].get(item_id)
+    return dict(entry) if isinstance(entry, dict) else None
 
 
-@projects_app.command("list")
-def list_projects():
-    """List all projects."""
-    planka = get_planka()
-    try:
-        projects = planka.projects
-        if not projects:
-            console.print("No projects found.")
-            return
+def index_forget(kind: str, item_id: str) -> None:
+    with ID_INDEX_LOCK:
+        index = load_id_index()
+        if index[kind].pop(item_id, None) is not None:
+            save_id_index(index)
 
-        table = make_table("Projects")
-        table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Name", style="magenta")
-        table.add_column("Created At", justify="right")
 
-        for p in projects:
-            table.add_row(str(p.id), p.name, str(p.created_at))
+def forget_missing_ids(response: "httpx.Response") -> None:
+    """Response hook: drop index entries whose lookup by ID returned 404."""
+    if response.status_code != 404 or response.request.method != "GET":
+        return
+    match = INDEX_PATH_PATTERN.search(response.request.url.path)
+    if match:
+        index_forget(match.group(1), match.group(2))
 
-        console.print(table)
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
 
+def complete_ids(kind: str):
+    """Build an autocompletion callback offering `kind` IDs from the ID index, with names.
 
-@boards_app.command("list")
-def list_boards(
-    project_id: Optional[str] = typer.Argument(None, help="Project ID to filter by"),
-):
-    """List boards. Optionally filter by Project ID."""
-    planka = get_planka()
-    try:
-        if project_id is not None:
-            # Find specific project
-            project = next((p for p in planka.projects if p.id == project_id), None)
-            if not project:
-                console.print(f"[red]Project {project_id} not found.[/red]")
-                return
-            boards_list = project.boards
-            title = f"Boards in Project {project.name}"
-        else:
-            # List all boards from all projects the user has access to
-            # plankapy doesn't have a direct 'all_boards', so we iterate projects
-            boards_list = []
-            for p in planka.projects:
-                boards_list.extend(p.boards)
-            title = "All Boards"
+    Completion runs on every Tab press, so it only reads index.json, which commands update
+    whenever they fetch boards, lists or cards: no request and no plankapy import. A board,
+    list or card already given on the command line narrows the suggestions to it.
+    """
 
-        if not boards_list:
-            console.print("No boards found.")
-            return
+    def complete(ctx: click.Context, incomplete: str) -> list[tuple[str, str]]:
+        options = ctx.find_root().params
+        profile = options.get("profile")
+        token = ACTIVE_PROFILE.set(profile if profile != DEFAULT_PROFILE else None)
+        try:
+            index = json.loads(get_index_path(options.get("tokenstore")).read_text())
+            entries = index[kind]
+            cards = index.get("cards", {})
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+        finally:
+            ACTIVE_PROFILE.reset(token)
+        params = dict(ctx.params)
+        # An option still waiting for its value stops parsing, leaving positionals in args.
+        missing = [
+            param.name
+            for param in ctx.command.params
+            if isinstance(param, click.Argument) and params.get(param.name) is None
+        ]
+        params.update(zip(missing, ctx.args))
+        scope: dict[str, set] = {}
+        board_ids = params.get("board_id") or params.get("board_ids")
+        list_ids = params.get("list_id") or params.get("list_ids")
+        card_id = params.get("card_id")
+        if kind == "lists" and not board_ids and card_id in cards:
+            board_ids = cards[card_id].get("boardId")
+        if board_ids and kind != "boards":
+            scope["boardId"] = {board_ids} if isinstance(board_ids, str) else set(board_ids)
+        if list_ids and kind == "cards":
+            scope["listId"] = {list_ids} if isinstance(list_ids, str) else set(list_ids)
+        matches = [
+            (item_id, str(entry.get("name") or ""))
+            for item_id, entry in entries.items()
+            if item_id.startswith(incomplete)
+            and isinstance(entry, dict)
+            and all(entry.get(key) in values for key, values in scope.items())
+        ]
+        matches.sort(key=lambda match: (match[1].casefold(), match[0]))
+        return matches[:COMPLETION_LIMIT]
 
-        planka_url, _, _ = get_env_config()
-        table = make_table(title)
-        table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Name", style="magenta")
-        table.add_column("Project ID", justify="right")
-        table.add_column("URL", style="magenta")
-
-        for b in boards_list:
-            project_id_value = b.schema.get("projectId")
-            board_url = None
-            if planka_url and b.id:
-                board_url = f"{planka_url.rstrip('/')}/boards/{b.id}"
-            table.add_row(str(b.id), b.name, str(project_id_value), str(board_url or "-"))
+    return complete
 
-        console.print(table)
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
 
+def make_session_auth(planka_url: str, username: str, password: str) -> "httpx.Auth":
+    """Build the session auth; the class is defined here so httpx is imported lazily."""
+    import httpx
 
-@lists_app.command("list")
-def list_lists(board_id: str):
-    """List all lists in a board."""
-    planka = get_planka()
-    try:
-        # We need to find the board first to get its lists
-        # This is a bit inefficient in plankapy if we don't know the project, but we can search
-        target_board = None
-        for p in planka.projects:
-            for b in p.boards:
-                if b.id == board_id:
-                    target_board = b
-                    break
-            if target_board:
-                break
+    class SessionAuth(httpx.Auth):
+        """Bearer auth that reuses the cached access token and logs in again on a 401.
 
-        if not target_board:
-            console.print(f"[red]Board {board_id} not found.[/red]")
-            return
+        Only login responses are read by the flow (with read or aread, to suit the client),
+        so other responses can still be streamed. Logins hold login_lock and first check
+        whether another request already replaced the token, so concurrent requests that hit
+        a missing or expired token share one new token.
+        """
 
-        table = make_table(f"Lists in Board: {target_board.name}")
-        table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Name", style="magenta")
-        table.add_column("Board ID", justify="right")
-        table.add_column("Position", justify="right")
+        def __init__(self, planka_url: str, username: str, password: str):
+            self.planka_url = planka_url
+            self.username = username
+            self.password = password
+            self.session = load_session(planka_url, username)
+            self.token: Optional[str] = self.session.get("token")
+            self.login_lock = threading.Lock()
 
-        for list_item in target_board.lists:
-            table.add_row(
-                str(list_item.id), list_item.name, str(target_board.id), str(list_item.position)
+        def build_login_request(self) -> httpx.Request:
+            # No HTTP-only cookie: the bearer token alone must stay valid across processes.
+            return httpx.Request(
+                "POST",
+                f"{self.planka_url.rstrip('/')}/api/access-tokens",
+                json={
+                    "emailOrUsername": self.username,
+                    "password": self.password,
+                    "withHttpOnlyToken": False,
+                },
+                extensions={"planka_login": True},
             )
 
-        console.print(table)
-
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+        def accept_login(self, response: httpx.Response, stale: Optional[str]) -> None:
+            response.raise_for_status()
+            self.token = response.json()["item"]
+            self.session.update(
+                {
+                    "url": self.planka_url,
+                    "username": self.username,
+                    "token": self.token,
+                    "expires_at": token_expiry(self.token),
+                }
+            )
+            save_session(self.session)
+            with STATS_LOCK:
+                SESSION_STATS["refreshes" if stale else "logins"] += 1
 
+        def sync_login(self, stale: Optional[str]):
+            """Log in, unless another request has replaced the stale token meanwhile."""
+            with self.login_lock:
+                if self.token == stale:
+                    response = yield self.build_login_request()
+                    response.read()
+                    self.accept_login(response, stale)
 
-@cards_app.command("list")
-def list_cards(list_id: str):
-    """List all cards in a list."""
-    planka = get_planka()
-    try:
-        target_list, target_board = find_list_with_board(planka, list_id)
+        def sync_auth_flow(self, request: httpx.Request):
+            if self.token is None:
+                yield from self.sync_login(None)
+            sent_token = self.token
+            request.headers["Authorization"] = f"Bearer {sent_token}"
+            response = yield request
+            if response.status_code == 401:
+                yield from self.sync_login(sent_token)
+                request.headers["Authorization"] = f"Bearer {self.token}"
+                yield request
 
-        if not target_list:
-            console.print(f"[red]List {list_id} not found.[/red]")
-            return
+        async def async_auth_flow(self, request: httpx.Request):
+            import asyncio
 
-        planka_url, _, _ = get_env_config()
-        board_id = target_board.id if target_board else None
-        table = make_table(f"Cards in List: {target_list.name}")
-        table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Name", style="magenta")
-        table.add_column("List ID", justify="right")
-        table.add_column("Position", justify="right")
-        table.add_column("URL", style="magenta")
-
-        for c in target_list.cards:
-            card_url = None
-            if planka_url and board_id and c.id:
-                card_url = f"{planka_url.rstrip('/')}/boards/{board_id}/cards/{c.id}"
-            table.add_row(str(c.id), c.name, str(list_id), str(c.position), str(card_url or "-"))
+            async def acquire_login_lock() -> None:
+                # Polled rather than blocked on, so the event loop keeps running meanwhile.
+                while not self.login_lock.acquire(blocking=False):
+                    await asyncio.sleep(0.01)
 
-        console.print(table)
+            sent_token = self.token
+            for attempt in range(2):
+                if attempt or sent_token is None:
+                    await acquire_login_lock()
+                    try:
+                        if self.token == sent_token:
+                            response = yield self.build_login_request()
+                            await response.aread()
+                            self.accept_login(response, sent_token)
+                    finally:
+                        self.login_lock.release()
+                    sent_token = self.token
+                request.headers["Authorization"] = f"Bearer {sent_token}"
+                response = yield request
+                if response.status_code != 401:
+                    return
 
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+    return SessionAuth(planka_url, username, password)
 
 
-@cards_app.command("show")
-def show_card(card_id: str):
-    """Show details for a card."""
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def make_transport(
+    config: dict, transport: Optional["httpx.BaseTransport"] = None, asynchronous: bool = False
+) -> "httpx.BaseTransport":
+    """Build the retrying transport; defined here so httpx is imported lazily.
+
+    With asynchronous, the pool underneath is an AsyncHTTPTransport for an AsyncClient.
+    """
+    import asyncio
+    import random
+
+    import httpx
+
+    class CountingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+        """Count response bytes as they come off the wire (before decompression)."""
+
+        def __init__(self, stream):
+            self.stream = stream
+
+        def count(self, chunk: bytes) -> bytes:
+            with STATS_LOCK:
+                HTTP_STATS["bytes_received"] += len(chunk)
+            return chunk
+
+        def __iter__(self):
+            for chunk in self.stream:
+                yield self.count(chunk)
+
+        async def __aiter__(self):
+            async for chunk in self.stream:
+                yield self.count(chunk)
+
+        def close(self) -> None:
+            self.stream.close()
+
+        async def aclose(self) -> None:
+            await self.stream.aclose()
+
+    class RetryTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+        """Pooled keep-alive transport that retries transient failures with jittered backoff.
+
+        Idempotent requests are retried on connection errors, timeouts and 429/502/503/504.
+        Other requests are only retried when the server cannot have seen them: failed
+        connects and 429s. Retry-After is honored up to max_backoff.
+        """
+
+        def __init__(self, config: dict, transport: Optional[httpx.BaseTransport]):
+            self.config = config
+            limits = httpx.Limits(
+                max_connections=int(config["max_connections"]),
+                max_keepalive_connections=int(config["max_connections"]),
+                keepalive_expiry=config["keepalive_expiry"],
+            )
+            pool = httpx.AsyncHTTPTransport if asynchronous else httpx.HTTPTransport
+            self.transport = transport or pool(limits=limits)
+
+        def backoff(self, attempt: int) -> float:
+            # Full jitter keeps concurrent clients from retrying in lockstep.
+            ceiling = min(self.config["max_backoff"], self.config["backoff"] * 2**attempt)
+            return random.uniform(0, ceiling)
+
+        def count(self, request: httpx.Request) -> None:
+            with STATS_LOCK:
+                HTTP_STATS["requests"] += 1
+                HTTP_STATS["bytes_sent"] += int(request.headers.get("Content-Length", 0))
+
+        def retry_wait(
+            self,
+            request: httpx.Request,
+            attempt: int,
+            response: Optional[httpx.Response] = None,
+            exc: Optional[httpx.TransportError] = None,
+        ) -> Optional[float]:
+            """Seconds to wait before trying again, or None when the response stands.
+
+            A transport error that may not be retried is re-raised with the attempt count.
+            """
+            idempotent = request.method in HTTP_IDEMPOTENT_METHODS
+            if exc is not None:
+                unsent = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not (idempotent or unsent) or attempt >= self.config["retries"]:
+                    raise type(exc)(
+                        f"{request.method} {request.url} failed after "
+                        f"{attempt + 1} attempt(s): {exc}",
+                        request=request,
+                    ) from exc
+                wait = self.backoff(attempt)
+            else:
+                status = response.status_code
+                retryable = status in HTTP_RETRY_STATUSES and (idempotent or status == 429)
+                if not retryable or attempt >= self.config["retries"]:
+                    return None
+                wait = retry_after_seconds(response.headers.get("Retry-After"))
+                if wait is None:
+                    wait = self.backoff(attempt)
+                elif wait > self.config["max_backoff"]:
+                    return None
+            with STATS_LOCK:
+                HTTP_STATS["retries"] += 1
+            return wait
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            attempt = 0
+            while True:
+                self.count(request)
+                try:
+                    response = self.transport.handle_request(request)
+                except httpx.TransportError as exc:
+                    wait = self.retry_wait(request, attempt, exc=exc)
+                else:
+                    wait = self.retry_wait(request, attempt, response=response)
+                    if wait is None:
+                        response.stream = CountingStream(response.stream)
+                        return response
+                    response.close()
+                time.sleep(wait)
+                attempt += 1
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            attempt = 0
+            while True:
+                self.count(request)
+                try:
+                    response = await self.transport.handle_async_request(request)
+                except httpx.TransportError as exc:
+                    wait = self.retry_wait(request, attempt, exc=exc)
+                else:
+                    wait = self.retry_wait(request, attempt, response=response)
+                    if wait is None:
+                        response.stream = CountingStream(response.stream)
+                        return response
+                    await response.aclose()
+                await asyncio.sleep(wait)
+                attempt += 1
+
+        def close(self) -> None:
+            self.transport.close()
+
+        async def aclose(self) -> None:
+            await self.transport.aclose()
+
+    return RetryTransport(config, transport)
+
+
+def trace_caller() -> str:
+    """The innermost CLI function on the stack, skipping transport, auth and engine internals."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == __file__ and not code.co_qualname.startswith(
+            ("make_", "trace_", "AsyncPlanka.")
+        ):
+            return code.co_qualname
+        frame = frame.f_back
+    return "?"
+
+
+def make_trace_transport(transport: "httpx.BaseTransport") -> "httpx.BaseTransport":
+    """Wrap a transport (sync or async) so each request is recorded while --trace is on."""
+    import asyncio
+
+    import httpx
+
+    class TraceStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+        """Count body bytes and record the request once its body has been read."""
+
+        def __init__(self, stream, event: dict, started: float):
+            self.stream = stream
+            self.event = event
+            self.started = started
+            self.recorded = False
+
+        def __iter__(self):
+            for chunk in self.stream:
+                self.event["bytes"] += len(chunk)
+                yield chunk
+
+        async def __aiter__(self):
+            async for chunk in self.stream:
+                self.event["bytes"] += len(chunk)
+                yield chunk
+
+        def record(self) -> None:
+            if not self.recorded:
+                self.recorded = True
+                record_trace(self.event, self.started)
+
+        def close(self) -> None:
+            self.stream.close()
+            self.record()
+
+        async def aclose(self) -> None:
+            await self.stream.aclose()
+            self.record()
+
+    def record_trace(event: dict, started: float) -> None:
+        event["duration"] = time.perf_counter() - started
+        with STATS_LOCK:
+            if TRACE_EVENTS is not None:
+                TRACE_EVENTS.append(event)
+
+    def start_trace(request: httpx.Request, lane: int) -> tuple[dict, float]:
+        started = time.perf_counter()
+        event = {
+            "method": request.method,
+            "path": request.url.path,
+            "status": None,
+            "bytes": 0,
+            "start": started - TRACE_EPOCH,
+            "caller": trace_caller(),
+            "thread": lane,
+        }
+        return event, started
+
+    def finish_trace(response: httpx.Response, event: dict, started: float) -> httpx.Response:
+        event["status"] = response.status_code
+        if response.extensions.get("cache"):
+            event["cache"] = response.extensions["cache"]
+        try:
+            # Responses built in memory (cache hits) are complete already.
+            event["bytes"] = len(response.content)
+        except httpx.ResponseNotRead:
+            response.stream = TraceStream(response.stream, event, started)
+        else:
+            record_trace(event, started)
+        return response
+
+    class TraceTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            if TRACE_EVENTS is None:
+                return transport.handle_request(request)
+            event, started = start_trace(request, threading.get_ident())
+            try:
+                response = transport.handle_request(request)
+            except Exception as exc:
+                event["status"] = type(exc).__name__
+                record_trace(event, started)
+                raise
+            return finish_trace(response, event, started)
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            if TRACE_EVENTS is None:
+                return await transport.handle_async_request(request)
+            # Concurrent tasks share one thread; give each its own lane in the trace.
+            event, started = start_trace(request, id(asyncio.current_task()))
+            try:
+                response = await transport.handle_async_request(request)
+            except Exception as exc:
+                event["status"] = type(exc).__name__
+                record_trace(event, started)
+                raise
+            return finish_trace(response, event, started)
+
+        def close(self) -> None:
+            transport.close()
+
+        async def aclose(self) -> None:
+            await transport.aclose()
+
+    return TraceTransport()
+
+
+def get_cache_path(tokenstore: Optional[str] = None) -> Path:
+    return get_token_dir(tokenstore) / CACHE_FILENAME
+
+
+def open_cache(tokenstore: Optional[str] = None) -> "sqlite3.Connection":
+    import sqlite3
+
+    path = get_cache_path(tokenstore)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    os.chmod(path, 0o600)
+    conn.executescript(
+        "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, user TEXT, status INTEGER, "
+        "headers TEXT, body BLOB, stored_at REAL, accessed_at REAL, size INTEGER);"
+        "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);"
+        "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);"
+    )
+    return conn
+
+
+def cache_kind(path: str) -> Optional[str]:
+    """The resource type a GET path returns: /api/boards/1 -> boards, /api/cards/1/comments
+    -> comments."""
+    if not path.startswith("/api/"):
+        return None
+    segments = path[len("/api/") :].strip("/").split("/")
+    return segments[-1] if len(segments) % 2 else segments[-2]
+
+
+def make_cache_transport(
+    transport: "httpx.BaseTransport", config: dict, user: str, tokenstore: Optional[str]
+) -> "httpx.BaseTransport":
+    """Wrap a transport with the on-disk response cache; httpx is imported lazily."""
+    import httpx
+
+    class CacheTransport(httpx.BaseTransport):
+        """Serve GETs from an LRU cache within their TTL and revalidate stale entries.
+
+        Entries are keyed per user and URL. Stale entries with an ETag or Last-Modified are
+        revalidated with a conditional request. Any successful write drops the user's entries,
+        since one card change alters board, list and card payloads alike.
+        """
+
+        def __init__(self):
+            self.transport = transport
+            self.conn = open_cache(tokenstore)
+            self.lock = threading.Lock()
+
+        def count(self, name: str, amount: int = 1) -> None:
+            with STATS_LOCK:
+                CACHE_STATS[name] += amount
+            with self.lock:
+                self.conn.execute(
+                    "INSERT INTO stats VALUES (?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                    (name, amount),
+                )
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            kind = cache_kind(request.url.path)
+            ttl = config.get(f"cache_ttl_{kind}")
+            if request.method != "GET":
+                response = self.transport.handle_request(request)
+                # Logging in is not a data change.
+                if response.status_code < 400 and kind != "access-tokens":
+                    with self.lock:
+                        self.conn.execute("DELETE FROM entries WHERE user = ?", (user,))
+                return response
+            if NO_CACHE or ttl is None:
+                return self.transport.handle_request(request)
+
+            key = f"{user} {request.url}"
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT status, headers, body, stored_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+            now = time.time()
+            if row is not None:
+                status, headers, body, stored_at = row
+                headers = json.loads(headers)
+                no_cache = "no-cache" in request.headers.get("Cache-Control", "")
+                if not (CACHE_REFRESH or no_cache) and now - stored_at < ttl:
+                    self.touch(key, now)
+                    self.count("hits")
+                    self.count("bytes_saved", len(body))
+                    return httpx.Response(
+                        status, headers=headers, content=body, extensions={"cache": "hit"}
+                    )
+                validators = dict((name.lower(), value) for name, value in headers)
+                if "etag" in validators:
+                    request.headers["If-None-Match"] = validators["etag"]
+                if "last-modified" in validators:
+                    request.headers["If-Modified-Since"] = validators["last-modified"]
+
+            response = self.transport.handle_request(request)
+            if row is not None and response.status_code == 304:
+                response.close()
+                with self.lock:
+                    self.conn.execute(
+                        "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                        (now, now, key),
+                    )
+                self.count("revalidated")
+                self.count("bytes_saved", len(body))
+                return httpx.Response(
+                    status, headers=headers, content=body, extensions={"cache": "revalidated"}
+                )
+            self.count("misses")
+            content_type = response.headers.get("Content-Type", "")
+            no_store = "no-store" in response.headers.get("Cache-Control", "")
+            if response.status_code != 200 or "json" not in content_type or no_store:
+                return response
+            body = response.read()
+            # The body is stored decoded, so the encoding headers no longer apply.
+            headers = [
+                (name, value)
+                for name, value in response.headers.multi_items()
+                if name.lower() not in {"content-encoding", "content-length", "transfer-encoding"}
+            ]
+            self.store(key, response.status_code, headers, body, now)
+            return httpx.Response(response.status_code, headers=headers, content=body)
+
+        def touch(self, key: str, now: float) -> None:
+            with self.lock:
+                self.conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+
+        def store(self, key: str, status: int, headers: list, body: bytes, now: float) -> None:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, user, status, json.dumps(headers), body, now, now, len(body)),
+                )
+                # Evict least recently used entries until the cache fits its budget.
+                total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+                excess = total[0] - config["cache_max_bytes"]
+                for entry_key, size in self.conn.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed_at"
+                ).fetchall():
+                    if excess <= 0:
+                        break
+                    self.conn.execute("DELETE FROM entries WHERE key = ?", (entry_key,))
+                    excess -= size
+
+        def close(self) -> None:
+            self.transport.close()
+            self.conn.close()
+
+    return CacheTransport()
+
+
+def get_config_path(tokenstore: Optional[str] = None) -> Path:
+    # Settings are shared by every profile.
+    return get_token_root(tokenstore) / CONFIG_FILENAME
+
+
+def load_http_config(tokenstore: Optional[str] = None) -> dict:
+    """Merge transport defaults with config.json's "http" object and PLANKA_HTTP_* env vars."""
+    config = dict(HTTP_CONFIG_DEFAULTS)
+    overrides: dict[str, object] = {}
+    config_path = get_config_path(tokenstore)
+    if config_path.exists():
+        try:
+            data = read_json_file(config_path)
+        except json.JSONDecodeError as exc:
+            print_error(f"Invalid config file at {config_path}: {exc}")
+            raise typer.Exit(1) from exc
+        section = data.get("http", {}) if isinstance(data, dict) else None
+        if not isinstance(section, dict):
+            print_error(
+                f'Config file at {config_path} must be a JSON object with an "http" object.'
+            )
+            raise typer.Exit(1)
+        overrides.update(section)
+    for key in config:
+        value = os.getenv(f"PLANKA_HTTP_{key.upper()}")
+        if value is not None:
+            overrides[key] = value
+    for key, value in overrides.items():
+        if key not in config:
+            print_error(f"Unknown HTTP setting {key!r}. Known settings: {', '.join(config)}.")
+            raise typer.Exit(1)
+        try:
+            default = HTTP_CONFIG_DEFAULTS[key]
+            config[key] = truthy(value) if isinstance(default, bool) else type(default)(value)
+        except (TypeError, ValueError) as exc:
+            print_error(f"Invalid value for HTTP setting {key}: {value!r}")
+            raise typer.Exit(1) from exc
+    return config
+
+
+def load_stored_credentials(tokenstore: Optional[str] = None) -> dict[str, str]:
+    credentials_path = get_credentials_path(tokenstore)
+    try:
+        data = read_json_file(credentials_path)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as exc:
+        print_error(f"Invalid credentials file at {credentials_path}: {exc}")
+        raise typer.Exit(1) from exc
+    if not isinstance(data, dict):
+        print_error(f"Credentials file at {credentials_path} must be a JSON object.")
+        raise typer.Exit(1)
+    return {str(key): str(value) for key, value in data.items()}
+
+
+def get_env_config() -> tuple[Optional[str], Optional[str], Optional[str]]:
+    if ACTIVE_PROFILE.get():
+        # A named profile is exactly its stored credentials; PLANKA_* only feed the default.
+        stored = load_stored_credentials()
+        return (
+            stored.get("PLANKA_URL"),
+            stored.get("PLANKA_USERNAME"),
+            stored.get("PLANKA_PASSWORD"),
+        )
+
+    planka_url = os.getenv("PLANKA_URL")
+    planka_username = os.getenv("PLANKA_USERNAME")
+    planka_password = os.getenv("PLANKA_PASSWORD")
+
+    if planka_url and planka_username and planka_password:
+        return planka_url, planka_username, planka_password
+
+    stored = load_stored_credentials()
+    if not planka_url:
+        planka_url = stored.get("PLANKA_URL")
+    if not planka_username:
+        planka_username = stored.get("PLANKA_USERNAME")
+    if not planka_password:
+        planka_password = stored.get("PLANKA_PASSWORD")
+
+    return planka_url, planka_username, planka_password
+
+
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    candidate = value.strip()
+    if candidate.endswith("Z"):
+        candidate = f"{candidate[:-1]}+00:00"
+    try:
+        return datetime.fromisoformat(candidate)
+    except ValueError as exc:
+        raise typer.BadParameter(
+            "Invalid datetime. Use ISO-8601 like 2025-01-31 or 2025-01-31T10:30:00Z."
+        ) from exc
+
+
+def parse_timestamp(value: object) -> object:
+    """Turn an API timestamp string into a datetime; anything else is returned as is."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return parse_iso_datetime(value)
+    except typer.BadParameter:
+        return value
+
+
+def as_utc(value: datetime) -> datetime:
+    """Attach UTC to naive datetimes, matching how plankapy sends them."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def parse_position(value: Optional[str]) -> Optional[Union[str, int]]:
+    if value is None:
+        return None
+    normalized = value.strip().lower()
+    if normalized in ("top", "bottom"):
+        return normalized
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise typer.BadParameter("Position must be 'top', 'bottom', or an integer.") from exc
+
+
+def iter_fan_out(func, items):
+    """Call func on every item with up to --concurrency threads, yielding results in order.
+
+    Items are read lazily, so at most a couple of batches are in flight and a large input is
+    streamed rather than loaded. If the consumer stops early, queued calls are cancelled.
+    Each call runs in a copy of the caller's context, so it sees the same active profile.
+    Inside a worker, and for a single item, calls run serially in the calling thread.
+    """
+    items = iter(items)
+    head = list(itertools.islice(items, 2))
+    if CONCURRENCY <= 1 or IN_FAN_OUT.get() or len(head) < 2:
+        for item in itertools.chain(head, items):
+            yield func(item)
+        return
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    def work(item):
+        IN_FAN_OUT.set(True)
+        return func(item)
+
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="planka-fan-out") as pool:
+        try:
+            for item in itertools.chain(head, items):
+                pending.append(pool.submit(contextvars.copy_context().run, work, item))
+                if len(pending) >= CONCURRENCY * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def fan_out(func, items) -> list:
+    """Call func on every item with up to --concurrency threads.
+
+    Results come back in input order whatever order the calls finish in, so output stays
+    deterministic. The first exception is re-raised once in-flight calls are done.
+    """
+    return list(iter_fan_out(func, items))
+
+
+class RateLimiter:
+    """Space calls at least 1/rate seconds apart across threads; a rate of 0 disables it."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def is_not_found(exc: Exception) -> bool:
+    """True for a 404 from the API; auth, network and server errors are not "missing"."""
+    import httpx
+
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 404
+
+
+def find_list(planka: "Planka", list_id: str) -> Optional["PlankaList"]:
+    """Resolve a list from the ID index, falling back to a single targeted fetch."""
+    from plankapy.v2 import List as PlankaList
+
+    cached = index_get(planka, "lists", list_id)
+    if cached:
+        return PlankaList(cached, planka)
+    try:
+        list_data = planka.endpoints.getList(list_id)["item"]
+    except Exception as exc:
+        if not is_not_found(exc):
+            raise
+        return None
+    index_put(planka, "lists", [list_data])
+    return PlankaList(list_data, planka)
+
+
+def fetch_payload(planka: "Planka", kind: str, item_id: str) -> Optional[dict]:
+    """Fetch a board, list or card with its included collections, or None on a 404.
+
+    Reading `included` from this one payload avoids plankapy's model properties, which
+    re-fetch the parent for every collection they return.
+    """
+    endpoint = {"boards": "getBoard", "lists": "getList", "cards": "getCard"}[kind]
+    try:
+        payload = getattr(planka.endpoints, endpoint)(item_id)
+    except Exception as exc:
+        if not is_not_found(exc):
+            raise
+        return None
+    index_put(planka, kind, [payload["item"]])
+    return payload
+
+
+def get_card_by_id(planka: "Planka", card_id: str) -> Optional["Card"]:
+    from plankapy.v2 import Card
+
+    payload = fetch_payload(planka, "cards", card_id)
+    return Card(payload["item"], planka) if payload else None
+
+
+class AsyncPlanka:
+    """An asyncio client for the read endpoints the CLI fans out over.
+
+    It shares the session's auth, base URL, headers and timeouts, sends every request
+    through one AsyncClient (one connection pool) over the same retry and trace transports,
+    and keeps at most --concurrency requests in flight. The response cache is not consulted.
+    Create and close it on the loop that uses it; see run_async.
+    """
+
+    def __init__(self, planka: "Planka"):
+        import asyncio
+
+        import httpx
+        from plankapy.v2.api import AsyncPlankaEndpoints
+
+        async def forget_missing(response: httpx.Response) -> None:
+            forget_missing_ids(response)
+
+        config = getattr(planka, "http_config", None) or load_http_config(TOKENSTORE_OVERRIDE)
+        self.planka = planka
+        self.client = httpx.AsyncClient(
+            base_url=planka.client.base_url,
+            auth=planka.client.auth,
+            headers=planka.client.headers,
+            timeout=planka.client.timeout,
+            transport=make_trace_transport(make_transport(config, asynchronous=True)),
+            event_hooks={"response": [forget_missing]},
+        )
+        self.endpoints = AsyncPlankaEndpoints(self.client)
+        self.semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def call(self, endpoint: str, *args, **kwargs) -> dict:
+        """Call one endpoint once a concurrency slot is free."""
+        async with self.semaphore:
+            return await getattr(self.endpoints, endpoint)(*args, **kwargs)
+
+    async def gather(self, calls) -> list:
+        """Await calls concurrently; results come back in input order, like fan_out."""
+        import asyncio
+
+        return list(await asyncio.gather(*calls))
+
+    async def projects(self) -> dict:
+        return await self.call("getProjects")
+
+    async def project(self, project_id: str) -> dict:
+        return await self.call("getProject", project_id)
+
+    async def payload(self, kind: str, item_id: str) -> Optional[dict]:
+        """Async fetch_payload: a board, list or card with its includes, or None on a 404."""
+        endpoint = {"boards": "getBoard", "lists": "getList", "cards": "getCard"}[kind]
+        try:
+            payload = await self.call(endpoint, item_id)
+        except Exception as exc:
+            if not is_not_found(exc):
+                raise
+            return None
+        index_put(self.planka, kind, [payload["item"]])
+        return payload
+
+    async def list_item(self, list_id: str) -> Optional[dict]:
+        """Async find_list: the list's fields from the ID index, or one targeted fetch."""
+        cached = index_get(self.planka, "lists", list_id)
+        if cached:
+            return cached
+        payload = await self.payload("lists", list_id)
+        return payload["item"] if payload else None
+
+    async def comment_pages(self, card_id: str, before_id: Optional[str] = None):
+        """Async iter_comment_pages: (comments, users by ID) per page, newest first."""
+        while True:
+            params = {"beforeId": before_id} if before_id else {}
+            payload = await self.call("getComments", card_id, **params)
+            items = payload.get("items", [])
+            users = {user["id"]: user for user in payload.get("included", {}).get("users", [])}
+            if items:
+                yield items, users
+            if len(items) < COMMENTS_PAGE_SIZE:
+                return
+            before_id = items[-1]["id"]
+
+    async def comments(self, card_id: str) -> list[dict]:
+        return [item async for items, _ in self.comment_pages(card_id) for item in items]
+
+    async def comment_rows(self, card_id: str, limit: int) -> list[dict]:
+        rows: list[dict] = []
+        async for items, users in self.comment_pages(card_id):
+            rows.extend(comment_row(comment, users) for comment in items)
+            if len(rows) >= limit:
+                break
+        return rows[:limit]
+
+    async def attachments(self, card_id: str) -> list[dict]:
+        payload = await self.payload("cards", card_id)
+        return payload.get("included", {}).get("attachments", []) if payload else []
+
+    async def notifications(self) -> dict:
+        return await self.call("getNotifications")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def run_async(planka: "Planka", func):
+    """Run `await func(engine)` with a fresh AsyncPlanka on its own event loop."""
+    import asyncio
+
+    async def main():
+        engine = AsyncPlanka(planka)
+        try:
+            return await func(engine)
+        finally:
+            await engine.aclose()
+
+    return asyncio.run(main())
+
+
+def engine_map(planka: "Planka", func, async_func, items) -> list:
+    """fan_out(func, items), or with --engine async, async_func(engine, item) for every item
+    gathered on one AsyncPlanka. Results come back in input order either way."""
+    items = list(items)
+    if ENGINE != "async" or not items:
+        return fan_out(func, items)
+    return run_async(
+        planka, lambda engine: engine.gather(async_func(engine, item) for item in items)
+    )
+
+
+def get_mirror_path(tokenstore: Optional[str] = None) -> Path:
+    return get_token_dir(tokenstore) / MIRROR_FILENAME
+
+
+def mirror_schema_sql() -> str:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE IF NOT EXISTS projects "
+        "(id TEXT PRIMARY KEY, name TEXT, updated_at TEXT, data TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS boards (id TEXT PRIMARY KEY, project_id TEXT, name TEXT, "
+        "position REAL, updated_at TEXT, synced_at REAL, data TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS users "
+        "(id TEXT PRIMARY KEY, name TEXT, username TEXT, updated_at TEXT, data TEXT NOT NULL)",
+    ]
+    for table, (_, fields) in MIRROR_BOARD_TABLES.items():
+        columns = "".join(f", {column}" for column in fields)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, board_id TEXT{columns}, "
+            "updated_at TEXT, data TEXT NOT NULL)"
+        )
+        statements.append(f"CREATE INDEX IF NOT EXISTS {table}_board ON {table} (board_id)")
+    statements.append("CREATE INDEX IF NOT EXISTS cards_list ON cards (list_id)")
+    statements.append("CREATE INDEX IF NOT EXISTS attachments_card ON attachments (card_id)")
+    # Search: comment text fetched by `sync --comments`, and an FTS5 inverted index over
+    # card text whose rowids are the `doc` keys of card_search_state.
+    statements.append(
+        "CREATE TABLE IF NOT EXISTS card_comments "
+        "(card_id TEXT PRIMARY KEY, stamp TEXT, text TEXT NOT NULL)"
+    )
+    statements.append(
+        "CREATE TABLE IF NOT EXISTS card_search_state "
+        "(doc INTEGER PRIMARY KEY, card_id TEXT UNIQUE NOT NULL, stamp TEXT)"
+    )
+    statements.append(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS card_search USING fts5"
+        "(name, description, comments, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    return ";\n".join(statements) + ";"
+
+
+def open_mirror(planka_url: str) -> "sqlite3.Connection":
+    """Open (creating if needed) the mirror for planka_url, wiping one built for another server."""
+    import sqlite3
+
+    path = get_mirror_path(TOKENSTORE_OVERRIDE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    os.chmod(path, 0o600)
+    conn.executescript(mirror_schema_sql())
+    row = conn.execute("SELECT value FROM meta WHERE key = 'url'").fetchone()
+    if row is None or row[0] != planka_url:
+        with conn:
+            for table in (
+                "projects",
+                "boards",
+                "users",
+                *MIRROR_BOARD_TABLES,
+                "card_comments",
+                "card_search_state",
+                "card_search",
+            ):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('url', ?)", (planka_url,))
+    return conn
+
+
+def open_offline_mirror() -> "sqlite3.Connection":
+    """Open the mirror read-only for --offline, failing if `sync` has never run."""
+    import sqlite3
+
+    path = get_mirror_path(TOKENSTORE_OVERRIDE)
+    if not path.exists():
+        print_error(f"No offline mirror at {path}. Run `planka-cli sync` first.")
+        raise typer.Exit(1)
+    return sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+
+
+def mirror_write(
+    conn: "sqlite3.Connection",
+    table: str,
+    fields: dict[str, str],
+    items: list[dict],
+    scope: Optional[tuple[str, str]] = None,
+    full: bool = False,
+    prune: bool = True,
+) -> tuple[int, list[str]]:
+    """Write rows whose updatedAt moved and drop rows the server no longer returns.
+
+    Returns the number of rows written and the IDs that were removed.
+    """
+    where, params = (f" WHERE {scope[0]} = ?", (scope[1],)) if scope else ("", ())
+    existing = dict(conn.execute(f"SELECT id, updated_at FROM {table}{where}", params))
+    names = ["id", *([scope[0]] if scope else []), *fields, "updated_at", "data"]
+    rows = []
+    for item in items:
+        stamp = item.get("updatedAt") or item.get("createdAt")
+        if not full and item["id"] in existing and existing[item["id"]] == stamp:
+            continue
+        rows.append(
+            (
+                item["id"],
+                *([scope[1]] if scope else []),
+                *(item.get(key) for key in fields.values()),
+                stamp,
+                json.dumps(item),
+            )
+        )
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) "
+        f"VALUES ({', '.join('?' for _ in names)})",
+        rows,
+    )
+    seen = {item["id"] for item in items}
+    removed = [item_id for item_id in existing if item_id not in seen] if prune else []
+    conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(item_id,) for item_id in removed])
+    return len(rows), removed
+
+
+def sync_mirror(
+    planka: "Planka",
+    conn: "sqlite3.Connection",
+    board_ids: Optional[list[str]] = None,
+    full: bool = False,
+    comments: bool = False,
+) -> dict[str, int]:
+    """Refresh the mirror: one projects request, then one getBoard per board.
+
+    With comments, cards whose updatedAt or comment count moved also get their comment
+    text fetched for search. The search index is brought up to date at the end.
+    """
+    stats = {"boards": 0, "written": 0, "removed": 0, "indexed": 0}
+    projects = planka.endpoints.getProjects()
+    boards = projects.get("included", {}).get("boards", [])
+    with conn:
+        written, removed = mirror_write(conn, "projects", {"name": "name"}, projects["items"])
+        stats["written"] += written
+        stats["removed"] += len(removed)
+        written, removed = mirror_write(
+            conn,
+            "boards",
+            {"project_id": "projectId", "name": "name", "position": "position"},
+            boards,
+            full=full,
+        )
+        stats["written"] += written
+        stats["removed"] += len(removed)
+        for board_id in removed:
+            for table in MIRROR_BOARD_TABLES:
+                conn.execute(f"DELETE FROM {table} WHERE board_id = ?", (board_id,))
+    index_put(planka, "boards", boards)
+
+    targets = [board for board in boards if not board_ids or board["id"] in board_ids]
+    payloads = engine_map(
+        planka,
+        lambda board: planka.endpoints.getBoard(board["id"]),
+        lambda engine, board: engine.call("getBoard", board["id"]),
+        targets,
+    )
+    for board, payload in zip(targets, payloads):
+        included = payload.get("included", {})
+        with conn:
+            for table, (key, fields) in MIRROR_BOARD_TABLES.items():
+                written, removed = mirror_write(
+                    conn,
+                    table,
+                    fields,
+                    included.get(key, []),
+                    scope=("board_id", board["id"]),
+                    full=full,
+                )
+                stats["written"] += written
+                stats["removed"] += len(removed)
+            users = included.get("users", [])
+            fields = {"name": "name", "username": "username"}
+            stats["written"] += mirror_write(conn, "users", fields, users, prune=False)[0]
+            conn.execute("UPDATE boards SET synced_at = ? WHERE id = ?", (time.time(), board["id"]))
+        index_put(planka, "lists", included.get("lists", []))
+        index_put(planka, "cards", included.get("cards", []))
+        if comments:
+            sync_comments(planka, conn, included.get("cards", []))
+        stats["boards"] += 1
+
+    with conn:
+        stats["indexed"] = index_cards(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)",
+            (datetime.now().astimezone().isoformat(timespec="seconds"),),
+        )
+    return stats
+
+
+def iter_comment_pages(planka: "Planka", card_id: str, before_id: Optional[str] = None):
+    """Yield (comments, users by ID) for each page of a card's comments, newest first.
+
+    Pages are requested only as the caller consumes them, so stopping early saves requests.
+    """
+    while True:
+        params = {"beforeId": before_id} if before_id else {}
+        payload = planka.endpoints.getComments(card_id, **params)
+        items = payload.get("items", [])
+        users = {user["id"]: user for user in payload.get("included", {}).get("users", [])}
+        if items:
+            yield items, users
+        if len(items) < COMMENTS_PAGE_SIZE:
+            return
+        before_id = items[-1]["id"]
+
+
+def iter_comments(planka: "Planka", card_id: str):
+    """Yield a card's comments newest first, one page per request."""
+    for items, _ in iter_comment_pages(planka, card_id):
+        yield from items
+
+
+def id_order(item_id: str) -> tuple:
+    """Sort key for Planka IDs: numeric snowflakes compare as numbers."""
+    return (0, int(item_id)) if item_id.isdigit() else (1, item_id)
+
+
+def iter_comment_rows(
+    planka: "Planka",
+    card_id: str,
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+):
+    """Yield comment rows newest first, from before_id back to (not including) after_id."""
+    for items, users in iter_comment_pages(planka, card_id, before_id):
+        for comment in items:
+            if after_id is not None and id_order(comment["id"]) <= id_order(after_id):
+                return
+            yield comment_row(comment, users)
+
+
+def sync_comments(planka: "Planka", conn: "sqlite3.Connection", cards: list[dict]) -> None:
+    """Fetch comment text for cards whose updatedAt or comment count changed."""
+    stored = dict(conn.execute("SELECT card_id, stamp FROM card_comments"))
+
+    def stamp(card: dict) -> str:
+        return f"{card.get('updatedAt')}|{card.get('commentsCount')}"
+
+    def comment_text(card: dict) -> str:
+        if not card.get("commentsCount"):
+            return ""
+        return "\n".join(item.get("text") or "" for item in iter_comments(planka, card["id"]))
+
+    async def fetch_comment_text(engine: AsyncPlanka, card: dict) -> str:
+        if not card.get("commentsCount"):
+            return ""
+        return "\n".join(item.get("text") or "" for item in await engine.comments(card["id"]))
+
+    changed = [card for card in cards if stored.get(card["id"]) != stamp(card)]
+    texts = engine_map(planka, comment_text, fetch_comment_text, changed)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO card_comments VALUES (?, ?, ?)",
+            [(card["id"], stamp(card), text) for card, text in zip(changed, texts)],
+        )
+
+
+def index_cards(conn: "sqlite3.Connection") -> int:
+    """Re-index cards whose text changed since the last run; returns how many were touched."""
+    current = {
+        card_id: f"{updated_at}|{comments_stamp}"
+        for card_id, updated_at, comments_stamp in conn.execute(
+            "SELECT cards.id, cards.updated_at, card_comments.stamp FROM cards "
+            "LEFT JOIN card_comments ON card_comments.card_id = cards.id"
+        )
+    }
+    indexed = {
+        card_id: (doc, stamp)
+        for doc, card_id, stamp in conn.execute("SELECT doc, card_id, stamp FROM card_search_state")
+    }
+    touched = 0
+    for card_id, (doc, stamp) in indexed.items():
+        if current.get(card_id) != stamp:
+            conn.execute("DELETE FROM card_search WHERE rowid = ?", (doc,))
+            conn.execute("DELETE FROM card_search_state WHERE doc = ?", (doc,))
+            touched += 1
+    for card_id, stamp in current.items():
+        if card_id in indexed and indexed[card_id][1] == stamp:
+            continue
+        name, description, comments = conn.execute(
+            "SELECT cards.name, json_extract(cards.data, '$.description'), card_comments.text "
+            "FROM cards LEFT JOIN card_comments ON card_comments.card_id = cards.id "
+            "WHERE cards.id = ?",
+            (card_id,),
+        ).fetchone()
+        doc = conn.execute(
+            "INSERT INTO card_search_state (card_id, stamp) VALUES (?, ?)", (card_id, stamp)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO card_search (rowid, name, description, comments) VALUES (?, ?, ?, ?)",
+            (doc, name or "", description or "", comments or ""),
+        )
+        touched += card_id not in indexed
+    conn.execute("DELETE FROM card_comments WHERE card_id NOT IN (SELECT id FROM cards)")
+    return touched
+
+
+def mirror_rows(conn: "sqlite3.Connection", sql: str, params: tuple = ()) -> list[dict]:
+    """Run a query whose first column is a row's JSON data and decode it."""
+    return [json.loads(row[0]) for row in conn.execute(sql, params)]
+
+
+def mirror_url(conn: "sqlite3.Connection") -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'url'").fetchone()
+    return row[0] if row else None
+
+
+def make_table(title: str) -> "Table":
+    from rich.table import Table
+
+    return Table(
+        title=title,
+        show_header=True,
+        header_style="bold",
+        show_edge=False,
+        show_lines=False,
+        box=None,
+    )
+
+
+def display_value(value: object) -> str:
+    if value is None or value == "":
+        return "-"
+    return str(value)
+
+
+def yes_no(value: object) -> str:
+    return "yes" if value else "no"
+
+
+def json_value(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool, list, dict)) or value is None:
+        return value
+    return str(value)
+
+
+def tsv_value(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = len(value)
+    text = json_value(value)
+    if isinstance(text, bool):
+        text = "true" if text else "false"
+    return str(text).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def write_line(line: str) -> None:
+    sys.stdout.write(line + "\n")
+
+
+class Column:
+    """An output column: machine key, table header, value getter and table styling."""
+
+    def __init__(self, key: str, header: str, value, display=display_value, **table_options):
+        self.key = key
+        self.header = header
+        self.value = value
+        self.display = display
+        self.table_options = table_options
+
+
+def select_columns(columns: list[Column]) -> list[Column]:
+    """Apply --fields; unselected columns are never evaluated."""
+    if not OUTPUT_FIELDS:
+        return columns
+    by_key = {column.key: column for column in columns}
+    unknown = [field for field in OUTPUT_FIELDS if field not in by_key]
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(by_key)}.",
+            param_hint="--fields",
+        )
+    return [by_key[field] for field in OUTPUT_FIELDS]
+
+
+class RowWriter:
+    """Render rows as a rich table, or stream them as json/ndjson/tsv.
+
+    With a target console, every column is rendered as a table on it, whatever --output and
+    --fields say; prompts use this to show their plan on err_console.
+    """
+
+    def __init__(self, title: str, columns: list[Column], empty_message: str, target=None):
+        self.columns = columns if target is not None else select_columns(columns)
+        self.empty_message = empty_message
+        self.target = console if target is None else target
+        self.rows: list[dict] = []
+        self.count = 0
+        self.table = None
+        if target is not None or OUTPUT_FORMAT == "table":
+            self.table = make_table(title)
+            for column in self.columns:
+                self.table.add_column(column.header, **column.table_options)
+        elif OUTPUT_FORMAT == "tsv":
+            write_line("\t".join(column.key for column in self.columns))
+
+    def add(self, item: object) -> None:
+        values = [column.value(item) for column in self.columns]
+        self.count += 1
+        if self.table is not None:
+            self.table.add_row(
+                *(column.display(value) for column, value in zip(self.columns, values))
+            )
+        elif OUTPUT_FORMAT == "tsv":
+            write_line("\t".join(tsv_value(value) for value in values))
+        else:
+            row = {column.key: json_value(value) for column, value in zip(self.columns, values)}
+            if OUTPUT_FORMAT == "ndjson":
+                write_line(json.dumps(row, default=json_value))
+            else:
+                self.rows.append(row)
+
+    def close(self) -> None:
+        if self.table is not None:
+            self.target.print(self.table if self.count else self.empty_message)
+        elif OUTPUT_FORMAT == "json":
+            write_line(json.dumps(self.rows, default=json_value))
+
+
+def write_rows(title: str, columns: list[Column], items, empty_message: str, target=None) -> None:
+    writer = RowWriter(title, columns, empty_message, target)
+    for item in items:
+        writer.add(item)
+    writer.close()
+
+
+def write_record(title: str, columns: list[Column], item: object) -> list[Column]:
+    """Render one object as a Field/Value table or a single json/ndjson/tsv record.
+
+    Returns the selected columns so callers can tell which sections were requested.
+    """
+    columns = select_columns(columns)
+    values = [column.value(item) for column in columns]
+    if OUTPUT_FORMAT == "table":
+        table = make_table(title)
+        table.add_column("Field", style="cyan", no_wrap=True)
+        table.add_column("Value", style="magenta")
+        for column, value in zip(columns, values):
+            table.add_row(column.header, column.display(value))
+        console.print(table)
+    elif OUTPUT_FORMAT == "tsv":
+        write_line("\t".join(column.key for column in columns))
+        write_line("\t".join(tsv_value(value) for value in values))
+    else:
+        record = {c.key: json_value(v) for c, v in zip(columns, values)}
+        write_line(json.dumps(record, default=json_value))
+    return columns
+
+
+NOTIFICATION_COLUMNS = [
+    Column("id", "ID", lambda n: n.id, justify="right", style="cyan", no_wrap=True),
+    Column("type", "Type", lambda n: n.type, style="magenta"),
+    Column("read", "Read", lambda n: n.is_read, display=yes_no, justify="center"),
+    Column("created_at", "Created At", lambda n: n.created_at, justify="right"),
+    Column("card_id", "Card ID", lambda n: n.schema.get("cardId"), justify="right"),
+]
+
+
+def render_notifications(title: str, notifications) -> None:
+    write_rows(title, NOTIFICATION_COLUMNS, notifications, "No notifications found.")
+
+
+def get_planka() -> "Planka":
+    planka_url, planka_username, planka_password = get_env_config()
+    if not planka_url or not planka_username or not planka_password:
+        credentials_path = get_credentials_path()
+        profile = ACTIVE_PROFILE.get()
+        login_command = f"planka-cli --profile {profile} login" if profile else "planka-cli login"
+        print_error(
+            "Missing credentials. "
+            f"Set PLANKA_URL, PLANKA_USERNAME, and PLANKA_PASSWORD or run "
+            f"`{login_command} --url ... --username ... --password ...` "
+            f"to write {credentials_path}."
+        )
+        sys.exit(1)
+    try:
+        return connect_planka(planka_url, planka_username, planka_password)
+    except Exception as e:
+        print_error(e, "Connection Error")
+        sys.exit(1)
+
+
+def connect_planka(planka_url: str, planka_username: str, planka_password: str) -> "Planka":
+    """Return the process's session for these credentials, logging in on first use."""
+    session_key = (planka_url, planka_username, planka_password)
+    if session_key in PLANKA_SESSIONS:
+        # Kept from an earlier command in this process (the daemon).
+        with STATS_LOCK:
+            SESSION_STATS["reused"] += 1
+        return PLANKA_SESSIONS[session_key]
+
+    http_config = load_http_config(TOKENSTORE_OVERRIDE)
+    import httpx
+    from plankapy.v2 import Planka
+
+    auth = make_session_auth(planka_url, planka_username, planka_password)
+    transport = make_transport(http_config)
+    if http_config["cache"]:
+        user = f"{planka_username}@{planka_url}"
+        transport = make_cache_transport(transport, http_config, user, TOKENSTORE_OVERRIDE)
+    client = httpx.Client(
+        base_url=planka_url,
+        auth=auth,
+        transport=make_trace_transport(transport),
+        timeout=httpx.Timeout(http_config["read_timeout"], connect=http_config["connect_timeout"]),
+        headers={"Accept-Encoding": "gzip"},
+        event_hooks={"response": [forget_missing_ids]},
+    )
+    planka = Planka(client=client)
+    if auth.token is not None and "user_id" in auth.session:
+        with STATS_LOCK:
+            SESSION_STATS["reused"] += 1
+    else:
+        # First use (or a session without user info): log in and record who we are.
+        me = planka.me
+        auth.session.update({"user_id": me.id, "role": me.role})
+        save_session(auth.session)
+    planka.http_config = http_config
+    planka.current_id = auth.session["user_id"]
+    planka.current_role = auth.session["role"]
+    PLANKA_SESSIONS[session_key] = planka
+    return planka
+
+
+def for_each_profile(func) -> list[tuple[str, object]]:
+    """Call func(planka) for every profile concurrently, for --all-profiles.
+
+    Returns (profile, result) pairs in profile order. A profile that cannot connect or whose
+    call fails is reported and left out, so one unreachable instance does not hide the rest.
+    """
+    if OFFLINE:
+        raise typer.BadParameter("--all-profiles asks each server; it cannot run --offline.")
+    profiles = list_profiles()
+    if not profiles:
+        print_error(
+            "No profiles found. Run `planka-cli --profile NAME login ...` to add one, "
+            f"or `planka-cli login ...` for the default profile in {get_token_root()}."
+        )
+        raise typer.Exit(1)
+    failed = object()
+
+    def run(profile: str) -> object:
+        # Reset afterwards: with --concurrency 1 this runs in the caller's own context.
+        token = ACTIVE_PROFILE.set(None if profile == DEFAULT_PROFILE else profile)
+        try:
+            planka_url, planka_username, planka_password = get_env_config()
+            if not planka_url or not planka_username or not planka_password:
+                raise ValueError(f"Incomplete credentials in {get_credentials_path()}.")
+            return func(connect_planka(planka_url, planka_username, planka_password))
+        except Exception as e:
+            print_error(e, f"Profile {profile}")
+            return failed
+        finally:
+            ACTIVE_PROFILE.reset(token)
+
+    results = fan_out(run, profiles)
+    return [(profile, result) for profile, result in zip(profiles, results) if result is not failed]
+
+
+def write_profile_rows(
+    title: str, results: list[tuple[str, list[Column], list]], empty_message: str
+) -> None:
+    """Write rows from several profiles as one listing, led by a profile column.
+
+    Each profile brings its own columns, since URL columns differ between instances; they
+    are matched by key.
+    """
+    template = results[0][1] if results else []
+    columns = [Column("profile", "Profile", lambda row: row[0], style="green", no_wrap=True)]
+    columns.extend(
+        Column(
+            column.key,
+            column.header,
+            lambda row, key=column.key: row[1][key].value(row[2]),
+            column.display,
+            **column.table_options,
+        )
+        for column in template
+    )
+    rows = (
+        (profile, {column.key: column for column in profile_columns}, item)
+        for profile, profile_columns, items in results
+        for item in items
+    )
+    write_rows(title, columns, rows, empty_message)
+
+
+def planka_base_url(planka: "Planka") -> str:
+    """The server URL of a session, without re-reading the credentials file."""
+    return str(planka.client.base_url).rstrip("/")
+
+
+@app.command()
+def login(
+    url: str = typer.Option(..., "--url", "-u", help="Planka base URL"),
+    username: str = typer.Option(..., "--username", "-n", help="Planka username"),
+    password: str = typer.Option(..., "--password", "-p", help="Planka password"),
+):
+    """Store credentials in ~/.config/planka-cli/tokens/credentials.json."""
+    credentials_path = get_credentials_path()
+    try:
+        write_file_atomic(
+            credentials_path,
+            json.dumps(
+                {
+                    "PLANKA_URL": url,
+                    "PLANKA_USERNAME": username,
+                    "PLANKA_PASSWORD": password,
+                },
+                indent=2,
+            )
+            + "\n",
+        )
+    except OSError as e:
+        print_error(f"Could not write {credentials_path}: {e}")
+        raise typer.Exit(1)
+
+    # A session issued for the previous credentials must not be reused.
+    clear_session()
+
+    console.print(f"[green]Saved credentials to[/green] {credentials_path}")
+
+
+@app.command()
+def logout():
+    """Delete the stored ~/.config/planka-cli/tokens/credentials.json file.
+
+    The profile's session, ID index, response cache and mirror go with it. Shared files
+    (config.json, the daemon socket) and other profiles are kept.
+    """
+    token_dir = get_token_dir()
+    credentials_path = get_credentials_path()
+    if not credentials_path.exists():
+        console.print(f"No stored credentials found at {credentials_path}")
+        return
+
+    try:
+        for name in PROFILE_FILENAMES:
+            for suffix in ("", *SQLITE_SIDE_FILE_SUFFIXES):
+                (token_dir / f"{name}{suffix}").unlink(missing_ok=True)
+        if ACTIVE_PROFILE.get():
+            shutil.rmtree(token_dir)
+    except OSError as e:
+        print_error(f"Could not delete {credentials_path}: {e}")
+        raise typer.Exit(1)
+
+    console.print("[green]Logged out.[/green] Removed stored credentials.")
+
+
+@app.command()
+def status():
+    """Check connection and print current user info."""
+    planka = get_planka()
+    try:
+        user = planka.me
+        console.print(
+            f"[green]Connected![/green] Logged in as: [bold]{user.username}[/bold] (ID: {user.id})"
+        )
+        if user.name:
+            console.print(f"Name: {user.name}")
+        console.print(f"Email: {user.email}")
+    except Exception as e:
+        print_error(e, "Error fetching status")
+
+
+PROFILE_COLUMNS = [
+    Column("name", "Profile", lambda p: p["name"], style="green", no_wrap=True),
+    Column("url", "URL", lambda p: p.get("PLANKA_URL"), style="magenta"),
+    Column("username", "Username", lambda p: p.get("PLANKA_USERNAME")),
+    Column("active", "Active", lambda p: p["active"], display=yes_no, justify="center"),
+]
+
+
+@profiles_app.command("list")
+def list_profiles_command():
+    """List stored profiles; add one with `planka-cli --profile NAME login ...`."""
+    active = ACTIVE_PROFILE.get() or DEFAULT_PROFILE
+    rows = []
+    for profile in list_profiles():
+        token = ACTIVE_PROFILE.set(None if profile == DEFAULT_PROFILE else profile)
+        try:
+            rows.append({"name": profile, "active": profile == active, **load_stored_credentials()})
+        finally:
+            ACTIVE_PROFILE.reset(token)
+    write_rows("Profiles", PROFILE_COLUMNS, rows, "No profiles found.")
+
+
+PROJECT_COLUMNS = [
+    Column("id", "ID", lambda p: p["id"], justify="right", style="cyan", no_wrap=True),
+    Column("name", "Name", lambda p: p["name"], style="magenta"),
+    Column("created_at", "Created At", lambda p: parse_timestamp(p["createdAt"]), justify="right"),
+]
+
+
+def board_columns(planka_url: Optional[str]) -> list[Column]:
+    def board_url(board: dict) -> Optional[str]:
+        if planka_url and board["id"]:
+            return f"{planka_url.rstrip('/')}/boards/{board['id']}"
+        return None
+
+    return [
+        Column("id", "ID", lambda b: b["id"], justify="right", style="cyan", no_wrap=True),
+        Column("name", "Name", lambda b: b["name"], style="magenta"),
+        Column("project_id", "Project ID", lambda b: b.get("projectId"), justify="right"),
+        Column("url", "URL", board_url, style="magenta"),
+    ]
+
+
+LIST_COLUMNS = [
+    Column("id", "ID", lambda li: li["id"], justify="right", style="cyan", no_wrap=True),
+    Column("name", "Name", lambda li: li.get("name"), style="magenta"),
+    Column("board_id", "Board ID", lambda li: li.get("boardId"), justify="right"),
+    Column("position", "Position", lambda li: li.get("position"), justify="right"),
+]
+
+
+def card_columns(planka_url: Optional[str], board_id: Optional[str]) -> list[Column]:
+    def card_url(card: dict) -> Optional[str]:
+        if planka_url and board_id and card["id"]:
+            return f"{planka_url.rstrip('/')}/boards/{board_id}/cards/{card['id']}"
+        return None
+
+    return [
+        Column("id", "ID", lambda c: c["id"], justify="right", style="cyan", no_wrap=True),
+        Column("name", "Name", lambda c: c["name"], style="magenta"),
+        Column("list_id", "List ID", lambda c: c.get("listId"), justify="right"),
+        Column("position", "Position", lambda c: c.get("position"), justify="right"),
+        Column("url", "URL", card_url, style="magenta"),
+    ]
+
+
+@projects_app.command("list")
+def list_projects(
+    all_profiles: bool = typer.Option(
+        False, "--all-profiles", help="List projects of every profile, with a profile column."
+    ),
+):
+    """List all projects."""
+    if all_profiles:
+        results = for_each_profile(lambda planka: [p.schema for p in planka.projects])
+        write_profile_rows(
+            "Projects",
+            [(profile, PROJECT_COLUMNS, projects) for profile, projects in results],
+            "No projects found.",
+        )
+        return
+    if OFFLINE:
+        conn = open_offline_mirror()
+        projects = mirror_rows(conn, "SELECT data FROM projects ORDER BY name")
+        write_rows("Projects", PROJECT_COLUMNS, projects, "No projects found.")
+        return
+
+    planka = get_planka()
+    try:
+        projects = [p.schema for p in planka.projects]
+        write_rows("Projects", PROJECT_COLUMNS, projects, "No projects found.")
+    except Exception as e:
+        print_error(e)
+
+
+@boards_app.command("list")
+def list_boards(
+    project_id: Optional[str] = typer.Argument(None, help="Project ID to filter by"),
+    all_profiles: bool = typer.Option(
+        False, "--all-profiles", help="List boards of every profile, with a profile column."
+    ),
+):
+    """List boards. Optionally filter by Project ID."""
+    if OFFLINE and not all_profiles:
+        conn = open_offline_mirror()
+        if project_id is not None:
+            projects = mirror_rows(conn, "SELECT data FROM projects WHERE id = ?", (project_id,))
+            if not projects:
+                print_not_found(f"Project {project_id} not found.")
+                return
+            boards_list = mirror_rows(
+                conn,
+                "SELECT data FROM boards WHERE project_id = ? ORDER BY position",
+                (project_id,),
+            )
+            title = f"Boards in Project {projects[0]['name']}"
+        else:
+            boards_list = mirror_rows(conn, "SELECT data FROM boards ORDER BY project_id, position")
+            title = "All Boards"
+        write_rows(title, board_columns(mirror_url(conn)), boards_list, "No boards found.")
+        return
+
+    if all_profiles:
+        if project_id is not None:
+            raise typer.BadParameter("Project IDs differ between instances; drop PROJECT_ID.")
+        results = for_each_profile(
+            lambda planka: (board_columns(planka_base_url(planka)), fetch_all_boards(planka))
+        )
+        write_profile_rows(
+            "All Boards",
+            [(profile, columns, boards) for profile, (columns, boards) in results],
+            "No boards found.",
+        )
+        return
+
+    planka = get_planka()
+    try:
+        if project_id is not None:
+            # Find specific project
+            project = next((p for p in planka.projects if p.id == project_id), None)
+            if not project:
+                print_not_found(f"Project {project_id} not found.")
+                return
+            boards_list = [b.schema for b in project.boards]
+            index_put(planka, "boards", boards_list)
+            title = f"Boards in Project {project.name}"
+        else:
+            boards_list = fetch_all_boards(planka)
+            title = "All Boards"
+
+        write_rows(title, board_columns(planka_base_url(planka)), boards_list, "No boards found.")
+    except Exception as e:
+        print_error(e)
+
+
+def fetch_all_boards(planka: "Planka") -> list[dict]:
+    """Boards of every project the user can see, fetching each project's in parallel."""
+
+    async def project_boards(engine: AsyncPlanka, project) -> list[dict]:
+        return (await engine.project(project.id))["included"]["boards"]
+
+    boards_list = [
+        board
+        for boards in engine_map(
+            planka, lambda p: [b.schema for b in p.boards], project_boards, planka.projects
+        )
+        for board in boards
+    ]
+    index_put(planka, "boards", boards_list)
+    return boards_list
+
+
+@boards_app.command("export")
+def export_board(
+    board_id: str = typer.Argument(
+        ..., help="Board ID to export", autocompletion=complete_ids("boards")
+    ),
+    file: Path = typer.Option(..., "-o", "--file", dir_okay=False, help="Output .jsonl.gz file"),
+    comments: bool = typer.Option(True, "--comments/--no-comments", help="Include comments"),
+):
+    """Export a board to a gzip'd JSONL archive.
+
+    One board request covers lists, cards, labels, tasks and attachment metadata. Comments
+    are fetched per card in parallel and written as they arrive.
+    """
+    import gzip
+
+    planka = get_planka()
+    partial = file.with_name(file.name + ".part")
+    counts = dict.fromkeys(BOARD_EXPORT_KINDS + ("comments",), 0)
+    try:
+        payload = planka.endpoints.getBoard(board_id)
+        board = payload["item"]
+        included = payload.get("included", {})
+        with gzip.open(partial, "wt", encoding="utf-8") as out:
+
+            def emit(kind: str, item: dict) -> None:
+                out.write(json.dumps({"type": kind, "item": item}) + "\n")
+
+            header = {"version": BOARD_EXPORT_VERSION, "source": planka_base_url(planka)}
+            out.write(json.dumps({"type": "export", "item": header}) + "\n")
+            emit("board", board)
+            for kind in BOARD_EXPORT_KINDS:
+                for item in included.get(kind, []):
+                    emit(kind, item)
+                    counts[kind] += 1
+            cards = included.get("cards", [])
+            del payload, included
+
+            if comments:
+                # Oldest first, so an import recreates each card's thread in order.
+                def card_comments(card: dict) -> list[dict]:
+                    if card.get("commentsTotal", card.get("commentsCount")) == 0:
+                        return []
+                    return list(iter_comments(planka, card["id"]))[::-1]
+
+                for thread in iter_fan_out(card_comments, cards):
+                    for comment in thread:
+                        emit("comments", comment)
+                        counts["comments"] += 1
+        partial.replace(file)
+    except Exception as e:
+        partial.unlink(missing_ok=True)
+        print_error(e)
+        raise typer.Exit(1)
+
+    console.print(
+        f"[green]Exported board {board.get('name')}[/green]: {counts['lists']} lists, "
+        f"{counts['cards']} cards, {counts['tasks']} tasks, {counts['comments']} comments "
+        f"({file})."
+    )
+
+
+def read_board_export(file: Path):
+    """Yield (kind, item) records from a board export, checking its version."""
+    import gzip
+
+    with gzip.open(file, "rt", encoding="utf-8") as lines:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "export":
+                version = record.get("item", {}).get("version")
+                if version != BOARD_EXPORT_VERSION:
+                    raise ValueError(f"Unsupported export version {version!r} in {file}.")
+                continue
+            if not isinstance(record.get("item"), dict):
+                raise ValueError(f"Line {number}: not a board export record.")
+            yield record.get("type"), record["item"]
+
+
+@boards_app.command("import")
+def import_board(
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Board export file"),
+    project_id: str = typer.Option(..., "--project-id", help="Project to create the board in"),
+    name: Optional[str] = typer.Option(None, "--name", help="Board name (default: the export's)"),
+):
+    """Recreate an exported board in a project.
+
+    Records are replayed in file order, in concurrent batches. Old IDs are mapped to the new
+    ones as they are created. File attachments are skipped; only links can be recreated.
+    """
+    planka = get_planka()
+    ids: dict[str, str] = {}
+    counts: dict[str, int] = {}
+    problems = {"failed": 0, "skipped": 0}
+    state: dict = {}
+
+    def optional(item: dict, *keys: str) -> dict:
+        return {key: item[key] for key in keys if item.get(key) is not None}
+
+    def create_board(item: dict) -> dict:
+        created = planka.endpoints.createBoard(
+            project_id, name=name or item["name"], position=item.get("position") or POSITION_GAP
+        )["item"]
+        # New boards come with their own archive and trash lists.
+        lists = planka.endpoints.getBoard(created["id"]).get("included", {}).get("lists", [])
+        state["system_lists"] = {lst["type"]: lst["id"] for lst in lists}
+        return created
+
+    def create_list(item: dict) -> Optional[dict]:
+        if item.get("type") in ("archive", "trash"):
+            existing = state["system_lists"].get(item["type"])
+            return {"id": existing} if existing else None
+        return planka.endpoints.createList(
+            ids[item["boardId"]],
+            type=item.get("type") or "active",
+            position=item["position"],
+            name=item["name"],
+        )["item"]
+
+    def create_attachment(item: dict) -> Optional[dict]:
+        url = (item.get("data") or {}).get("url")
+        if item.get("type") != "link" or not url:
+            return None
+        return planka.endpoints.createAttachment(
+            ids[item["cardId"]], type="link", url=url, name=item["name"]
+        )["item"]
+
+    creators = {
+        "labels": lambda item: planka.endpoints.createLabel(
+            ids[item["boardId"]], position=item["position"], **optional(item, "name", "color")
+        )["item"],
+        "lists": create_list,
+        "cards": lambda item: planka.endpoints.createCard(
+            ids[item["listId"]],
+            type=item.get("type") or "project",
+            position=item.get("position"),
+            name=item["name"],
+            **optional(item, "description", "dueDate", "isDueCompleted"),
+        )["item"],
+        "cardLabels": lambda item: planka.endpoints.createCardLabel(
+            ids[item["cardId"]], labelId=ids[item["labelId"]]
+        )["item"],
+        "taskLists": lambda item: planka.endpoints.createTaskList(
+            ids[item["cardId"]],
+            position=item["position"],
+            name=item["name"],
+            **optional(item, "showOnFrontOfCard", "hideCompletedTasks"),
+        )["item"],
+        "tasks": lambda item: planka.endpoints.createTask(
+            ids[item["taskListId"]],
+            position=item["position"],
+            **optional(item, "name", "isCompleted"),
+        )["item"],
+        "attachments": create_attachment,
+        "comments": lambda item: planka.endpoints.createComment(
+            ids[item["cardId"]], text=item["text"]
+        )["item"],
+    }
+
+    def replay(group: tuple[str, list[dict]]) -> list[str]:
+        """Create a group's items in order; returns one outcome per item."""
+        kind, items = group
+        outcomes = []
+        for item in items:
+            try:
+                created = creators[kind](item)
+            except KeyError:
+                # Its parent was skipped or failed to import.
+                outcomes.append("skipped")
+                continue
+            except Exception as exc:
+                err_console.print(f"[red]{kind} {item.get('id')}: {exc}[/red]")
+                outcomes.append("failed")
+                continue
+            if created is None:
+                outcomes.append("skipped")
+            else:
+                ids[item["id"]] = created["id"]
+                outcomes.append("created")
+        return outcomes
+
+    def flush(kind: str, batch: list[dict]) -> None:
+        # A card's comments stay in one sequential group to keep their order.
+        if kind == "comments":
+            groups: list[tuple[str, list[dict]]] = []
+            for item in batch:
+                if groups and groups[-1][1][0].get("cardId") == item.get("cardId"):
+                    groups[-1][1].append(item)
+                else:
+                    groups.append((kind, [item]))
+        else:
+            groups = [(kind, [item]) for item in batch]
+        for outcomes in fan_out(replay, groups):
+            for outcome in outcomes:
+                if outcome == "created":
+                    counts[kind] = counts.get(kind, 0) + 1
+                else:
+                    problems[outcome] += 1
+
+    board = None
+    try:
+        kind, batch = None, []
+        for record_kind, item in read_board_export(file):
+            if record_kind == "board":
+                if board is not None:
+                    raise ValueError(f"{file} contains more than one board.")
+                board = create_board(item)
+                ids[item["id"]] = board["id"]
+                continue
+            if record_kind not in creators:
+                continue
+            if board is None:
+                raise ValueError(f"{file} has no board record before its {record_kind}.")
+            if batch and (record_kind != kind or len(batch) >= BOARD_IMPORT_BATCH):
+                flush(kind, batch)
+                batch = []
+            kind = record_kind
+            batch.append(item)
+        if batch:
+            flush(kind, batch)
+        if board is None:
+            raise ValueError(f"{file} has no board record.")
+    except Exception as e:
+        print_error(e)
+        raise typer.Exit(1)
+
+    console.print(
+        f"[green]Imported board {board.get('name')} ({board['id']})[/green]: "
+        f"{counts.get('lists', 0)} lists, {counts.get('cards', 0)} cards, "
+        f"{counts.get('tasks', 0)} tasks, {counts.get('comments', 0)} comments "
+        f"({problems['failed']} failed, {problems['skipped']} skipped)."
+    )
+    if problems["failed"]:
+        raise typer.Exit(1)
+
+
+@lists_app.command("list")
+def list_lists(
+    board_id: str = typer.Argument(..., help="Board ID", autocompletion=complete_ids("boards")),
+):
+    """List all lists in a board."""
+    if OFFLINE:
+        conn = open_offline_mirror()
+        boards = mirror_rows(conn, "SELECT data FROM boards WHERE id = ?", (board_id,))
+        if not boards:
+            print_not_found(f"Board {board_id} not found.")
+            return
+        lists = mirror_rows(
+            conn,
+            "SELECT data FROM lists WHERE board_id = ? AND type IN ('active', 'closed') "
+            "ORDER BY type = 'closed', position",
+            (board_id,),
+        )
+        title = f"Lists in Board: {boards[0]['name']}"
+        write_rows(title, LIST_COLUMNS, lists, "No lists found.")
+        return
+
+    planka = get_planka()
+    try:
+        payload = fetch_payload(planka, "boards", board_id)
+
+        if not payload:
+            print_not_found(f"Board {board_id} not found.")
+            return
+
+        board_lists = payload.get("included", {}).get("lists", [])
+        lists = [lst for lst in board_lists if lst.get("type") == "active"] + [
+            lst for lst in board_lists if lst.get("type") == "closed"
+        ]
+        index_put(planka, "lists", lists)
+        title = f"Lists in Board: {payload['item'].get('name')}"
+        write_rows(title, LIST_COLUMNS, lists, "No lists found.")
+
+    except Exception as e:
+        print_error(e)
+
+
+def board_card_columns(
+    planka_url: Optional[str], board: dict, lists: list[dict], labels: dict[str, list[str]]
+) -> list[Column]:
+    """Card columns for a whole board: the list, label names and due date of each card."""
+    list_names = {lst["id"]: lst.get("name") for lst in lists}
+    columns = {column.key: column for column in card_columns(planka_url, board["id"])}
+    return [
+        columns["id"],
+        columns["name"],
+        Column("list", "List", lambda c: list_names.get(c.get("listId")), style="green"),
+        columns["list_id"],
+        Column(
+            "labels",
+            "Labels",
+            lambda c: labels.get(c["id"], []),
+            display=lambda names: ", ".join(names) or "-",
+            style="yellow",
+        ),
+        Column("due_date", "Due", lambda c: parse_timestamp(c.get("dueDate")), justify="right"),
+        Column(
+            "due_completed",
+            "Done",
+            lambda c: c.get("isDueCompleted"),
+            display=yes_no,
+            justify="center",
+        ),
+        columns["position"],
+        columns["url"],
+    ]
+
+
+def render_board_cards(
+    planka_url: Optional[str],
+    board: dict,
+    included: dict,
+    list_filters: Optional[list[str]],
+) -> None:
+    """Render a board's cards grouped by list, from one board payload's collections.
+
+    Tables get one section per list; json/ndjson/tsv get one row per card, in list order.
+    """
+    board_lists = sorted(
+        (lst for lst in included.get("lists", []) if lst.get("type") in ("active", "closed")),
+        key=lambda lst: (lst.get("type") == "closed", lst.get("position") or 0),
+    )
+    if list_filters:
+        wanted = []
+        for value in list_filters:
+            found = next(
+                (
+                    lst
+                    for lst in board_lists
+                    if lst["id"] == value or (lst.get("name") or "").lower() == value.lower()
+                ),
+                None,
+            )
+            if found is None:
+                raise typer.BadParameter(
+                    f"No list {value!r} on board {board.get('name')}.", param_hint="--list"
+                )
+            if found not in wanted:
+                wanted.append(found)
+        board_lists = wanted
+
+    label_names = {
+        label["id"]: label.get("name") or label.get("color") for label in included.get("labels", [])
+    }
+    labels: dict[str, list[str]] = {}
+    for card_label in included.get("cardLabels", []):
+        name = label_names.get(card_label.get("labelId"))
+        if name:
+            labels.setdefault(card_label["cardId"], []).append(name)
+    by_list: dict[str, list[dict]] = {lst["id"]: [] for lst in board_lists}
+    for card in included.get("cards", []):
+        if card.get("listId") in by_list:
+            by_list[card["listId"]].append(card)
+    for cards in by_list.values():
+        cards.sort(key=lambda card: card.get("position") or 0)
+
+    columns = board_card_columns(planka_url, board, board_lists, labels)
+    if OUTPUT_FORMAT == "table":
+        if not OUTPUT_FIELDS:
+            # Each table is already one list.
+            columns = [column for column in columns if column.key not in ("list", "list_id")]
+        console.print(f"[bold]Cards in Board: {board.get('name')}[/bold]")
+        for lst in board_lists:
+            cards = by_list[lst["id"]]
+            write_rows(
+                f"{lst.get('name')} ({len(cards)})", columns, cards, f"{lst.get('name')}: no cards."
+            )
+        return
+    write_rows(
+        f"Cards in Board: {board.get('name')}",
+        columns,
+        (card for lst in board_lists for card in by_list[lst["id"]]),
+        "No cards found.",
+    )
+
+
+@cards_app.command("list")
+def list_cards(
+    list_id: Optional[str] = typer.Argument(
+        None, help="List ID (omit with --board)", autocompletion=complete_ids("lists")
+    ),
+    board_id: Optional[str] = typer.Option(
+        None,
+        "--board",
+        help="List every card on this board, grouped by list.",
+        autocompletion=complete_ids("boards"),
+    ),
+    list_filters: Optional[list[str]] = typer.Option(
+        None,
+        "--list",
+        help="With --board, only these lists (ID or name; repeatable).",
+        autocompletion=complete_ids("lists"),
+    ),
+):
+    """List all cards in a list, or on a whole board with --board."""
+    if (list_id is None) == (board_id is None):
+        raise typer.BadParameter("Pass either a LIST_ID or --board BOARD_ID.")
+    if list_filters and board_id is None:
+        raise typer.BadParameter("--list filters need --board.", param_hint="--list")
+
+    if board_id is not None:
+        if OFFLINE:
+            conn = open_offline_mirror()
+            boards = mirror_rows(conn, "SELECT data FROM boards WHERE id = ?", (board_id,))
+            if not boards:
+                print_not_found(f"Board {board_id} not found.")
+                return
+            included = {
+                key: mirror_rows(conn, f"SELECT data FROM {table} WHERE board_id = ?", (board_id,))
+                for table, (key, _) in MIRROR_BOARD_TABLES.items()
+                if key in ("lists", "cards", "labels", "cardLabels")
+            }
+            render_board_cards(mirror_url(conn), boards[0], included, list_filters)
+            return
+
+        planka = get_planka()
+        try:
+            payload = fetch_payload(planka, "boards", board_id)
+            if not payload:
+                print_not_found(f"Board {board_id} not found.")
+                return
+            included = payload.get("included", {})
+            index_put(planka, "lists", included.get("lists", []))
+            index_put(planka, "cards", included.get("cards", []))
+            render_board_cards(planka_base_url(planka), payload["item"], included, list_filters)
+        except typer.BadParameter:
+            raise
+        except Exception as e:
+            print_error(e)
+        return
+
+    if OFFLINE:
+        conn = open_offline_mirror()
+        lists = mirror_rows(conn, "SELECT data FROM lists WHERE id = ?", (list_id,))
+        if not lists:
+            print_not_found(f"List {list_id} not found.")
+            return
+        cards = mirror_rows(
+            conn, "SELECT data FROM cards WHERE list_id = ? ORDER BY position", (list_id,)
+        )
+        columns = card_columns(mirror_url(conn), lists[0]["boardId"])
+        write_rows(f"Cards in List: {lists[0]['name']}", columns, cards, "No cards found.")
+        return
+
+    planka = get_planka()
+    try:
+        payload = fetch_payload(planka, "lists", list_id)
+
+        if not payload:
+            print_not_found(f"List {list_id} not found.")
+            return
+
+        target_list = payload["item"]
+        cards = payload.get("included", {}).get("cards", [])
+        index_put(planka, "cards", cards)
+        columns = card_columns(planka_base_url(planka), target_list.get("boardId"))
+        title = f"Cards in List: {target_list.get('name')}"
+        write_rows(title, columns, cards, "No cards found.")
+
+    except Exception as e:
+        print_error(e)
+
+
+def search_terms(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def utc_timestamp(value: datetime) -> str:
+    """Format a datetime like Planka's API timestamps, so they compare as strings."""
+    return as_utc(value).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+@cards_app.command("search")
+def search_cards(
+    query: str = typer.Argument(..., help="Words to look for in card names and descriptions"),
+    board_id: Optional[str] = typer.Option(
+        None, "--board", help="Only cards on this board.", autocompletion=complete_ids("boards")
+    ),
+    list_id: Optional[str] = typer.Option(
+        None, "--list", help="Only cards in this list.", autocompletion=complete_ids("lists")
+    ),
+    label: Optional[str] = typer.Option(None, "--label", help="Only cards with this label."),
+    due_before: Optional[str] = typer.Option(
+        None, "--due-before", help="Only cards due before this ISO-8601 datetime."
+    ),
+    limit: int = typer.Option(20, "--limit", min=1, help="Maximum number of results."),
+):
+    """Search cards in the local mirror (see `sync`), best matches first."""
+    match = search_terms(query)
+    if not match:
+        raise typer.BadParameter("Query must contain at least one word.", param_hint="QUERY")
+    due_limit = parse_iso_datetime(due_before)
+
+    conn = open_offline_mirror()
+    try:
+        # Name matches outweigh description matches, which outweigh comment matches.
+        sql = (
+            "SELECT cards.data, lists.name, -bm25(card_search, 10.0, 3.0, 1.0) AS score "
+            "FROM card_search "
+            "JOIN card_search_state ON card_search_state.doc = card_search.rowid "
+            "JOIN cards ON cards.id = card_search_state.card_id "
+            "LEFT JOIN lists ON lists.id = cards.list_id "
+            "WHERE card_search MATCH ?"
+        )
+        params: list = [match]
+        if board_id:
+            sql += " AND cards.board_id = ?"
+            params.append(board_id)
+        if list_id:
+            sql += " AND cards.list_id = ?"
+            params.append(list_id)
+        if label:
+            sql += (
+                " AND EXISTS (SELECT 1 FROM card_labels "
+                "JOIN labels ON labels.id = card_labels.label_id "
+                "WHERE card_labels.card_id = cards.id "
+                "AND (labels.id = ? OR labels.name = ? COLLATE NOCASE))"
+            )
+            params.extend([label, label])
+        if due_limit is not None:
+            sql += " AND json_extract(cards.data, '$.dueDate') < ?"
+            params.append(utc_timestamp(due_limit))
+        sql += " ORDER BY score DESC LIMIT ?"
+        params.append(limit)
+
+        results = []
+        for data, list_name, score in conn.execute(sql, params):
+            card = json.loads(data)
+            card["listName"] = list_name
+            card["score"] = round(score, 2)
+            results.append(card)
+        planka_url = mirror_url(conn)
+    except Exception as e:
+        print_error(e)
+        return
+
+    def card_url(card: dict) -> Optional[str]:
+        if planka_url and card.get("boardId"):
+            return f"{planka_url.rstrip('/')}/boards/{card['boardId']}/cards/{card['id']}"
+        return None
+
+    columns = [
+        Column("id", "ID", lambda c: c["id"], justify="right", style="cyan", no_wrap=True),
+        Column("name", "Name", lambda c: c["name"], style="magenta"),
+        Column("board_id", "Board ID", lambda c: c.get("boardId"), justify="right"),
+        Column("list", "List", lambda c: c["listName"]),
+        Column("due_date", "Due Date", lambda c: parse_timestamp(c.get("dueDate"))),
+        Column("score", "Score", lambda c: c["score"], justify="right"),
+        Column("url", "URL", card_url, style="magenta"),
+    ]
+    write_rows(f"Cards matching: {query}", columns, results, "No cards found.")
+
+
+def safe_attr(obj: object, name: str) -> object:
+    try:
+        return getattr(obj, name)
+    except Exception:
+        return None
+
+
+def normalize_url(base_url: Optional[str], value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    candidate = str(value).strip()
+    if not candidate:
+        return None
+    if candidate.startswith("http://") or candidate.startswith("https://"):
+        return candidate
+    if base_url:
+        return f"{base_url.rstrip('/')}/{candidate.lstrip('/')}"
+    return candidate
+
+
+def extract_attachment_url(attachment: dict, base_url: Optional[str]) -> Optional[str]:
+    data = attachment.get("data")
+    if isinstance(data, dict):
+        for key in (
+            "url",
+            "downloadUrl",
+            "download_url",
+            "link",
+            "href",
+            "path",
+        ):
+            value = data.get(key)
+            if isinstance(value, str) and value.strip():
+                return normalize_url(base_url, value)
+        file_info = data.get("file")
+        if isinstance(file_info, dict):
+            for key in (
+                "url",
+                "downloadUrl",
+                "download_url",
+                "path",
+                "thumbnailUrl",
+                "thumbUrl",
+                "thumbnail_url",
+            ):
+                value = file_info.get(key)
+                if isinstance(value, str) and value.strip():
+                    return normalize_url(base_url, value)
+    direct_url = attachment.get("url")
+    if isinstance(direct_url, str) and direct_url.strip():
+        return normalize_url(base_url, direct_url)
+    return None
+
+
+def attachment_row(attachment: dict, base_url: Optional[str]) -> dict:
+    return {
+        "id": attachment.get("id"),
+        "name": attachment.get("name"),
+        "type": attachment.get("type"),
+        "url": extract_attachment_url(attachment, base_url),
+        "created_at": parse_timestamp(attachment.get("createdAt")),
+    }
+
+
+def comment_row(comment: dict, users: dict[str, dict]) -> dict:
+    """A comment with its author resolved from the page's included users."""
+    user = users.get(comment.get("userId")) or {}
+    text = comment.get("text")
+    return {
+        "id": comment.get("id"),
+        "user": user.get("name") or user.get("username") or comment.get("userId"),
+        "text": " ".join(str(text).split()) if text else None,
+        "created_at": parse_timestamp(comment.get("createdAt")),
+    }
+
+
+COMMENT_COLUMNS = [
+    Column("id", "ID", lambda c: c["id"], justify="right", style="cyan", no_wrap=True),
+    Column("user", "User", lambda c: c["user"], style="magenta"),
+    Column("text", "Text", lambda c: c["text"], style="magenta"),
+    Column("created_at", "Created At", lambda c: c["created_at"], justify="right"),
+]
+
+
+CARD_DETAIL_FIELDS = [
+    ("id", "ID"),
+    ("url", "URL"),
+    ("name", "Name"),
+    ("description", "Description"),
+    ("board_id", "Board ID"),
+    ("list", "List"),
+    ("position", "Position"),
+    ("type", "Type"),
+    ("due_date", "Due Date"),
+    ("due_completed", "Due Completed"),
+    ("attachments", "Attachments"),
+    ("comments", "Comments"),
+    ("created_at", "Created At"),
+    ("updated_at", "Updated At"),
+]
+
+
+def count_display(value: object) -> str:
+    return str(len(value)) if isinstance(value, list) else display_value(value)
+
+
+def card_detail_columns(view: dict) -> list[Column]:
+    """Field/Value columns over a card view built by fetch_card_view or offline_card_view."""
+
+    def comments_display(value: object) -> str:
+        # The card's own count stays right when only the first page of comments was fetched.
+        count = view.get("comments_count")
+        if isinstance(value, list) and isinstance(count, int):
+            return str(count)
+        return count_display(value)
+
+    displays = {
+        "due_completed": lambda v: yes_no(v) if isinstance(v, bool) else display_value(v),
+        "attachments": count_display,
+        "comments": comments_display,
+    }
+    return [
+        Column(
+            key, header, lambda item, key=key: item[key], display=displays.get(key, display_value)
+        )
+        for key, header in CARD_DETAIL_FIELDS
+    ]
+
+
+def print_card_sections(selected: set[str], attachments: object, comments: object) -> None:
+    """Print the attachment and comment tables under a card's Field/Value table."""
+    if "attachments" in selected and isinstance(attachments, list) and attachments:
+        attachments_table = make_table("Attachments")
+        attachments_table.add_column("ID", justify="right", style="cyan", no_wrap=True)
+        attachments_table.add_column("Name", style="magenta")
+        attachments_table.add_column("Type", style="magenta")
+        attachments_table.add_column("URL", style="magenta")
+        attachments_table.add_column("Created At", justify="right")
+
+        for row in attachments:
+            attachments_table.add_row(
+                display_value(row["id"]),
+                display_value(row["name"]),
+                display_value(row["type"]),
+                display_value(row["url"]),
+                display_value(row["created_at"]),
+            )
+
+        console.print(attachments_table)
+
+    if "comments" in selected and isinstance(comments, list) and comments:
+        comments_table = make_table("Comments")
+        comments_table.add_column("ID", justify="right", style="cyan", no_wrap=True)
+        comments_table.add_column("User", style="magenta")
+        comments_table.add_column("Text", style="magenta")
+        comments_table.add_column("Created At", justify="right")
+
+        for row in comments:
+            comments_table.add_row(
+                display_value(row["id"]),
+                display_value(row["user"]),
+                display_value(row["text"]),
+                display_value(row["created_at"]),
+            )
+
+        console.print(comments_table)
+
+
+def offline_card_view(conn: "sqlite3.Connection", card_id: str) -> Optional[dict]:
+    """Build a card view from the mirror; comments are not mirrored, only counted."""
+    cards = mirror_rows(conn, "SELECT data FROM cards WHERE id = ?", (card_id,))
+    if not cards:
+        return None
+    card = cards[0]
+    planka_url = mirror_url(conn)
+    board_id = card.get("boardId")
+    lists = mirror_rows(conn, "SELECT data FROM lists WHERE id = ?", (card.get("listId"),))
+    list_name = lists[0].get("name") if lists else None
+    attachments = [
+        attachment_row(attachment, planka_url)
+        for attachment in mirror_rows(
+            conn, "SELECT data FROM attachments WHERE card_id = ? ORDER BY id", (card_id,)
+        )
+    ]
+    return {
+        "id": card["id"],
+        "url": f"{planka_url.rstrip('/')}/boards/{board_id}/cards/{card['id']}"
+        if planka_url and board_id
+        else None,
+        "name": card.get("name"),
+        "description": card.get("description"),
+        "board_id": board_id,
+        "list": f"{list_name} ({card.get('listId')})" if list_name else card.get("listId"),
+        "position": card.get("position"),
+        "type": card.get("type"),
+        "due_date": parse_timestamp(card.get("dueDate")),
+        "due_completed": card.get("isDueCompleted"),
+        "attachments": attachments,
+        "comments": card.get("commentsCount"),
+        "comments_count": card.get("commentsCount"),
+        "created_at": parse_timestamp(card.get("createdAt")),
+        "updated_at": parse_timestamp(card.get("updatedAt")),
+    }
+
+
+def card_view(schema: dict, list_schema: Optional[dict], fetched: dict, planka_url: str) -> dict:
+    """Assemble a card view from the card's fields and its fetched sub-resources."""
+    list_schema = list_schema if isinstance(list_schema, dict) else {}
+    board_id = schema.get("boardId") or list_schema.get("boardId")
+    list_id = list_schema.get("id") or schema.get("listId")
+    list_name = list_schema.get("name")
+    return {
+        "id": schema["id"],
+        "url": f"{planka_url}/boards/{board_id}/cards/{schema['id']}" if board_id else None,
+        "name": schema.get("name"),
+        "description": schema.get("description"),
+        "board_id": board_id,
+        "list": f"{list_name} ({list_id})" if list_name and list_id else list_name or list_id,
+        "position": schema.get("position"),
+        "type": schema.get("type"),
+        "due_date": parse_timestamp(schema.get("dueDate")),
+        "due_completed": schema.get("isDueCompleted"),
+        "attachments": fetched.get("attachments"),
+        "comments": fetched.get("comments"),
+        "comments_count": schema.get("commentsCount"),
+        "created_at": parse_timestamp(schema.get("createdAt")),
+        "updated_at": parse_timestamp(schema.get("updatedAt")),
+    }
+
+
+def card_view_needs_list(schema: dict, wanted: set[str]) -> bool:
+    return "list" in wanted or (not schema.get("boardId") and bool(wanted & {"board_id", "url"}))
+
+
+def fetch_card_view(
+    planka: "Planka",
+    card_id: str,
+    wanted: set[str],
+    planka_url: str,
+    comment_limit: int = COMMENTS_PAGE_SIZE,
+) -> Optional[dict]:
+    """Fetch a card and, in parallel, only the sub-resources the wanted fields need."""
+    payload = fetch_payload(planka, "cards", card_id)
+    if payload is None:
+        return None
+    schema = payload["item"]
+
+    jobs = {}
+    if card_view_needs_list(schema, wanted):
+        jobs["list"] = lambda: safe_attr(find_list(planka, schema["listId"]), "schema")
+    if "attachments" in wanted:
+        jobs["attachments"] = lambda: [
+            attachment_row(attachment, planka_url)
+            for attachment in payload.get("included", {}).get("attachments", [])
+        ]
+    if "comments" in wanted:
+        jobs["comments"] = lambda: list(
+            itertools.islice(iter_comment_rows(planka, card_id), comment_limit)
+        )
+
+    def run(job) -> object:
+        try:
+            return job()
+        except Exception as exc:
+            return f"Error: {exc}"
+
+    fetched = dict(zip(jobs, fan_out(run, jobs.values())))
+    return card_view(schema, fetched.get("list"), fetched, planka_url)
+
+
+async def fetch_card_view_async(
+    engine: AsyncPlanka,
+    card_id: str,
+    wanted: set[str],
+    planka_url: str,
+    comment_limit: int = COMMENTS_PAGE_SIZE,
+) -> Optional[dict]:
+    """fetch_card_view on the async engine: the same view from the same requests."""
+    payload = await engine.payload("cards", card_id)
+    if payload is None:
+        return None
+    schema = payload["item"]
+
+    jobs = {}
+    if card_view_needs_list(schema, wanted):
+        jobs["list"] = engine.list_item(schema["listId"])
+    if "comments" in wanted:
+        jobs["comments"] = engine.comment_rows(card_id, comment_limit)
+
+    async def run(job) -> object:
+        try:
+            return await job
+        except Exception as exc:
+            return f"Error: {exc}"
+
+    fetched = dict(zip(jobs, await engine.gather(run(job) for job in jobs.values())))
+    if "attachments" in wanted:
+        fetched["attachments"] = [
+            attachment_row(attachment, planka_url)
+            for attachment in payload.get("included", {}).get("attachments", [])
+        ]
+    return card_view(schema, fetched.get("list"), fetched, planka_url)
+
+
+def render_card_views(card_ids: list[str], views: list, excluded: set[str]) -> None:
+    """Render card views in input order: Field/Value tables, or one record per card."""
+    if OUTPUT_FORMAT == "table" or len(card_ids) == 1:
+        for card_id, view in zip(card_ids, views):
+            if view is None:
+                print_not_found(f"Card {card_id} not found.")
+                continue
+            columns = [c for c in card_detail_columns(view) if c.key not in excluded]
+            selected = {c.key for c in write_record(f"Card: {view['name']}", columns, view)}
+            if OUTPUT_FORMAT == "table":
+                print_card_sections(selected, view["attachments"], view["comments"])
+        return
+
+    columns = [c for c in card_detail_columns({}) if c.key not in excluded]
+    writer = RowWriter("Cards", columns, "No cards found.")
+    for card_id, view in zip(card_ids, views):
+        if view is None:
+            print_not_found(f"Card {card_id} not found.")
+        else:
+            writer.add(view)
+    writer.close()
+
+
+@cards_app.command("show")
+def show_card(
+    card_ids: list[str] = typer.Argument(
+        ..., help="Card ID(s) to show", autocompletion=complete_ids("cards")
+    ),
+    no_comments: bool = typer.Option(False, "--no-comments", help="Skip fetching comments"),
+    no_attachments: bool = typer.Option(
+        False, "--no-attachments", help="Skip fetching attachments"
+    ),
+    comment_limit: int = typer.Option(
+        COMMENTS_PAGE_SIZE,
+        "--comment-limit",
+        min=1,
+        help="Newest comments to show per card (see `cards comments` for more).",
+    ),
+):
+    """Show details for one or more cards.
+
+    Several IDs are fetched in parallel and shown in the order given. Sub-resources (list,
+    attachments, comments) are only fetched when a selected field needs them.
+    """
+    excluded = {"comments"} if no_comments else set()
+    if no_attachments:
+        excluded.add("attachments")
+    columns = [c for c in card_detail_columns({}) if c.key not in excluded]
+    wanted = {column.key for column in select_columns(columns)}
+
+    if OFFLINE:
+        conn = open_offline_mirror()
+        views = [offline_card_view(conn, card_id) for card_id in card_ids]
+        render_card_views(card_ids, views, excluded)
+        return
+
+    planka = get_planka()
+    try:
+        planka_url = planka_base_url(planka)
+        views = engine_map(
+            planka,
+            lambda card_id: fetch_card_view(planka, card_id, wanted, planka_url, comment_limit),
+            lambda engine, card_id: fetch_card_view_async(
+                engine, card_id, wanted, planka_url, comment_limit
+            ),
+            card_ids,
+        )
+        render_card_views(card_ids, views, excluded)
+    except Exception as e:
+        print_error(e)
+
+
+@cards_app.command("comments")
+def list_comments(
+    card_id: str = typer.Argument(..., help="Card ID", autocompletion=complete_ids("cards")),
+    limit: int = typer.Option(20, "--limit", min=1, help="Maximum number of comments."),
+    before: Optional[str] = typer.Option(
+        None, "--before", help="Only comments older than this comment ID."
+    ),
+    after: Optional[str] = typer.Option(
+        None, "--after", help="Only comments newer than this comment ID."
+    ),
+    all_comments: bool = typer.Option(
+        False, "--all", help="Every matching comment, however many (ignores --limit)."
+    ),
+):
+    """List a card's comments, newest first.
+
+    Pages are fetched only as rows are written, so --limit needs a single request for up to
+    50 comments, and --all with --output ndjson streams any history in constant memory.
+    """
+    planka = get_planka()
+    try:
+        rows = iter_comment_rows(planka, card_id, before, after)
+        if not all_comments:
+            rows = itertools.islice(rows, limit)
+        write_rows(f"Comments on Card {card_id}", COMMENT_COLUMNS, rows, "No comments found.")
+    except Exception as e:
+        print_error(e)
+
+
+@cards_app.command("create")
+def create_card(
+    list_id: str = typer.Argument(
+        ..., help="List ID to create the card in", autocompletion=complete_ids("lists")
+    ),
+    name: str = typer.Argument(..., help="Card name/title"),
+    description: Optional[str] = typer.Option(None, "--description", "-d", help="Card description"),
+    position: str = typer.Option(
+        "bottom", "--position", "-p", help="Position: top, bottom, or integer"
+    ),
+    card_type: str = typer.Option("project", "--type", "-t", help="Card type (project, story)"),
+    due_date: Optional[str] = typer.Option(None, "--due-date", help="Due date (ISO-8601)"),
+    due_completed: bool = typer.Option(False, "--due-completed", help="Mark due date as completed"),
+):
+    """Create a new card in a list."""
+    planka = get_planka()
+    try:
+        payload = fetch_payload(planka, "lists", list_id)
+        if not payload:
+            print_not_found(f"List {list_id} not found.")
+            return
+
+        parsed_due_date = parse_iso_datetime(due_date)
+        parsed_position = parse_position(position) or "bottom"
+        if parsed_position == "top":
+            parsed_position = 0
+        elif parsed_position == "bottom":
+            cards = payload.get("included", {}).get("cards", [])
+            top = max((card.get("position") or 0 for card in cards), default=0)
+            parsed_position = top + POSITION_GAP
+
+        fields: dict[str, object] = {"name": name, "type": card_type, "position": parsed_position}
+        if description:
+            fields["description"] = description
+        if parsed_due_date:
+            fields["dueDate"] = as_utc(parsed_due_date).isoformat()
+        if due_completed:
+            fields["isDueCompleted"] = True
+        card = planka.endpoints.createCard(list_id, **fields)["item"]
+        index_put(planka, "cards", [card])
+
+        console.print(
+            f"[green]Created card[/green] [bold]{card['name']}[/bold] "
+            f"(ID: {card['id']}) in list [bold]{payload['item'].get('name')}[/bold]"
+        )
+    except Exception as e:
+        print_error(e)
+
+
+IMPORT_FIELD_ALIASES = {
+    "dueDate": "due_date",
+    "isDueCompleted": "due_completed",
+    "listId": "list_id",
+}
+
+
+def read_import_rows(path: Path, file_format: str):
+    """Yield (row number, fields) from a CSV or JSONL file without loading it whole."""
+    import csv
+
+    with path.open(newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                yield row_number, row
+            return
+        row_number = 0
+        for line in handle:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                row = {"error": f"Invalid JSON: {exc}"}
+            yield row_number, row if isinstance(row, dict) else {"error": "Not a JSON object"}
+
+
+def load_import_results(results_path: Path) -> dict[int, dict]:
+    """Latest result per row from a previous run's results file."""
+    results: dict[int, dict] = {}
+    if not results_path.exists():
+        return results
+    for line in results_path.read_text().splitlines():
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(result, dict) and isinstance(result.get("row"), int):
+            results[result["row"]] = result
+    return results
+
+
+def truthy(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "y"}
+    return bool(value)
+
+
+@cards_app.command("import")
+def import_cards(
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, help="CSV or JSONL file"),
+    list_id: Optional[str] = typer.Option(
+        None,
+        "--list-id",
+        help="Target list for rows without a list_id column",
+        autocompletion=complete_ids("lists"),
+    ),
+    file_format: Optional[str] = typer.Option(
+        None,
+        "--format",
+        click_type=click.Choice(["csv", "jsonl"]),
+        help="Input format (default: from the file extension)",
+    ),
+    card_type: str = typer.Option("project", "--type", "-t", help="Default card type"),
+    rate: float = typer.Option(
+        10.0, "--rate", min=0, help="Max cards created per second (0: no limit)"
+    ),
+    results: Optional[Path] = typer.Option(
+        None, "--results", help="Per-row results file (default: FILE.results.jsonl)"
+    ),
+    resume: bool = typer.Option(
+        False, "--resume", help="Skip rows the results file already records as created"
+    ),
+):
+    """Create one card per row of a CSV or JSONL file.
+
+    Columns: name (required), description, type, due_date, due_completed and list_id.
+    Cards keep the file's order and go below the list's existing cards.
+    """
+    if file_format is None:
+        file_format = "csv" if file.suffix.lower() == ".csv" else "jsonl"
+    results_path = results or file.with_name(file.name + ".results.jsonl")
+    previous = load_import_results(results_path) if resume else {}
+
+    planka = get_planka()
+    # Per list: the base position (below existing cards) and how many rows were placed so far.
+    lists: dict[str, Optional[dict]] = {}
+    results_lock = threading.Lock()
+    limiter = RateLimiter(rate)
+    counts = {"created": 0, "failed": 0, "skipped": 0}
+
+    def plan(entry: tuple[int, dict]) -> dict:
+        """Resolve the row's list and position on the reading thread, in file order."""
+        row_number, row = entry
+        row = {IMPORT_FIELD_ALIASES.get(key, key): value for key, value in row.items()}
+        task = {"row": row_number, "fields": row, "list_id": row.get("list_id") or list_id}
+        prior = previous.get(row_number, {})
+        if "error" in row:
+            task["error"] = row["error"]
+        elif not row.get("name"):
+            task["error"] = "Missing name."
+        elif not task["list_id"]:
+            task["error"] = "No list_id column and no --list-id."
+        if "error" in task:
+            return task
+
+        target = task["list_id"]
+        if target not in lists:
+            if isinstance(prior.get("position"), (int, float)):
+                # Resuming: keep the positions planned by the first run.
+                lists[target] = {"base": prior["position"] - POSITION_GAP, "placed": 0}
+            else:
+                try:
+                    payload = planka.endpoints.getList(target)
+                except Exception as exc:
+                    if not is_not_found(exc):
+                        raise
+                    lists[target] = None
+                else:
+                    index_put(planka, "lists", [payload["item"]])
+                    cards = payload.get("included", {}).get("cards", [])
+                    base = max((card.get("position") or 0 for card in cards), default=0)
+                    lists[target] = {"base": base, "placed": 0}
+        state = lists[target]
+        if state is None:
+            task["error"] = f"List {target} not found."
+            return task
+        state["placed"] += 1
+        task["position"] = state["base"] + state["placed"] * POSITION_GAP
+        task["skip"] = prior.get("status") == "created"
+        return task
+
+    def create(task: dict) -> dict:
+        result = {"row": task["row"], "list_id": task["list_id"]}
+        if "position" in task:
+            result["position"] = task["position"]
+        if task.get("skip"):
+            return dict(result, status="skipped")
+        if "error" in task:
+            result.update(status="error", error=task["error"])
+        else:
+            fields = task["fields"]
+            payload: dict[str, object] = {
+                "name": fields["name"],
+                "type": fields.get("type") or card_type,
+                "position": task["position"],
+            }
+            try:
+                if fields.get("description"):
+                    payload["description"] = fields["description"]
+                if fields.get("due_date"):
+                    due = as_utc(parse_iso_datetime(str(fields["due_date"])))
+                    payload["dueDate"] = due.isoformat()
+                if truthy(fields.get("due_completed")):
+                    payload["isDueCompleted"] = True
+                limiter.wait()
+                card = planka.endpoints.createCard(task["list_id"], **payload)["item"]
+                result.update(status="created", card_id=card["id"], name=card.get("name"))
+            except Exception as exc:
+                message = exc.message if isinstance(exc, click.ClickException) else str(exc)
+                result.update(status="error", error=message)
+        # Written as soon as a row finishes, so --resume sees every created card.
+        with results_lock:
+            results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+        return result
+
+    try:
+        rows = read_import_rows(file, file_format)
+        with results_path.open("a" if resume else "w") as results_file:
+            for result in iter_fan_out(create, map(plan, rows)):
+                key = {"created": "created", "skipped": "skipped"}.get(result["status"], "failed")
+                counts[key] += 1
+    except Exception as e:
+        print_error(e)
+        raise typer.Exit(1)
+
+    console.print(
+        f"[green]Imported {counts['created']} cards[/green] "
+        f"({counts['failed']} failed, {counts['skipped']} skipped). Results: {results_path}"
+    )
+    if counts["failed"]:
+        raise typer.Exit(1)
+
+
+@cards_app.command("update")
+def update_card(
+    card_id: str = typer.Argument(
+        ..., help="Card ID to update", autocompletion=complete_ids("cards")
+    ),
+    name: Optional[str] = typer.Option(None, "--name", help="New card name"),
+    description: Optional[str] = typer.Option(
+        None, "--description", "-d", help="New card description"
+    ),
+    clear_description: bool = typer.Option(
+        False, "--clear-description", help="Clear the description"
+    ),
+    position: Optional[str] = typer.Option(
+        None, "--position", "-p", help="Position: top, bottom, or integer"
+    ),
+    list_id: Optional[str] = typer.Option(
+        None, "--list-id", help="Move to a new list", autocompletion=complete_ids("lists")
+    ),
+    card_type: Optional[str] = typer.Option(
+        None, "--type", "-t", help="Card type (project, story)"
+    ),
+    due_date: Optional[str] = typer.Option(None, "--due-date", help="Due date (ISO-8601)"),
+    clear_due_date: bool = typer.Option(False, "--clear-due-date", help="Clear the due date"),
+    due_completed: Optional[bool] = typer.Option(
+        None,
+        "--due-completed/--no-due-completed",
+        help="Mark due date as completed/uncompleted",
+    ),
+):
+    """Update an existing card."""
+    if description is not None and clear_description:
+        print_error("Use either --description or --clear-description.")
+        raise typer.Exit(1)
+    if due_date is not None and clear_due_date:
+        print_error("Use either --due-date or --clear-due-date.")
+        raise typer.Exit(1)
+
+    planka = get_planka()
+    try:
+        card = get_card_by_id(planka, card_id)
+        if not card:
+            print_not_found(f"Card {card_id} not found.")
+            return
+
+        update_fields: dict[str, object] = {}
+        if name is not None:
+            update_fields["name"] = name
+        if description is not None:
+            update_fields["description"] = description
+        elif clear_description:
+            update_fields["description"] = None
+        if card_type is not None:
+            update_fields["type"] = card_type
+        if due_date is not None:
+            update_fields["dueDate"] = parse_iso_datetime(due_date)
+        elif clear_due_date:
+            update_fields["dueDate"] = None
+        if due_completed is not None:
+            update_fields["isDueCompleted"] = due_completed
+
+        move_position = parse_position(position)
+        if list_id is not None or move_position is not None:
+            target_list = find_list(planka, list_id) if list_id is not None else card.list
+            if not target_list:
+                print_not_found(f"List {list_id} not found.")
+                return
+            card.move(target_list, position=move_position or "top")
+
+        if update_fields:
+            card.update(**update_fields)
+
+        if not update_fields and list_id is None and move_position is None:
+            console.print("[yellow]No updates provided.[/yellow]")
+            return
+
+        console.print(f"[green]Updated card[/green] [bold]{card.name}[/bold] (ID: {card.id})")
+    except Exception as e:
+        print_error(e)
+
+
+@cards_app.command("delete")
+def delete_card(
+    card_id: str = typer.Argument(
+        ..., help="Card ID to delete", autocompletion=complete_ids("cards")
+    ),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
+):
+    """Delete a card."""
+    planka = get_planka()
+    try:
+        card = get_card_by_id(planka, card_id)
+    except Exception as e:
+        print_error(e)
+        return
+    if not card:
+        print_not_found(f"Card {card_id} not found.")
+        return
+
+    # Outside the try: an aborted prompt must reach the daemon, which hands the command back.
+    if not yes and not typer.confirm(f"Delete card '{card.name}' ({card.id})?"):
+        console.print("Cancelled.")
+        return
+
+    try:
+        card.delete()
+        console.print(f"[green]Deleted card[/green] {card_id}")
+    except Exception as e:
+        print_error(e)
+
+
+@cards_app.command("bulk")
+def bulk_cards(
+    board_id: Optional[str] = typer.Option(
+        None, "--board", help="Cards on this board", autocompletion=complete_ids("boards")
+    ),
+    list_ids: Optional[list[str]] = typer.Option(
+        None,
+        "--list",
+        help="Cards in this list (repeatable)",
+        autocompletion=complete_ids("lists"),
+    ),
+    label: Optional[str] = typer.Option(None, "--label", help="Cards with this label (ID or name)"),
+    name_pattern: Optional[str] = typer.Option(
+        None, "--name", help="Cards whose name matches this regular expression"
+    ),
+    due_before: Optional[str] = typer.Option(
+        None, "--due-before", help="Cards due before this ISO-8601 datetime"
+    ),
+    updated_before: Optional[str] = typer.Option(
+        None, "--updated-before", help="Cards last updated before this ISO-8601 datetime"
+    ),
+    older_than: Optional[int] = typer.Option(
+        None, "--older-than", min=0, help="Cards not updated for this many days"
+    ),
+    move_to: Optional[str] = typer.Option(None, "--move-to", help="Move matches to this list"),
+    set_type: Optional[str] = typer.Option(None, "--set-type", help="Set the card type"),
+    set_due_date: Optional[str] = typer.Option(
+        None, "--set-due-date", help="Set the due date (ISO-8601)"
+    ),
+    clear_due_date: bool = typer.Option(False, "--clear-due-date", help="Clear the due date"),
+    due_completed: Optional[bool] = typer.Option(
+        None, "--due-completed/--no-due-completed", help="Mark due date as completed/uncompleted"
+    ),
+    delete: bool = typer.Option(False, "--delete", help="Delete matches"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print the plan and stop"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
+):
+    """Move, update or delete every card matching the filters.
+
+    Filters are combined with AND. Candidates come from one fetch per board involved; the
+    plan is printed before anything changes and applied in parallel (--concurrency).
+    """
+    if not board_id and not list_ids:
+        print_error("Choose where to look with --board or --list.")
+        raise typer.Exit(1)
+    if set_due_date is not None and clear_due_date:
+        print_error("Use either --set-due-date or --clear-due-date.")
+        raise typer.Exit(1)
+    update_fields: dict[str, object] = {}
+    if set_type is not None:
+        update_fields["type"] = set_type
+    if set_due_date is not None:
+        update_fields["dueDate"] = as_utc(parse_iso_datetime(set_due_date)).isoformat()
+    elif clear_due_date:
+        update_fields["dueDate"] = None
+    if due_completed is not None:
+        update_fields["isDueCompleted"] = due_completed
+    if delete and (move_to or update_fields):
+        print_error("--delete cannot be combined with --move-to or --set-* options.")
+        raise typer.Exit(1)
+    if not (delete or move_to or update_fields):
+        print_error("Choose an action: --move-to, --set-type, --set-due-date, ... or --delete.")
+        raise typer.Exit(1)
+    try:
+        name_regex = re.compile(name_pattern) if name_pattern else None
+    except re.error as exc:
+        raise typer.BadParameter(str(exc), param_hint="--name") from exc
+    due_limit = parse_iso_datetime(due_before)
+    updated_limit = parse_iso_datetime(updated_before)
+    if older_than is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than)
+        updated_limit = min(as_utc(updated_limit), cutoff) if updated_limit else cutoff
+
+    planka = get_planka()
+    try:
+        board_ids = [board_id] if board_id else []
+        for list_id in list_ids or []:
+            list_item = find_list(planka, list_id)
+            if list_item is None:
+                print_not_found(f"List {list_id} not found.")
+                raise typer.Exit(1)
+            board_ids.append(list_item.schema["boardId"])
+        board_ids = list(dict.fromkeys(board_ids))
+
+        candidates = []
+        lists_by_id: dict[str, dict] = {}
+        for payload in fan_out(planka.endpoints.getBoard, board_ids):
+            included = payload.get("included", {})
+            lists_by_id.update({item["id"]: item for item in included.get("lists", [])})
+            labels = {item["id"]: item for item in included.get("labels", [])}
+            card_labels: dict[str, list[dict]] = {}
+            for card_label in included.get("cardLabels", []):
+                label_item = labels.get(card_label["labelId"], {})
+                card_labels.setdefault(card_label["cardId"], []).append(label_item)
+            for card in included.get("cards", []):
+                if list_ids and card.get("listId") not in list_ids:
+                    continue
+                if label and not any(
+                    item.get("id") == label or str(item.get("name", "")).lower() == label.lower()
+                    for item in card_labels.get(card["id"], [])
+                ):
+                    continue
+                if name_regex and not name_regex.search(card.get("name") or ""):
+                    continue
+                due = parse_timestamp(card.get("dueDate"))
+                if due_limit and not (isinstance(due, datetime) and due < as_utc(due_limit)):
+                    continue
+                updated = parse_timestamp(card.get("updatedAt") or card.get("createdAt"))
+                if updated_limit and not (
+                    isinstance(updated, datetime) and updated < as_utc(updated_limit)
+                ):
+                    continue
+                candidates.append(card)
+        candidates.sort(
+            key=lambda c: (
+                board_ids.index(c["boardId"]) if c.get("boardId") in board_ids else 0,
+                lists_by_id.get(c.get("listId"), {}).get("position") or 0,
+                c.get("position") or 0,
+            )
+        )
+
+        changes: dict[str, dict] = {card["id"]: dict(update_fields) for card in candidates}
+        action = "delete" if delete else ", ".join(f"{k}={v}" for k, v in update_fields.items())
+        if move_to:
+            target = planka.endpoints.getList(move_to)
+            target_list = target["item"]
+            existing = target.get("included", {}).get("cards", [])
+            base = max((card.get("position") or 0 for card in existing), default=0)
+            # Moved cards go below the target's cards, keeping their current relative order.
+            for offset, card in enumerate(candidates, start=1):
+                changes[card["id"]].update(
+                    listId=target_list["id"],
+                    boardId=target_list["boardId"],
+                    position=base + offset * POSITION_GAP,
+                )
+            move = f"move to {target_list.get('name')} ({target_list['id']})"
+            action = f"{move}, {action}" if update_fields else move
+    except typer.Exit:
+        raise
+    except Exception as e:
+        print_error(e)
+        raise typer.Exit(1)
+
+    def list_name(card: dict) -> object:
+        return lists_by_id.get(card.get("listId"), {}).get("name") or card.get("listId")
+
+    plan_columns = [
+        Column("id", "ID", lambda c: c["id"], justify="right", style="cyan", no_wrap=True),
+        Column("name", "Name", lambda c: c.get("name"), style="magenta"),
+        Column("list", "List", list_name),
+        Column(
+            "updated_at",
+            "Updated At",
+            lambda c: parse_timestamp(c.get("updatedAt") or c.get("createdAt")),
+            justify="right",
+        ),
+        Column("action", "Action", lambda c: action),
+    ]
+    title, empty = f"Plan: {len(candidates)} cards", "No cards match the filters."
+    if dry_run or not candidates or (yes and OUTPUT_FORMAT == "table"):
+        write_rows(title, plan_columns, candidates, empty)
+    if dry_run or not candidates:
+        return
+    if not yes:
+        # Whatever --output says, the plan is shown as a table on stderr before the prompt.
+        write_rows(title, plan_columns, candidates, empty, target=err_console)
+        if not typer.confirm(f"Apply to {len(candidates)} cards?", err=True):
+            err_console.print("Cancelled.")
+            return
+
+    def apply(card: dict) -> dict:
+        outcome = {"id": card["id"], "name": card.get("name"), "status": "ok", "error": None}
+        try:
+            if delete:
+                planka.endpoints.deleteCard(card["id"])
+                index_forget("cards", card["id"])
+            else:
+                planka.endpoints.updateCard(card["id"], **changes[card["id"]])
+        except Exception as exc:
+            outcome.update(status="error", error=str(exc))
+        return outcome
+
+    outcomes = fan_out(apply, candidates)
+    outcome_columns = [
+        Column("id", "ID", lambda o: o["id"], justify="right", style="cyan", no_wrap=True),
+        Column("name", "Name", lambda o: o["name"], style="magenta"),
+        Column("status", "Status", lambda o: o["status"]),
+        Column("error", "Error", lambda o: o["error"]),
+    ]
+    write_rows("Results", outcome_columns, outcomes, "Nothing applied.")
+    failures = [o for o in outcomes if o["status"] != "ok"]
+    if failures:
+        COMMAND_ERRORS.extend(o["error"] for o in failures)
+        raise typer.Exit(1)
+
+
+def attachment_size(attachment: dict) -> Optional[int]:
+    """The file size Planka recorded for an attachment, or None if it is unknown."""
+    data = attachment.get("data")
+    try:
+        return int(data["size"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def attachment_filename(attachment: dict) -> str:
+    """The attachment's file name without directory parts, safe to create locally."""
+    data = attachment.get("data") if isinstance(attachment.get("data"), dict) else {}
+    name = str(data.get("filename") or attachment.get("name") or "").replace("\\", "/")
+    name = name.rsplit("/", 1)[-1].strip()
+    return name if name not in ("", ".", "..") else str(attachment["id"])
+
+
+def download_file(planka: "Planka", url: str, path: Path, size: Optional[int]) -> tuple[str, int]:
+    """Stream url to path over the session, one chunk at a time; returns (status, bytes).
+
+    The body goes to a `.part` file that is renamed once complete. A `.part` file left by an
+    interrupted run is resumed with a Range request, and a file that already has the size
+    Planka recorded is skipped. A 416 for the resume means the `.part` file is already
+    complete, unless its Content-Range gives another length; then it is discarded.
+    """
+    if size is not None and path.is_file() and path.stat().st_size == size:
+        return "skipped", 0
+    partial = path.with_name(path.name + ".part")
+    offset = partial.stat().st_size if partial.is_file() else 0
+    if size is not None and offset > size:
+        offset = 0
+    received = 0
+    if size is None or offset < size:
+        # Byte ranges only line up with the file when it is sent unencoded.
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        with planka.client.stream("GET", url, headers=headers) as response:
+            if offset and response.status_code == 416:
+                # Nothing past the offset, e.g. a run stopped between the last chunk and the
+                # rename. Without a recorded size, Content-Range tells a stale file apart.
+                length = response.headers.get("Content-Range", "").rpartition("/")[2]
+                if length.isdigit() and int(length) != offset:
+                    partial.unlink()
+                    return download_file(planka, url, path, size)
+            else:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    # The server sent the whole file; start over.
+                    offset = 0
+                with open(partial, "ab" if offset else "wb") as out:
+                    for chunk in response.iter_bytes(ATTACHMENT_CHUNK_SIZE):
+                        out.write(chunk)
+                        received += len(chunk)
+    total = partial.stat().st_size
+    if size is not None and total != size:
+        raise ValueError(f"Expected {size} bytes, got {total}; run again to resume.")
+    partial.replace(path)
+    return ("resumed" if offset else "downloaded"), received
+
+
+ATTACHMENT_DOWNLOAD_COLUMNS = [
+    Column("id", "ID", lambda o: o["id"], justify="right", style="cyan", no_wrap=True),
+    Column("card_id", "Card ID", lambda o: o["card_id"], justify="right"),
+    Column("path", "Path", lambda o: o["path"], style="magenta"),
+    Column("size", "Size", lambda o: o["size"], justify="right"),
+    Column("status", "Status", lambda o: o["status"]),
+    Column("bytes", "Transferred", lambda o: o["bytes"], justify="right"),
+    Column("error", "Error", lambda o: o["error"]),
+]
+
+
+@attachments_app.command("download")
+def download_attachments(
+    card_id: Optional[str] = typer.Argument(
+        None, help="Card whose attachments to download", autocompletion=complete_ids("cards")
+    ),
+    board_id: Optional[str] = typer.Option(
+        None,
+        "--board",
+        help="Download every card's attachments on this board",
+        autocompletion=complete_ids("boards"),
+    ),
+    directory: Path = typer.Option(
+        ..., "-o", "--output-dir", file_okay=False, help="Directory to save files in"
+    ),
+):
+    """Download a card's file attachments, or a whole board's with --board.
+
+    Files are streamed to disk in parallel (--concurrency). Files already present at their
+    recorded size are skipped and interrupted downloads resume. With --board, each card's
+    files go in a subdirectory named after the card ID.
+    """
+    if (card_id is None) == (board_id is None):
+        raise typer.BadParameter("Pass either a CARD_ID or --board BOARD_ID.")
+
+    planka = get_planka()
+    try:
+        kind, item_id = ("boards", board_id) if board_id else ("cards", card_id)
+        payload = fetch_payload(planka, kind, item_id)
+        if not payload:
+            print_not_found(f"{kind[:-1].capitalize()} {item_id} not found.")
+            return
+        base_url = planka_base_url(planka)
+        jobs = []
+        taken: set[Path] = set()
+        for attachment in payload.get("included", {}).get("attachments", []):
+            url = extract_attachment_url(attachment, base_url)
+            if attachment.get("type", "file") != "file" or not url:
+                continue
+            folder = directory / attachment["cardId"] if board_id else directory
+            path = folder / attachment_filename(attachment)
+            if path in taken:
+                path = folder / f"{attachment['id']}-{path.name}"
+            taken.add(path)
+            jobs.append((attachment, url, path))
+        for folder in {path.parent for _, _, path in jobs}:
+            folder.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        print_error(e)
+        raise typer.Exit(1)
+
+    def download(job: tuple[dict, str, Path]) -> dict:
+        attachment, url, path = job
+        size = attachment_size(attachment)
+        outcome = {
+            "id": attachment["id"],
+            "card_id": attachment.get("cardId"),
+            "path": str(path),
+            "size": size,
+            "status": None,
+            "bytes": 0,
+            "error": None,
+        }
+        try:
+            outcome["status"], outcome["bytes"] = download_file(planka, url, path, size)
+        except Exception as exc:
+            outcome.update(status="error", error=str(exc))
+        return outcome
+
+    outcomes = fan_out(download, jobs)
+    write_rows("Attachments", ATTACHMENT_DOWNLOAD_COLUMNS, outcomes, "No file attachments found.")
+    failures = [o for o in outcomes if o["status"] == "error"]
+    if failures:
+        COMMAND_ERRORS.extend(o["error"] for o in failures)
+        raise typer.Exit(1)
+
+
+class UploadReader:
+    """A file opened for upload that reports how far httpx has read it.
+
+    httpx streams multipart file fields by reading them in chunks, and rewinds them before
+    each (re)send, so the reported position always matches the bytes sent so far.
+    """
+
+    def __init__(self, file: io.BufferedReader, report):
+        self.file = file
+        self.report = report
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.file.read(size)
+        self.report(self.file.tell())
+        return chunk
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        position = self.file.seek(offset, whence)
+        self.report(position)
+        return position
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def fileno(self) -> int:
+        # Lets httpx send a Content-Length instead of a chunked body.
+        return self.file.fileno()
+
+
+def display_size(value: object) -> str:
+    from rich.filesize import decimal
+
+    return decimal(int(value)) if isinstance(value, (int, float)) else "-"
+
+
+def display_rate(value: object) -> str:
+    return f"{display_size(value)}/s" if isinstance(value, (int, float)) else "-"
+
+
+ATTACHMENT_UPLOAD_COLUMNS = [
+    Column("file", "File", lambda o: o["file"], style="magenta"),
+    Column("id", "ID", lambda o: o["id"], justify="right", style="cyan", no_wrap=True),
+    Column("size", "Size", lambda o: o["size"], justify="right"),
+    Column("seconds", "Seconds", lambda o: o["seconds"], justify="right"),
+    Column("rate", "Throughput", lambda o: o["rate"], display=display_rate, justify="right"),
+    Column("status", "Status", lambda o: o["status"]),
+    Column("error", "Error", lambda o: o["error"]),
+]
+
+
+@cards_app.command("attach")
+def attach_files(
+    card_id: str = typer.Argument(
+        ..., help="Card to attach the files to", autocompletion=complete_ids("cards")
+    ),
+    files: list[Path] = typer.Argument(
+        ..., exists=True, dir_okay=False, readable=True, help="Files to upload"
+    ),
+):
+    """Upload files as attachments to a card.
+
+    Each file is streamed from disk as a multipart upload, and files are uploaded in
+    parallel (--concurrency). Progress and throughput are shown on a terminal; the results
+    list each file's throughput, and a summary gives the total.
+    """
+    import mimetypes
+
+    from rich.progress import (
+        BarColumn,
+        DownloadColumn,
+        Progress,
+        TextColumn,
+        TransferSpeedColumn,
+    )
+
     planka = get_planka()
     try:
         card = get_card_by_id(planka, card_id)
         if not card:
-            console.print(f"[red]Card {card_id} not found.[/red]")
+            print_not_found(f"Card {card_id} not found.")
             return
+        sizes = {path: path.stat().st_size for path in files}
+    except Exception as e:
+        print_error(e)
+        raise typer.Exit(1)
 
-        table = make_table(f"Card: {card.name}")
-        table.add_column("Field", style="cyan", no_wrap=True)
-        table.add_column("Value", style="magenta")
+    progress = Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        console=err_console,
+        disable=not err_console.is_terminal,
+    )
+    total_task = progress.add_task("Total", total=sum(sizes.values()))
+    sent: dict[Path, int] = {}
+    sent_lock = threading.Lock()
 
-        def safe_attr(obj: object, name: str) -> object:
-            try:
-                return getattr(obj, name)
-            except Exception:
-                return None
-
-        def normalize_url(base_url: Optional[str], value: Optional[str]) -> Optional[str]:
-            if not value:
-                return None
-            candidate = str(value).strip()
-            if not candidate:
-                return None
-            if candidate.startswith("http://") or candidate.startswith("https://"):
-                return candidate
-            if base_url:
-                return f"{base_url.rstrip('/')}/{candidate.lstrip('/')}"
-            return candidate
-
-        def extract_attachment_url(attachment: object, base_url: Optional[str]) -> Optional[str]:
-            data = safe_attr(attachment, "data")
-            if isinstance(data, dict):
-                for key in (
-                    "url",
-                    "downloadUrl",
-                    "download_url",
-                    "link",
-                    "href",
-                    "path",
-                ):
-                    value = data.get(key)
-                    if isinstance(value, str) and value.strip():
-                        return normalize_url(base_url, value)
-                file_info = data.get("file")
-                if isinstance(file_info, dict):
-                    for key in (
-                        "url",
-                        "downloadUrl",
-                        "download_url",
-                        "path",
-                        "thumbnailUrl",
-                        "thumbUrl",
-                        "thumbnail_url",
-                    ):
-                        value = file_info.get(key)
-                        if isinstance(value, str) and value.strip():
-                            return normalize_url(base_url, value)
-            direct_url = safe_attr(attachment, "url")
-            if isinstance(direct_url, str) and direct_url.strip():
-                return normalize_url(base_url, direct_url)
-            return None
+    def upload(path: Path) -> dict:
+        outcome = {
+            "file": str(path),
+            "id": None,
+            "size": sizes[path],
+            "seconds": None,
+            "rate": None,
+            "status": None,
+            "error": None,
+        }
+        task = progress.add_task(path.name, total=sizes[path])
 
-        def add_row(label: str, value: object) -> None:
-            if value is None or value == "":
-                table.add_row(label, "-")
-            else:
-                table.add_row(label, str(value))
+        def report(position: int) -> None:
+            progress.update(task, completed=position)
+            with sent_lock:
+                sent[path] = position
+                progress.update(total_task, completed=sum(sent.values()))
 
+        started = time.perf_counter()
         try:
-            schema = card.schema or {}
-        except Exception:
-            schema = {}
-        list_id_value = schema.get("listId")
-        board_id_value = schema.get("boardId")
-        list_name_value = None
-        list_obj = safe_attr(card, "list")
-        if list_obj is not None:
-            list_id_value = safe_attr(list_obj, "id") or list_id_value
-            list_name_value = safe_attr(list_obj, "name")
-            if not board_id_value:
-                list_schema = safe_attr(list_obj, "schema")
-                if isinstance(list_schema, dict):
-                    board_id_value = list_schema.get("boardId")
-
-        list_display = "-"
-        if list_name_value and list_id_value:
-            list_display = f"{list_name_value} ({list_id_value})"
-        elif list_name_value:
-            list_display = list_name_value
-        elif list_id_value:
-            list_display = list_id_value
-
-        due_date = safe_attr(card, "due_date") or schema.get("dueDate")
-        due_completed = safe_attr(card, "due_date_completed")
-        if due_completed is None:
-            due_completed = schema.get("isDueCompleted")
-        if isinstance(due_completed, bool):
-            due_completed = "yes" if due_completed else "no"
-
-        attachments_error = None
-        comments_error = None
-        try:
-            attachments = list(safe_attr(card, "attachments") or [])
-        except Exception as exc:
-            attachments = []
-            attachments_error = str(exc)
-        try:
-            comments = list(safe_attr(card, "comments") or [])
+            with path.open("rb") as file:
+                attachment = planka.endpoints.createAttachment(
+                    card.id,
+                    mime_type=mimetypes.guess_type(path.name)[0],
+                    type="file",
+                    name=path.name,
+                    file=UploadReader(file, report),
+                )["item"]
         except Exception as exc:
-            comments = []
-            comments_error = str(exc)
-
-        comments_count = safe_attr(card, "comments_count")
-        if comments_count is None and comments_error is None:
-            comments_count = len(comments)
-
-        planka_url, _, _ = get_env_config()
-        card_url = None
-        if planka_url and board_id_value and card.id:
-            card_url = f"{planka_url.rstrip('/')}/boards/{board_id_value}/cards/{card.id}"
-
-        add_row("ID", card.id)
-        add_row("URL", card_url)
-        add_row("Name", card.name)
-        add_row("Description", safe_attr(card, "description") or schema.get("description"))
-        add_row("Board ID", board_id_value)
-        add_row("List", list_display)
-        add_row("Position", safe_attr(card, "position") or schema.get("position"))
-        add_row("Type", safe_attr(card, "type") or schema.get("type"))
-        add_row("Due Date", due_date)
-        add_row("Due Completed", due_completed)
-        if attachments_error:
-            add_row("Attachments", f"Error: {attachments_error}")
+            outcome.update(status="error", error=str(exc))
         else:
-            add_row("Attachments", len(attachments))
-        if comments_error:
-            add_row("Comments", f"Error: {comments_error}")
-        else:
-            add_row("Comments", comments_count)
-        add_row("Created At", safe_attr(card, "created_at") or schema.get("createdAt"))
-        add_row("Updated At", safe_attr(card, "updated_at") or schema.get("updatedAt"))
+            seconds = time.perf_counter() - started
+            outcome.update(
+                id=attachment.get("id"),
+                seconds=round(seconds, 3),
+                rate=round(sizes[path] / seconds) if seconds > 0 else None,
+                status="uploaded",
+            )
+        progress.remove_task(task)
+        return outcome
 
-        console.print(table)
+    started = time.perf_counter()
+    with progress:
+        outcomes = fan_out(upload, files)
+    elapsed = time.perf_counter() - started
 
-        if attachments and attachments_error is None:
-            attachments_table = make_table("Attachments")
-            attachments_table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-            attachments_table.add_column("Name", style="magenta")
-            attachments_table.add_column("Type", style="magenta")
-            attachments_table.add_column("URL", style="magenta")
-            attachments_table.add_column("Created At", justify="right")
-
-            for attachment in attachments:
-                attachment_url = extract_attachment_url(attachment, planka_url)
-                attachments_table.add_row(
-                    str(safe_attr(attachment, "id") or "-"),
-                    str(safe_attr(attachment, "name") or "-"),
-                    str(safe_attr(attachment, "type") or "-"),
-                    str(attachment_url or "-"),
-                    str(safe_attr(attachment, "created_at") or "-"),
-                )
+    write_rows(f"Uploads to {card.name}", ATTACHMENT_UPLOAD_COLUMNS, outcomes, "No files.")
+    uploaded = [o for o in outcomes if o["status"] == "uploaded"]
+    total = sum(o["size"] for o in uploaded)
+    err_console.print(
+        f"[green]Uploaded {len(uploaded)} of {len(outcomes)} files[/green] "
+        f"({display_size(total)} in {elapsed:.1f} s, {display_rate(total / max(elapsed, 1e-9))})."
+    )
+    failures = [o for o in outcomes if o["status"] == "error"]
+    if failures:
+        COMMAND_ERRORS.extend(o["error"] for o in failures)
+        raise typer.Exit(1)
 
-            console.print(attachments_table)
-
-        if comments and comments_error is None:
-            comments_table = make_table("Comments")
-            comments_table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-            comments_table.add_column("User", style="magenta")
-            comments_table.add_column("Text", style="magenta")
-            comments_table.add_column("Created At", justify="right")
-
-            for comment in comments:
-                user = safe_attr(comment, "user")
-                user_label = (
-                    safe_attr(user, "name")
-                    or safe_attr(user, "username")
-                    or safe_attr(user, "id")
-                    or "-"
-                )
-                text = safe_attr(comment, "text")
-                text_label = " ".join(str(text).split()) if text else "-"
-                comments_table.add_row(
-                    str(safe_attr(comment, "id") or "-"),
-                    str(user_label),
-                    text_label,
-                    str(safe_attr(comment, "created_at") or "-"),
-                )
 
-            console.print(comments_table)
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+def iter_notifications(
+    planka: "Planka",
+    unread_only: bool,
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+):
+    """Yield notifications newest first, between the before/after ID cursors.
 
+    Planka returns the feed in one response, so the cursors are applied here. Models are
+    built one at a time as rows are written.
+    """
+    from plankapy.v2 import Notification
 
-@cards_app.command("create")
-def create_card(
-    list_id: str = typer.Argument(..., help="List ID to create the card in"),
-    name: str = typer.Argument(..., help="Card name/title"),
-    description: Optional[str] = typer.Option(None, "--description", "-d", help="Card description"),
-    position: str = typer.Option(
-        "bottom", "--position", "-p", help="Position: top, bottom, or integer"
+    items = planka.endpoints.getNotifications().get("items", [])
+    items.sort(key=lambda item: id_order(item["id"]), reverse=True)
+    for item in items:
+        if unread_only and item.get("isRead"):
+            continue
+        if before_id is not None and id_order(item["id"]) >= id_order(before_id):
+            continue
+        if after_id is not None and id_order(item["id"]) <= id_order(after_id):
+            break
+        yield Notification(item, planka)
+
+
+@notifications_app.command("all")
+def all_notifications(
+    limit: Optional[int] = typer.Option(
+        None, "--limit", min=1, help="Maximum number of notifications."
+    ),
+    before: Optional[str] = typer.Option(
+        None, "--before", help="Only notifications older than this ID."
+    ),
+    after: Optional[str] = typer.Option(
+        None, "--after", help="Only notifications newer than this ID."
+    ),
+    all_profiles: bool = typer.Option(
+        False,
+        "--all-profiles",
+        help="Query every profile concurrently; cursors and --limit apply per profile.",
     ),
-    card_type: str = typer.Option("project", "--type", "-t", help="Card type (project, story)"),
-    due_date: Optional[str] = typer.Option(None, "--due-date", help="Due date (ISO-8601)"),
-    due_completed: bool = typer.Option(False, "--due-completed", help="Mark due date as completed"),
 ):
-    """Create a new card in a list."""
+    """List all notifications, newest first."""
+    if all_profiles:
+        results = for_each_profile(
+            lambda planka: list(
+                itertools.islice(iter_notifications(planka, False, before, after), limit)
+            )
+        )
+        write_profile_rows(
+            "Notifications",
+            [(profile, NOTIFICATION_COLUMNS, rows) for profile, rows in results],
+            "No notifications found.",
+        )
+        return
     planka = get_planka()
     try:
-        target_list = find_list(planka, list_id)
-        if not target_list:
-            console.print(f"[red]List {list_id} not found.[/red]")
-            return
+        rows = itertools.islice(iter_notifications(planka, False, before, after), limit)
+        render_notifications("Notifications", rows)
+    except Exception as e:
+        print_error(e)
 
-        parsed_due_date = parse_iso_datetime(due_date)
-        parsed_position = parse_position(position) or "bottom"
 
-        card = target_list.create_card(
-            name=name,
-            position=parsed_position,
-            type=card_type,
-            description=description,
-            due_date=parsed_due_date,
-            due_date_completed=due_completed,
+@notifications_app.command("unread")
+def unread_notifications(
+    limit: Optional[int] = typer.Option(
+        None, "--limit", min=1, help="Maximum number of notifications."
+    ),
+    before: Optional[str] = typer.Option(
+        None, "--before", help="Only notifications older than this ID."
+    ),
+    after: Optional[str] = typer.Option(
+        None, "--after", help="Only notifications newer than this ID."
+    ),
+    all_profiles: bool = typer.Option(
+        False,
+        "--all-profiles",
+        help="Query every profile concurrently; cursors and --limit apply per profile.",
+    ),
+):
+    """List unread notifications, newest first."""
+    if all_profiles:
+        results = for_each_profile(
+            lambda planka: list(
+                itertools.islice(iter_notifications(planka, True, before, after), limit)
+            )
         )
-
-        console.print(
-            f"[green]Created card[/green] [bold]{card.name}[/bold] "
-            f"(ID: {card.id}) in list [bold]{target_list.name}[/bold]"
+        write_profile_rows(
+            "Unread Notifications",
+            [(profile, NOTIFICATION_COLUMNS, rows) for profile, rows in results],
+            "No notifications found.",
         )
+        return
+    planka = get_planka()
+    try:
+        rows = itertools.islice(iter_notifications(planka, True, before, after), limit)
+        render_notifications("Unread Notifications", rows)
     except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+        print_error(e)
 
 
-@cards_app.command("update")
-def update_card(
-    card_id: str = typer.Argument(..., help="Card ID to update"),
-    name: Optional[str] = typer.Option(None, "--name", help="New card name"),
-    description: Optional[str] = typer.Option(
-        None, "--description", "-d", help="New card description"
-    ),
-    clear_description: bool = typer.Option(
-        False, "--clear-description", help="Clear the description"
-    ),
-    position: Optional[str] = typer.Option(
-        None, "--position", "-p", help="Position: top, bottom, or integer"
+def poll_notifications(planka: "Planka", state: dict) -> Optional[list[dict]]:
+    """Fetch unread notifications, or None when the feed is unchanged (304)."""
+    headers = {"Cache-Control": "no-cache"}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    response = planka.client.get("api/notifications", headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    state["etag"] = response.headers.get("ETag")
+    return response.json().get("items", [])
+
+
+@notifications_app.command("watch")
+def watch_notifications(
+    interval: float = typer.Option(5.0, "--interval", min=0.5, help="Seconds between polls"),
+    mark_read: bool = typer.Option(
+        False, "--mark-read", help="Mark emitted notifications as read, a batch per poll"
     ),
-    list_id: Optional[str] = typer.Option(None, "--list-id", help="Move to a new list"),
-    card_type: Optional[str] = typer.Option(
-        None, "--type", "-t", help="Card type (project, story)"
+    polls: Optional[int] = typer.Option(
+        None, "--polls", min=1, help="Stop after this many polls (default: until interrupted)"
     ),
-    due_date: Optional[str] = typer.Option(None, "--due-date", help="Due date (ISO-8601)"),
-    clear_due_date: bool = typer.Option(False, "--clear-due-date", help="Clear the due date"),
-    due_completed: Optional[bool] = typer.Option(
+):
+    """Print unread notifications, then each new one as it arrives.
+
+    Polls use conditional requests, so an unchanged feed costs a 304 without a body.
+    Failed polls are retried with exponential backoff. With --output json or ndjson, each
+    notification is one JSON line.
+    """
+    import random
+
+    from plankapy.v2 import Notification
+
+    columns = select_columns(NOTIFICATION_COLUMNS)
+    planka = get_planka()
+    state: dict = {"etag": None}
+    seen: set[str] = set()
+    header_written = False
+    failures = 0
+    done = 0
+    try:
+        while polls is None or done < polls:
+            done += 1
+            try:
+                items = poll_notifications(planka, state)
+            except Exception as exc:
+                failures += 1
+                delay = min(60.0, interval * 2**failures) * random.uniform(0.5, 1.0)
+                err_console.print(f"[dim]Poll failed ({exc}); retrying in {delay:.0f}s[/dim]")
+                time.sleep(delay)
+                continue
+            failures = 0
+
+            if items is not None:
+                unread_ids = {item["id"] for item in items}
+                new = sorted(
+                    (item for item in items if item["id"] not in seen),
+                    key=lambda item: (item.get("createdAt") or "", item["id"]),
+                )
+                seen = unread_ids
+                notifications = [Notification(item, planka) for item in new]
+                if notifications and OUTPUT_FORMAT == "table":
+                    table = make_table("Notifications" if not header_written else "")
+                    table.show_header = not header_written
+                    for column in columns:
+                        table.add_column(column.header, **column.table_options)
+                    for notification in notifications:
+                        table.add_row(*(c.display(c.value(notification)) for c in columns))
+                    console.print(table)
+                    header_written = True
+                elif notifications:
+                    if OUTPUT_FORMAT == "tsv" and not header_written:
+                        write_line("\t".join(column.key for column in columns))
+                        header_written = True
+                    for notification in notifications:
+                        values = [column.value(notification) for column in columns]
+                        if OUTPUT_FORMAT == "tsv":
+                            write_line("\t".join(tsv_value(value) for value in values))
+                        else:
+                            row = {c.key: json_value(v) for c, v in zip(columns, values)}
+                            write_line(json.dumps(row, default=json_value))
+                    sys.stdout.flush()
+                if mark_read and new:
+                    # Exactly the emitted ones, in parallel: a read-all could also mark one
+                    # that arrived after this poll and was never printed.
+                    mark = planka.endpoints.updateNotification
+                    try:
+                        fan_out(lambda item: mark(item["id"], isRead=True), new)
+                    except Exception as exc:
+                        err_console.print(f"[dim]Marking notifications read failed: {exc}[/dim]")
+
+            if polls is None or done < polls:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def sync(
+    board_ids: Optional[list[str]] = typer.Option(
         None,
-        "--due-completed/--no-due-completed",
-        help="Mark due date as completed/uncompleted",
+        "--board",
+        help="Only refresh this board's contents (repeatable).",
+        autocompletion=complete_ids("boards"),
+    ),
+    full: bool = typer.Option(False, "--full", help="Rewrite every row, not only changed ones."),
+    comments: bool = typer.Option(
+        False, "--comments", help="Also fetch comment text of changed cards for search."
     ),
 ):
-    """Update an existing card."""
-    if description is not None and clear_description:
+    """Mirror projects, boards, lists, cards, labels and memberships for --offline."""
+    planka = get_planka()
+    try:
+        conn = open_mirror(planka_base_url(planka))
+        try:
+            stats = sync_mirror(planka, conn, board_ids, full, comments)
+        finally:
+            conn.close()
         console.print(
-            "[bold red]Error:[/bold red] Use either --description or --clear-description."
+            f"[green]Synced {stats['boards']} boards: {stats['written']} rows written, "
+            f"{stats['removed']} removed, {stats['indexed']} cards re-indexed "
+            f"({get_mirror_path(TOKENSTORE_OVERRIDE)}).[/green]"
         )
-        raise typer.Exit(1)
-    if due_date is not None and clear_due_date:
-        console.print("[bold red]Error:[/bold red] Use either --due-date or --clear-due-date.")
-        raise typer.Exit(1)
+    except Exception as e:
+        print_error(e)
 
-    planka = get_planka()
+
+@cache_app.command("stats")
+def cache_stats():
+    """Show cache size, hit rate and bandwidth saved."""
+    if not get_cache_path(TOKENSTORE_OVERRIDE).exists():
+        console.print("[yellow]The cache is empty.[/yellow]")
+        return
+    conn = open_cache(TOKENSTORE_OVERRIDE)
     try:
-        card = get_card_by_id(planka, card_id)
-        if not card:
-            console.print(f"[red]Card {card_id} not found.[/red]")
-            return
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        stats = dict.fromkeys(CACHE_STAT_NAMES, 0)
+        stats.update(conn.execute("SELECT name, value FROM stats"))
+    finally:
+        conn.close()
+    lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+    record = {
+        "entries": entries,
+        "size_bytes": size,
+        **stats,
+        "hit_rate": round((stats["hits"] + stats["revalidated"]) / lookups, 3) if lookups else None,
+    }
+    columns = [
+        Column("entries", "Entries", lambda r: r["entries"]),
+        Column("size_bytes", "Size (bytes)", lambda r: r["size_bytes"]),
+        Column("hits", "Hits", lambda r: r["hits"]),
+        Column("revalidated", "Revalidated (304)", lambda r: r["revalidated"]),
+        Column("misses", "Misses", lambda r: r["misses"]),
+        Column(
+            "hit_rate",
+            "Hit Rate",
+            lambda r: r["hit_rate"],
+            display=lambda v: "-" if v is None else f"{v:.1%}",
+        ),
+        Column("bytes_saved", "Bytes Saved", lambda r: r["bytes_saved"]),
+    ]
+    write_record("Response Cache", columns, record)
 
-        update_fields: dict[str, object] = {}
-        if name is not None:
-            update_fields["name"] = name
-        if description is not None:
-            update_fields["description"] = description
-        elif clear_description:
-            update_fields["description"] = None
-        if card_type is not None:
-            update_fields["type"] = card_type
-        if due_date is not None:
-            update_fields["dueDate"] = parse_iso_datetime(due_date)
-        elif clear_due_date:
-            update_fields["dueDate"] = None
-        if due_completed is not None:
-            update_fields["isDueCompleted"] = due_completed
 
-        move_position = parse_position(position)
-        if list_id is not None or move_position is not None:
-            target_list = find_list(planka, list_id) if list_id is not None else card.list
-            if not target_list:
-                console.print(f"[red]List {list_id} not found.[/red]")
-                return
-            card.move(target_list, position=move_position or "top")
+@cache_app.command("clear")
+def cache_clear():
+    """Delete every cached response and reset the counters."""
+    cache_path = get_cache_path(TOKENSTORE_OVERRIDE)
+    if cache_path.exists():
+        # Emptied rather than deleted, so a running daemon keeps a valid database.
+        conn = open_cache(TOKENSTORE_OVERRIDE)
+        try:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM stats")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+    console.print(f"[green]Cleared[/green] {cache_path}")
 
-        if update_fields:
-            card.update(**update_fields)
 
-        if not update_fields and list_id is None and move_position is None:
-            console.print("[yellow]No updates provided.[/yellow]")
-            return
+BATCH_EXCLUDED_COMMANDS = {"batch"}
 
-        console.print(f"[green]Updated card[/green] [bold]{card.name}[/bold] (ID: {card.id})")
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
 
+def resolve_command(root: click.Group, dotted_name: str) -> Optional[click.Command]:
+    """Resolve `cards.create` style names against the CLI command tree."""
+    command: Optional[click.Command] = root
+    for part in dotted_name.split("."):
+        if not isinstance(command, click.Group) or part in BATCH_EXCLUDED_COMMANDS:
+            return None
+        command = command.commands.get(part)
+    return None if isinstance(command, click.Group) else command
 
-@cards_app.command("delete")
-def delete_card(
-    card_id: str = typer.Argument(..., help="Card ID to delete"),
-    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
+
+def run_batch_item(ctx: typer.Context, item: object) -> dict:
+    if not isinstance(item, dict) or not isinstance(item.get("cmd"), str):
+        return {"ok": False, "error": 'Each line must be an object with a "cmd" string.'}
+    cmd_name = item["cmd"]
+    result: dict[str, object] = {"cmd": cmd_name, "ok": False}
+    command = resolve_command(ctx.find_root().command, cmd_name)
+    if command is None:
+        result["error"] = f"Unknown command: {cmd_name}"
+        return result
+
+    params_by_name = {param.name: param for param in command.params}
+    kwargs = {key: value for key, value in item.items() if key != "cmd"}
+    unknown = sorted(set(kwargs) - set(params_by_name))
+    missing = sorted(
+        name for name, param in params_by_name.items() if param.required and name not in kwargs
+    )
+    if unknown or missing:
+        result["error"] = "; ".join(
+            message
+            for message in (
+                f"Unknown fields: {', '.join(unknown)}" if unknown else "",
+                f"Missing fields: {', '.join(missing)}" if missing else "",
+            )
+            if message
+        )
+        return result
+    if "yes" in params_by_name and not kwargs.get("yes"):
+        result["error"] = 'Confirmation required: set "yes": true.'
+        return result
+
+    COMMAND_ERRORS.clear()
+    exit_code = 0
+    machine_output = io.StringIO()
+    with console.capture() as capture, redirect_stdout(machine_output):
+        try:
+            for name, value in kwargs.items():
+                kwargs[name] = params_by_name[name].type_cast_value(ctx, value)
+            ctx.invoke(command, **kwargs)
+        except click.exceptions.Exit as exc:
+            exit_code = exc.exit_code
+        except SystemExit as exc:
+            exit_code = exc.code if isinstance(exc.code, int) else 1
+        except click.ClickException as exc:
+            COMMAND_ERRORS.append(exc.format_message())
+            exit_code = exc.exit_code
+    from rich.text import Text
+
+    output = (Text.from_ansi(capture.get()).plain + machine_output.getvalue()).rstrip("\n")
+
+    result["ok"] = exit_code == 0 and not COMMAND_ERRORS
+    result["output"] = output
+    if not result["ok"]:
+        result["error"] = (
+            COMMAND_ERRORS[0] if COMMAND_ERRORS else output or f"Exit code {exit_code}"
+        )
+    return result
+
+
+@app.command()
+def batch(
+    ctx: typer.Context,
+    script: typer.FileText = typer.Argument("-", help="JSONL file to run (default: stdin)"),
 ):
-    """Delete a card."""
-    planka = get_planka()
-    try:
-        card = get_card_by_id(planka, card_id)
-        if not card:
-            console.print(f"[red]Card {card_id} not found.[/red]")
-            return
+    """Run newline-delimited JSON commands in one process and one session.
 
-        if not yes:
-            confirm = typer.confirm(f"Delete card '{card.name}' ({card.id})?")
-            if not confirm:
-                console.print("Cancelled.")
-                return
+    Each line names a command and its parameters, e.g.
+    {"cmd": "cards.create", "list_id": "123", "name": "Ship CLI"}.
+    One JSON result line is written per input line.
+    """
+    failures = 0
+    for line_number, line in enumerate(script, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as exc:
+            result: dict[str, object] = {"ok": False, "error": f"Invalid JSON: {exc}"}
+        else:
+            try:
+                result = run_batch_item(ctx, item)
+            except Exception as exc:
+                result = {"cmd": item.get("cmd"), "ok": False, "error": str(exc)}
+        failures += not result["ok"]
+        click.echo(json.dumps({"line": line_number, **result}))
+    if failures:
+        raise typer.Exit(1)
 
-        card.delete()
-        console.print(f"[green]Deleted card[/green] {card_id}")
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
 
+def get_daemon_socket_path(tokenstore: Optional[str] = None) -> Path:
+    # One daemon serves every profile; forwarded commands carry their own --profile.
+    return get_token_root(tokenstore) / DAEMON_SOCKET_FILENAME
 
-@notifications_app.command("all")
-def all_notifications():
-    """List all notifications."""
-    planka = get_planka()
+
+def daemon_request(socket_path: Path, message: dict, timeout: Optional[float] = 2.0):
+    """Send one JSON message to the daemon; return its reply or None if none is running.
+
+    The daemon serves one connection at a time and greets each one when it is free. If the
+    greeting does not come within timeout, nothing has been sent and None is returned, so
+    the caller can run the command itself. Once sent, the reply is awaited in full.
+    """
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
     try:
-        render_notifications("Notifications", planka.notifications)
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path))
+            with conn.makefile("rb") as reader:
+                if reader.readline() != b"ready\n":
+                    return None
+                conn.settimeout(None)
+                conn.sendall(json.dumps(message).encode() + b"\n")
+                reply = reader.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(reply)
+    except ValueError:
+        return None
 
 
-@notifications_app.command("unread")
-def unread_notifications():
-    """List unread notifications."""
-    planka = get_planka()
+def split_global_options(argv: list[str]) -> tuple[Optional[str], tuple[str, ...]]:
+    """Return the --tokenstore value and the command path (e.g. ("cards", "list")) from raw
+    argv."""
+    tokenstore = None
+    args = iter(argv)
+    for arg in args:
+        if arg == "--tokenstore":
+            tokenstore = next(args, None)
+        elif arg.startswith("--tokenstore="):
+            tokenstore = arg.split("=", 1)[1]
+        elif arg in GLOBAL_VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            subcommand = next((rest for rest in args if not rest.startswith("-")), None)
+            return tokenstore, (arg, subcommand) if subcommand else (arg,)
+    return tokenstore, ()
+
+
+def forward_to_daemon(argv: list[str]) -> bool:
+    """Run argv in the resident daemon if one is listening. Returns False to run in-process."""
+    if os.environ.get(DAEMON_DISABLE_ENV_VAR):
+        return False
+    tokenstore, command_path = split_global_options(argv)
+    if not command_path or any(
+        command_path[: len(local)] == local for local in DAEMON_LOCAL_COMMANDS
+    ):
+        return False
+    reply = daemon_request(
+        get_daemon_socket_path(tokenstore),
+        {
+            "op": "run",
+            "argv": argv,
+            "env": dict(os.environ),
+            "cwd": os.getcwd(),
+            "isatty": sys.stdout.isatty(),
+            "width": shutil.get_terminal_size().columns,
+        },
+        timeout=DAEMON_ACCEPT_TIMEOUT,
+    )
+    if not isinstance(reply, dict) or reply.get("fallback"):
+        return False
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.stdout.flush()
+    sys.exit(reply.get("exit_code", 0))
+
+
+def execute_forwarded(request: dict) -> dict:
+    """Run a forwarded argv in this process with the client's env, cwd and terminal."""
+    from rich.console import Console
+
+    global console, err_console
+    saved_console, saved_err_console = console, err_console
+    saved_env, saved_cwd, saved_stdin = dict(os.environ), os.getcwd(), sys.stdin
+    stdout, stderr = io.StringIO(), io.StringIO()
+    isatty = bool(request.get("isatty"))
+    width = request.get("width") or 80
+    exit_code = 0
     try:
-        render_notifications("Unread Notifications", planka.unread_notifications)
-    except Exception as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+        os.chdir(request.get("cwd") or saved_cwd)
+        console = Console(file=stdout, force_terminal=isatty, width=width)
+        err_console = Console(file=stderr, force_terminal=isatty, width=width)
+        # Prompts must not read the daemon's own stdin; at EOF they abort, and the client
+        # then runs the command itself, on its terminal.
+        sys.stdin = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            command = typer.main.get_command(app)
+            result = command.main(
+                args=list(request.get("argv") or []),
+                prog_name="planka-cli",
+                standalone_mode=False,
+            )
+            if isinstance(result, int):
+                exit_code = result
+    except click.exceptions.Abort:
+        # The command wanted a terminal (e.g. a confirmation prompt): let the client run it.
+        return {"fallback": True}
+    except click.ClickException as exc:
+        exc.show(file=stderr)
+        exit_code = exc.exit_code
+    except SystemExit as exc:
+        exit_code = exc.code if isinstance(exc.code, int) else 1
+    finally:
+        console, err_console = saved_console, saved_err_console
+        sys.stdin = saved_stdin
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+def serve_daemon(socket_path: Path, idle_timeout: float) -> None:
+    """Accept forwarded commands one at a time until stopped or idle for idle_timeout."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    stats = {"pid": os.getpid(), "started_at": time.time(), "requests": 0}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(socket_path))
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        server.settimeout(idle_timeout)
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+                with conn, conn.makefile("rwb") as stream:
+                    try:
+                        # Clients only send their command once the daemon is free for it.
+                        stream.write(b"ready\n")
+                        stream.flush()
+                        request = json.loads(stream.readline())
+                    except (OSError, ValueError):
+                        continue
+                    op = request.get("op") if isinstance(request, dict) else None
+                    if op == "run":
+                        stats["requests"] += 1
+                        reply = execute_forwarded(request)
+                    elif op in ("status", "stop"):
+                        reply = {**stats, "idle_timeout": idle_timeout, "socket": str(socket_path)}
+                    else:
+                        reply = {"error": f"Unknown op: {op}"}
+                    stream.write(json.dumps(reply).encode() + b"\n")
+                    stream.flush()
+                if op == "stop":
+                    break
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+@daemon_app.command("start")
+def start_daemon(
+    idle_timeout: float = typer.Option(
+        900, "--idle-timeout", help="Exit after this many idle seconds."
+    ),
+    foreground: bool = typer.Option(False, "--foreground", help="Do not detach."),
+):
+    """Start a daemon that keeps an authenticated session warm for later commands."""
+    if not hasattr(socket, "AF_UNIX"):
+        print_error("The daemon needs Unix domain sockets.")
+        raise typer.Exit(1)
+    socket_path = get_daemon_socket_path()
+    running = daemon_request(socket_path, {"op": "status"})
+    if running:
+        console.print(f"Daemon already running (PID {running.get('pid')}).")
+        return
+
+    # Authenticate up front so bad credentials fail here rather than in the background.
+    get_planka()
+    if foreground:
+        console.print(f"[green]Daemon listening on[/green] {socket_path}")
+        serve_daemon(socket_path, idle_timeout)
+        return
+
+    if os.fork() == 0:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            serve_daemon(socket_path, idle_timeout)
+        finally:
+            os._exit(0)
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        status_reply = daemon_request(socket_path, {"op": "status"})
+        if status_reply:
+            console.print(
+                f"[green]Daemon started[/green] (PID {status_reply.get('pid')}) on {socket_path}"
+            )
+            return
+        time.sleep(0.05)
+    print_error(f"Daemon did not come up on {socket_path}.")
+    raise typer.Exit(1)
+
+
+@daemon_app.command("stop")
+def stop_daemon():
+    """Stop the running daemon."""
+    reply = daemon_request(get_daemon_socket_path(), {"op": "stop"})
+    if not reply:
+        console.print("No daemon running.")
+        return
+    console.print(f"[green]Stopped daemon[/green] (PID {reply.get('pid')}).")
+
+
+@daemon_app.command("status")
+def daemon_status():
+    """Show whether the daemon is running."""
+    socket_path = get_daemon_socket_path()
+    reply = daemon_request(socket_path, {"op": "status"})
+    if not reply:
+        console.print("No daemon running.")
+        return
+    uptime = int(time.time() - float(reply.get("started_at", time.time())))
+    console.print(f"[green]Daemon running[/green] (PID {reply.get('pid')}) on {socket_path}")
+    console.print(f"Uptime: {uptime}s")
+    console.print(f"Requests served: {reply.get('requests')}")
+    console.print(f"Idle timeout: {reply.get('idle_timeout')}s")
+
+
+def run() -> None:
+    """Console entry point: use the daemon when it is running, else run in-process."""
+    if not forward_to_daemon(sys.argv[1:]):
+        app()
 
 
 if __name__ == "__main__":
-    app()
+    run()
@@ -0,0 +1,416 @@
+"""A local stand-in for the Planka HTTP API, seeded with a synthetic instance.
+
+It serves the endpoints planka-cli uses, with Planka's payload shapes (items plus
+`included` collections), counts every request, and can add a fixed latency per request.
+Attachment files are served like Planka's downloads, with Range support.
+Run it on its own for manual benchmarking:
+
+    python -m tests.fake_planka --projects 3 --boards 4 --lists 15 --cards 40 --latency 50
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+COMMENTS_PAGE_SIZE = 50
+DOWNLOAD_PATH = re.compile(r"/attachments/([^/]+)/download/[^/]+")
+TIMESTAMP = "2025-01-01T00:00:00.000Z"
+USER = {
+    "id": "1",
+    "role": "admin",
+    "name": "Alice",
+    "username": "alice",
+    "email": "alice@example.com",
+    "createdAt": TIMESTAMP,
+    "updatedAt": None,
+}
+
+
+class FakePlanka:
+    """A synthetic instance of projects x boards x lists x cards, served over HTTP.
+
+    IDs are sequential numeric strings, like Planka's. Every board gets one label, and
+    every card gets `comments` comments (paged like Planka's, 50 at a time).
+    """
+
+    def __init__(
+        self,
+        projects: int = 2,
+        boards: int = 2,
+        lists: int = 3,
+        cards: int = 5,
+        comments: int = 0,
+        latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.requests: list[tuple[str, str]] = []
+        self.lock = threading.Lock()
+        self.next_id = 1000
+        self.projects: dict[str, dict] = {}
+        self.boards: dict[str, dict] = {}
+        self.lists: dict[str, dict] = {}
+        self.cards: dict[str, dict] = {}
+        self.labels: dict[str, dict] = {}
+        self.comments: dict[str, list[dict]] = {}
+        self.attachments: dict[str, dict] = {}
+        self.files: dict[str, bytes] = {}
+        # The Range header of every download request, or None when it had none.
+        self.ranges: list[str | None] = []
+        for p in range(projects):
+            project = self.add("projects", {"name": f"Project {p}", "description": None})
+            for b in range(boards):
+                board = self.add(
+                    "boards",
+                    {"projectId": project["id"], "name": f"Board {p}.{b}", "position": b + 1},
+                )
+                self.add(
+                    "labels",
+                    {"boardId": board["id"], "name": "bug", "color": "berry-red", "position": 1},
+                )
+                for lst in range(lists):
+                    list_item = self.add(
+                        "lists",
+                        {
+                            "boardId": board["id"],
+                            "type": "active",
+                            "name": f"List {lst}",
+                            "position": (lst + 1) * 65536,
+                            "color": None,
+                        },
+                    )
+                    for c in range(cards):
+                        card = self.add_card(list_item, f"Card {p}.{b}.{lst}.{c}", (c + 1) * 65536)
+                        for n in range(comments):
+                            self.add_comment(card["id"], f"Comment {n}")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler_class())
+        self.server.daemon_threads = True
+        self.thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def new_id(self) -> str:
+        with self.lock:
+            self.next_id += 1
+            return str(self.next_id)
+
+    def add(self, kind: str, fields: dict) -> dict:
+        item = {"id": self.new_id(), "createdAt": TIMESTAMP, "updatedAt": None, **fields}
+        getattr(self, kind)[item["id"]] = item
+        return item
+
+    def add_card(self, list_item: dict, name: str, position: float) -> dict:
+        card = self.add(
+            "cards",
+            {
+                "boardId": list_item["boardId"],
+                "listId": list_item["id"],
+                "creatorUserId": USER["id"],
+                "type": "project",
+                "position": position,
+                "name": name,
+                "description": None,
+                "dueDate": None,
+                "isDueCompleted": None,
+                "commentsTotal": 0,
+                "isClosed": False,
+                "listChangedAt": TIMESTAMP,
+            },
+        )
+        self.comments[card["id"]] = []
+        return card
+
+    def add_comment(self, card_id: str, text: str) -> dict:
+        comment = {
+            "id": self.new_id(),
+            "cardId": card_id,
+            "userId": USER["id"],
+            "text": text,
+            "createdAt": TIMESTAMP,
+            "updatedAt": None,
+        }
+        self.comments[card_id].insert(0, comment)
+        self.cards[card_id]["commentsTotal"] = len(self.comments[card_id])
+        return comment
+
+    def add_attachment(self, card_id: str, filename: str, content: bytes) -> dict:
+        """Attach a file to a card; call it once the server exists, as the URL needs it."""
+        attachment = self.add(
+            "attachments",
+            {
+                "cardId": card_id,
+                "creatorUserId": USER["id"],
+                "type": "file",
+                "name": filename,
+                "data": {"filename": filename, "mimeType": None, "size": str(len(content))},
+            },
+        )
+        attachment["data"]["url"] = f"{self.url}/attachments/{attachment['id']}/download/{filename}"
+        self.files[attachment["id"]] = content
+        return attachment
+
+    # Request accounting
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests.clear()
+            self.ranges.clear()
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    # Payloads
+
+    def board_included(self, board_id: str) -> dict:
+        lists = [lst for lst in self.lists.values() if lst["boardId"] == board_id]
+        cards = [card for card in self.cards.values() if card["boardId"] == board_id]
+        board = self.boards[board_id]
+        card_ids = {card["id"] for card in cards}
+        return {
+            "users": [USER],
+            "projects": [self.projects[board["projectId"]]],
+            "boardMemberships": [],
+            "labels": [label for label in self.labels.values() if label["boardId"] == board_id],
+            "lists": lists,
+            "cards": cards,
+            "cardMemberships": [],
+            "cardLabels": [],
+            "taskLists": [],
+            "tasks": [],
+            "attachments": [a for a in self.attachments.values() if a["cardId"] in card_ids],
+            "customFieldGroups": [],
+            "customFields": [],
+            "customFieldValues": [],
+        }
+
+    def card_included(self, card_id: str | None = None) -> dict:
+        return {
+            "users": [USER],
+            "cardMemberships": [],
+            "cardLabels": [],
+            "taskLists": [],
+            "tasks": [],
+            "attachments": [a for a in self.attachments.values() if a["cardId"] == card_id],
+            "customFieldGroups": [],
+            "customFields": [],
+            "customFieldValues": [],
+        }
+
+    def project_included(self, boards: list[dict]) -> dict:
+        return {
+            "users": [USER],
+            "projectManagers": [],
+            "backgroundImages": [],
+            "baseCustomFieldGroups": [],
+            "boards": boards,
+            "boardMemberships": [],
+            "customFields": [],
+            "notificationServices": [],
+        }
+
+    def route(self, method: str, path: str, query: dict, body: dict) -> tuple[int, dict]:
+        """Answer one API call; returns (status, payload)."""
+        parts = path.strip("/").split("/")[1:]
+        match (method, *parts):
+            case ("POST", "access-tokens"):
+                return 200, {"item": "fake-token"}
+            case ("DELETE", "access-tokens", "me"):
+                return 200, {"item": "fake-token"}
+            case ("GET", "users", "me"):
+                return 200, {"item": USER}
+            case ("GET", "projects"):
+                boards = list(self.boards.values())
+                return 200, {
+                    "items": list(self.projects.values()),
+                    "included": self.project_included(boards),
+                }
+            case ("GET", "projects", project_id) if project_id in self.projects:
+                boards = [b for b in self.boards.values() if b["projectId"] == project_id]
+                return 200, {
+                    "item": self.projects[project_id],
+                    "included": self.project_included(boards),
+                }
+            case ("GET", "boards", board_id) if board_id in self.boards:
+                return 200, {
+                    "item": self.boards[board_id],
+                    "included": self.board_included(board_id),
+                }
+            case ("GET", "lists", list_id) if list_id in self.lists:
+                included = self.card_included()
+                included["cards"] = [c for c in self.cards.values() if c["listId"] == list_id]
+                return 200, {"item": self.lists[list_id], "included": included}
+            case ("POST", "lists", list_id, "cards") if list_id in self.lists:
+                card = self.add_card(self.lists[list_id], body["name"], body.get("position"))
+                card.update({key: value for key, value in body.items() if key in card})
+                return 200, {"item": card, "included": self.card_included()}
+            case ("GET", "cards", card_id) if card_id in self.cards:
+                included = self.card_included(card_id)
+                return 200, {"item": self.cards[card_id], "included": included}
+            case ("PATCH", "cards", card_id) if card_id in self.cards:
+                card = self.cards[card_id]
+                card.update({key: value for key, value in body.items() if key in card})
+                if "listId" in body:
+                    card["boardId"] = self.lists[body["listId"]]["boardId"]
+                card["updatedAt"] = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+                return 200, {"item": card}
+            case ("DELETE", "cards", card_id) if card_id in self.cards:
+                self.comments.pop(card_id, None)
+                return 200, {"item": self.cards.pop(card_id)}
+            case ("GET", "cards", card_id, "comments") if card_id in self.cards:
+                comments = self.comments[card_id]
+                before_id = query.get("beforeId")
+                if before_id:
+                    comments = [c for c in comments if int(c["id"]) < int(before_id)]
+                page = comments[:COMMENTS_PAGE_SIZE]
+                return 200, {"items": page, "included": {"users": [USER]}}
+            case ("POST", "cards", card_id, "attachments") if card_id in self.cards:
+                filename, content = body["file"]
+                attachment = self.add_attachment(card_id, filename, content)
+                attachment["name"] = body.get("name") or filename
+                return 200, {"item": attachment}
+            case ("POST", "cards", card_id, "comments") if card_id in self.cards:
+                return 200, {"item": self.add_comment(card_id, body["text"])}
+            case ("GET", "notifications"):
+                return 200, {"items": [], "included": {"users": []}}
+        return 404, {"code": "E_NOT_FOUND", "message": f"{method} {path} not found"}
+
+    # Server lifecycle
+
+    def handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_call(self) -> None:
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                with fake.lock:
+                    fake.requests.append((self.command, url.path))
+                if fake.latency:
+                    time.sleep(fake.latency)
+                download = DOWNLOAD_PATH.fullmatch(url.path)
+                if self.command == "GET" and download:
+                    self.send_file(download.group(1))
+                    return
+                content_type = self.headers.get("Content-Type", "")
+                if content_type.startswith("multipart/form-data"):
+                    body = parse_multipart(content_type, raw)
+                else:
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except ValueError:
+                        body = {}
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                self.send_json(*fake.route(self.command, url.path, query, body))
+
+            def send_json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_file(self, attachment_id: str) -> None:
+                """Serve an attachment to an authenticated client, honoring `bytes=N-`."""
+                content = fake.files.get(attachment_id)
+                requested = self.headers.get("Range")
+                with fake.lock:
+                    fake.ranges.append(requested)
+                if not self.headers.get("Authorization", "").startswith("Bearer "):
+                    self.send_json(401, {"code": "E_UNAUTHORIZED", "message": "Unauthorized"})
+                    return
+                if content is None:
+                    self.send_json(404, {"code": "E_NOT_FOUND", "message": "File not found"})
+                    return
+                match = re.fullmatch(r"bytes=(\d+)-", requested or "")
+                start = int(match.group(1)) if match else 0
+                if start >= len(content) and match:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(content)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206 if match else 200)
+                if match:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}"
+                    )
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(content) - start))
+                self.end_headers()
+                self.wfile.write(content[start:])
+
+            do_GET = do_POST = do_PATCH = do_DELETE = handle_call
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakePlanka":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakePlanka":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def parse_multipart(content_type: str, raw: bytes) -> dict:
+    """Form fields as strings, and file fields as (filename, content)."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+    )
+    fields: dict = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        content = part.get_payload(decode=True)
+        filename = part.get_filename()
+        fields[name] = (filename, content) if filename is not None else content.decode()
+    return fields
+
+
+def parse_size(value: str) -> dict:
+    """Parse "PxBxLxC" (projects x boards x lists x cards) into FakePlanka arguments."""
+    match = re.fullmatch(r"(\d+)x(\d+)x(\d+)x(\d+)", value.strip())
+    if not match:
+        raise ValueError(f"Expected PROJECTSxBOARDSxLISTSxCARDS, got {value!r}.")
+    return dict(zip(("projects", "boards", "lists", "cards"), map(int, match.groups())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--boards", type=int, default=2)
+    parser.add_argument("--lists", type=int, default=3)
+    parser.add_argument("--cards", type=int, default=5)
+    parser.add_argument("--comments", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds per request")
+    args = parser.parse_args()
+    fake = FakePlanka(
+        args.projects, args.boards, args.lists, args.cards, args.comments, args.latency / 1000
+    )
+    print(f"Fake Planka at {fake.url} (user alice, any password). Ctrl-C to stop.")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        fake.server.server_close()
@@ -0,0 +1,160 @@
+"""Request-budget benchmarks for planka-cli against a local fake Planka server.
+
+Each command runs in-process against `FakePlanka` with a warm session (as after a prior
+login), and must stay within its HTTP request budget. Budgets are expressed in terms of
+the synthetic instance's size, so an N+1 regression fails no matter how it is seeded.
+
+Tune the instance with PLANKA_BENCH_SIZE=PROJECTSxBOARDSxLISTSxCARDS (default 2x2x3x5),
+PLANKA_BENCH_COMMENTS per card (default 60) and PLANKA_BENCH_LATENCY_MS (default 0). Set PLANKA_BENCH_REPORT=path.jsonl to append each
+command's wall time and request count.
+
+The engine benchmarks run fan-out commands serially, on the thread pool and on the async
+engine against an instance with at least ENGINE_LATENCY_MS of latency per request.
+"""
+
+import json
+import os
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from scripts.planka_cli import MIRROR_FILENAME, app, save_session
+from tests.fake_planka import FakePlanka, parse_size
+
+runner = CliRunner()
+SIZE = parse_size(os.environ.get("PLANKA_BENCH_SIZE", "2x2x3x5"))
+COMMENTS = int(os.environ.get("PLANKA_BENCH_COMMENTS", "60"))
+LATENCY = float(os.environ.get("PLANKA_BENCH_LATENCY_MS", "0")) / 1000
+REPORT = os.environ.get("PLANKA_BENCH_REPORT")
+ENGINE_LATENCY_MS = 20
+
+
+def first(items: dict) -> str:
+    return next(iter(items))
+
+
+# name -> (argv for a seeded instance, request budget for that instance)
+BENCHMARKS = {
+    "projects list": (lambda f: ["projects", "list"], lambda f: 1),
+    "boards list": (lambda f: ["boards", "list"], lambda f: 1 + len(f.projects)),
+    "boards list PROJECT": (lambda f: ["boards", "list", first(f.projects)], lambda f: 2),
+    "lists list": (lambda f: ["lists", "list", first(f.boards)], lambda f: 1),
+    "cards list": (lambda f: ["cards", "list", first(f.lists)], lambda f: 1),
+    "cards list --board": (lambda f: ["cards", "list", "--board", first(f.boards)], lambda f: 1),
+    "cards show": (lambda f: ["cards", "show", first(f.cards)], lambda f: 3),
+    "cards show x3": (lambda f: ["cards", "show", *list(f.cards)[:3]], lambda f: 9),
+    "cards comments": (lambda f: ["cards", "comments", first(f.cards)], lambda f: 1),
+    "cards comments --all": (
+        lambda f: ["--output", "ndjson", "cards", "comments", first(f.cards), "--all"],
+        lambda f: len(f.comments[first(f.cards)]) // 50 + 1,
+    ),
+    "cards create": (lambda f: ["cards", "create", first(f.lists), "New card"], lambda f: 2),
+    "cards update": (
+        lambda f: ["cards", "update", first(f.cards), "--name", "Renamed"],
+        lambda f: 2,
+    ),
+    "cards delete": (lambda f: ["cards", "delete", first(f.cards), "--yes"], lambda f: 2),
+    "notifications unread": (lambda f: ["notifications", "unread"], lambda f: 1),
+    "sync": (lambda f: ["sync"], lambda f: 1 + len(f.boards)),
+}
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    with FakePlanka(**SIZE, comments=COMMENTS, latency=LATENCY) as server:
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        monkeypatch.setenv("PLANKA_URL", server.url)
+        monkeypatch.setenv("PLANKA_USERNAME", "alice")
+        monkeypatch.setenv("PLANKA_PASSWORD", "secret")
+        yield server
+
+
+def warm_session(fake: FakePlanka) -> None:
+    """Store a session as a previous login would, so runs measure only the command."""
+    save_session(
+        {
+            "url": fake.url,
+            "username": "alice",
+            "token": "fake-token",
+            "expires_at": None,
+            "user_id": "1",
+            "role": "admin",
+        }
+    )
+
+
+def run(fake: FakePlanka, monkeypatch, name: str, argv: list[str]):
+    """Run one command as a fresh process would; returns (result, requests, seconds)."""
+    monkeypatch.setattr("scripts.planka_cli.PLANKA_SESSIONS", {})
+    fake.reset()
+    started = time.perf_counter()
+    result = runner.invoke(app, argv)
+    elapsed = time.perf_counter() - started
+    if REPORT:
+        with open(REPORT, "a") as report:
+            record = {
+                "command": name,
+                "size": SIZE,
+                "latency_ms": fake.latency * 1000,
+                "requests": fake.request_count,
+                "seconds": round(elapsed, 4),
+            }
+            report.write(json.dumps(record) + "\n")
+    return result, fake.request_count, elapsed
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_request_budget(fake, monkeypatch, name):
+    """Every command stays within its request budget."""
+    argv, budget = BENCHMARKS[name]
+    warm_session(fake)
+    result, requests, _ = run(fake, monkeypatch, name, argv(fake))
+    assert result.exit_code == 0, result.output
+    assert "Error" not in result.output, result.output
+    assert requests <= budget(fake), f"{name}: {requests} requests, budget {budget(fake)}: " + (
+        ", ".join(f"{method} {path}" for method, path in fake.requests)
+    )
+
+
+def test_login_costs_two_requests(fake, monkeypatch):
+    """Without a stored session, a command logs in once and looks up the user once."""
+    result, requests, _ = run(fake, monkeypatch, "projects list (login)", ["projects", "list"])
+    assert result.exit_code == 0, result.output
+    assert requests == 1 + 2
+    _, requests, _ = run(fake, monkeypatch, "projects list", ["projects", "list"])
+    assert requests == 1
+
+
+# Global options per way of running a command's parallel reads.
+ENGINES = {
+    "serial": ["--engine", "threads", "--concurrency", "1"],
+    "threads": ["--engine", "threads"],
+    "async": ["--engine", "async"],
+}
+
+
+@pytest.mark.parametrize("name", ["boards list", "cards show x3", "sync"])
+def test_engines_match_and_async_beats_serial(tmp_path, monkeypatch, name):
+    """Each engine prints the same output from the same requests; async overlaps latency."""
+    latency = max(LATENCY, ENGINE_LATENCY_MS / 1000)
+    argv, _ = BENCHMARKS[name]
+    with FakePlanka(**SIZE, comments=COMMENTS, latency=latency) as server:
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        monkeypatch.setenv("PLANKA_URL", server.url)
+        monkeypatch.setenv("PLANKA_USERNAME", "alice")
+        monkeypatch.setenv("PLANKA_PASSWORD", "secret")
+        warm_session(server)
+        # A first run fills the ID index, so every engine starts from the same lookups.
+        run(server, monkeypatch, f"{name} [warm-up]", argv(server))
+        runs = {}
+        for engine, options in ENGINES.items():
+            (tmp_path / MIRROR_FILENAME).unlink(missing_ok=True)
+            result, requests, seconds = run(
+                server, monkeypatch, f"{name} [{engine}]", [*options, *argv(server)]
+            )
+            assert result.exit_code == 0, result.output
+            runs[engine] = (result.output, requests, seconds)
+
+    assert runs["async"][:2] == runs["threads"][:2] == runs["serial"][:2]
+    assert runs["async"][2] < runs["serial"][2], {k: v[1:] for k, v in runs.items()}
@@ -1,10 +1,53 @@
 """Tests for planka-cli."""
 
+import base64
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from plankapy.v2 import Planka
 from typer.testing import CliRunner
 
-from scripts.planka_cli import app
+from scripts.planka_cli import (
+    ACTIVE_PROFILE,
+    HTTP_CONFIG_DEFAULTS,
+    HTTP_STATS,
+    PLANKA_SESSIONS,
+    app,
+    daemon_request,
+    execute_forwarded,
+    fetch_payload,
+    find_list,
+    flush_id_index,
+    forget_missing_ids,
+    forward_to_daemon,
+    index_get,
+    index_put,
+    load_http_config,
+    load_session,
+    load_stored_credentials,
+    make_cache_transport,
+    make_session_auth,
+    make_trace_transport,
+    make_transport,
+    save_session,
+    serve_daemon,
+    split_global_options,
+    token_expiry,
+)
+from tests.fake_planka import FakePlanka
 
 runner = CliRunner()
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Cumulative `python -X importtime` budget for `import scripts.planka_cli`.
+IMPORT_BUDGET_MS = int(os.environ.get("PLANKA_CLI_IMPORT_BUDGET_MS", "300"))
 
 
 class TestHelp:
@@ -70,3 +113,1576 @@ class TestLoginLogout:
         result = runner.invoke(app, ["logout"])
         assert result.exit_code == 0
         assert "No stored credentials" in result.output
+
+
+def make_jwt(claims: dict) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def install_planka(monkeypatch, tmp_path, handler, wrap=lambda transport: transport) -> Planka:
+    """Point the CLI at a Planka session backed by an in-process mock transport."""
+    monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+    monkeypatch.setenv("PLANKA_URL", "https://p.example")
+    monkeypatch.setenv("PLANKA_USERNAME", "alice")
+    monkeypatch.setenv("PLANKA_PASSWORD", "secret")
+    transport = wrap(httpx.MockTransport(handler))
+    client = httpx.Client(base_url="https://p.example", transport=transport)
+    planka = Planka(client=client)
+    monkeypatch.setitem(PLANKA_SESSIONS, ("https://p.example", "alice", "secret"), planka)
+    return planka
+
+
+class TestSession:
+    """Test session token persistence and reuse."""
+
+    def test_token_expiry_reads_exp_claim(self):
+        """JWT exp claim should be decoded without verification."""
+        assert token_expiry(make_jwt({"exp": 1700000000})) == 1700000000.0
+        assert token_expiry("not-a-jwt") is None
+
+    def test_load_session_rejects_other_user_and_expired(self, tmp_path, monkeypatch):
+        """Cached sessions are only reused for the same URL/user and before expiry."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        save_session(
+            {"url": "https://p.example", "username": "alice", "token": "t", "expires_at": None}
+        )
+        assert load_session("https://p.example", "alice")["token"] == "t"
+        assert load_session("https://p.example", "bob") == {}
+
+        save_session(
+            {"url": "https://p.example", "username": "alice", "token": "t", "expires_at": 1.0}
+        )
+        assert load_session("https://p.example", "alice") == {}
+
+    def test_auth_logs_in_once_and_refreshes_on_401(self, tmp_path, monkeypatch):
+        """A 401 should trigger a transparent re-login that is persisted."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        issued = iter(["first", "second"])
+        valid = set()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/access-tokens":
+                token = next(issued)
+                valid.clear()
+                valid.add(token)
+                return httpx.Response(200, json={"item": token})
+            if request.headers.get("Authorization", "").removeprefix("Bearer ") in valid:
+                return httpx.Response(200, json={"item": "ok"})
+            return httpx.Response(401, json={"code": "E_UNAUTHORIZED"})
+
+        auth = make_session_auth("https://p.example", "alice", "secret")
+        client = httpx.Client(
+            base_url="https://p.example", auth=auth, transport=httpx.MockTransport(handler)
+        )
+        assert client.get("api/users/me").status_code == 200
+        assert load_session("https://p.example", "alice")["token"] == "first"
+
+        valid.clear()
+        assert client.get("api/users/me").status_code == 200
+        assert load_session("https://p.example", "alice")["token"] == "second"
+
+    def test_concurrent_requests_share_one_login(self, tmp_path, monkeypatch):
+        """Workers that find no token, or the same expired one, log in once between them."""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        issued = itertools.count(1)
+        logins = []
+        valid = set()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/access-tokens":
+                time.sleep(0.05)
+                token = f"t{next(issued)}"
+                logins.append(token)
+                valid.clear()
+                valid.add(token)
+                return httpx.Response(200, json={"item": token})
+            if request.headers.get("Authorization", "").removeprefix("Bearer ") in valid:
+                return httpx.Response(200, json={"item": "ok"})
+            return httpx.Response(401, json={"code": "E_UNAUTHORIZED"})
+
+        auth = make_session_auth("https://p.example", "alice", "secret")
+        client = httpx.Client(
+            base_url="https://p.example", auth=auth, transport=httpx.MockTransport(handler)
+        )
+        with ThreadPoolExecutor(8) as pool:
+            statuses = list(pool.map(lambda _: client.get("api/users/me").status_code, range(8)))
+        assert statuses == [200] * 8
+        assert logins == ["t1"]
+
+        valid.clear()
+
+        async def fetch_all() -> list[int]:
+            async with httpx.AsyncClient(
+                base_url="https://p.example", auth=auth, transport=httpx.MockTransport(handler)
+            ) as async_client:
+                responses = await asyncio.gather(
+                    *(async_client.get("api/users/me") for _ in range(8))
+                )
+                return [response.status_code for response in responses]
+
+        assert asyncio.run(fetch_all()) == [200] * 8
+        assert logins == ["t1", "t2"]
+        assert load_session("https://p.example", "alice")["token"] == "t2"
+
+    def test_async_client_refreshes_on_401_with_streamed_responses(self, tmp_path, monkeypatch):
+        """An AsyncClient re-logs in when responses arrive as unread async streams."""
+        import asyncio
+
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        save_session(
+            {"url": "https://p.example", "username": "alice", "token": "stale", "expires_at": None}
+        )
+
+        class Stream(httpx.AsyncByteStream):
+            def __init__(self, data: bytes):
+                self.data = data
+
+            async def __aiter__(self):
+                yield self.data
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/access-tokens":
+                return httpx.Response(200, stream=Stream(b'{"item": "fresh"}'))
+            if request.headers["Authorization"] == "Bearer fresh":
+                return httpx.Response(200, stream=Stream(b'{"item": "ok"}'))
+            return httpx.Response(401, stream=Stream(b'{"code": "E_UNAUTHORIZED"}'))
+
+        async def fetch_twice() -> list[int]:
+            auth = make_session_auth("https://p.example", "alice", "secret")
+            transport = httpx.MockTransport(handler)
+            async with httpx.AsyncClient(
+                base_url="https://p.example", auth=auth, transport=transport
+            ) as client:
+                return [(await client.get("api/users/me")).status_code for _ in range(2)]
+
+        assert asyncio.run(fetch_twice()) == [200, 200]
+        assert load_session("https://p.example", "alice")["token"] == "fresh"
+
+
+class TestIdIndex:
+    """Test the on-disk ID index used for list/board resolution."""
+
+    def make_planka(self, handler) -> Planka:
+        client = httpx.Client(
+            base_url="https://p.example",
+            transport=httpx.MockTransport(handler),
+            event_hooks={"response": [forget_missing_ids]},
+        )
+        return Planka(client=client)
+
+    def test_miss_does_targeted_fetch_then_hits_locally(self, tmp_path, monkeypatch):
+        """A miss should fetch only the list itself; a hit should not touch the network."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            item = {"id": "10", "name": "Backlog", "boardId": "5", "position": 1, "type": "active"}
+            return httpx.Response(200, json={"item": item, "included": {}})
+
+        planka = self.make_planka(handler)
+        assert find_list(planka, "10").name == "Backlog"
+        assert paths == ["/api/lists/10"]
+
+        cached = find_list(planka, "10")
+        assert cached.schema["boardId"] == "5"
+        assert paths == ["/api/lists/10"]
+
+    def test_404_invalidates_entry(self, tmp_path, monkeypatch):
+        """A 404 on a lookup by ID should drop the cached entry."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        planka = self.make_planka(lambda request: httpx.Response(404, json={}))
+        index_put(planka, "lists", [{"id": "10", "name": "Old", "boardId": "5"}])
+        assert index_get(planka, "lists", "10") is not None
+
+        planka.client.get("api/lists/10")
+        assert index_get(planka, "lists", "10") is None
+        assert find_list(planka, "10") is None
+
+    def test_server_errors_are_not_reported_as_missing(self, tmp_path, monkeypatch):
+        """Only a 404 means missing; other errors reach the command's error handling."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        planka = self.make_planka(lambda request: httpx.Response(500, json={}))
+        with pytest.raises(httpx.HTTPStatusError):
+            find_list(planka, "10")
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_payload(planka, "lists", "10")
+
+        install_planka(monkeypatch, tmp_path, lambda request: httpx.Response(500, json={}))
+        result = runner.invoke(app, ["cards", "list", "11"])
+        assert "not found" not in result.output
+        assert "500" in result.output
+
+    def test_puts_are_written_once_per_command_and_atomically(self, tmp_path, monkeypatch):
+        """Puts stay in memory until the command ends; the file is replaced, never rewritten."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        flush_id_index()  # Whatever earlier tests left staged.
+        planka = self.make_planka(lambda request: httpx.Response(404, json={}))
+        writes = []
+        real_replace = os.replace
+        monkeypatch.setattr(
+            "os.replace", lambda src, dst: (writes.append(Path(dst).name), real_replace(src, dst))
+        )
+        for n in range(3):
+            index_put(planka, "boards", [{"id": str(n), "name": f"B{n}"}])
+        assert index_get(planka, "boards", "2")["name"] == "B2"
+        assert not (tmp_path / "index.json").exists()
+
+        flush_id_index()
+        assert writes == ["index.json"]
+        assert sorted(json.loads((tmp_path / "index.json").read_text())["boards"]) == [
+            "0",
+            "1",
+            "2",
+        ]
+        assert [path.name for path in tmp_path.iterdir()] == ["index.json"]
+
+
+class TestProfiles:
+    """Test named profiles and --all-profiles queries."""
+
+    @pytest.fixture(autouse=True)
+    def reset_profile(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        for name in ("PLANKA_URL", "PLANKA_USERNAME", "PLANKA_PASSWORD", "PLANKA_PROFILE"):
+            monkeypatch.delenv(name, raising=False)
+        yield
+        ACTIVE_PROFILE.set(None)
+
+    def login(self, url: str, profile: str = "") -> None:
+        options = ["--profile", profile] if profile else []
+        argv = [*options, "login", "--url", url, "--username", "alice", "--password", "secret"]
+        result = runner.invoke(app, argv)
+        assert result.exit_code == 0, result.output
+
+    def install(self, monkeypatch, url: str, handler) -> None:
+        client = httpx.Client(base_url=url, transport=httpx.MockTransport(handler))
+        monkeypatch.setitem(PLANKA_SESSIONS, (url, "alice", "secret"), Planka(client=client))
+
+    def test_profiles_keep_separate_credentials(self, tmp_path):
+        """Each profile stores its files in its own directory; logout keeps the others."""
+        self.login("https://a.example")
+        self.login("https://b.example", "work")
+        assert (tmp_path / "profiles" / "work" / "credentials.json").exists()
+
+        result = runner.invoke(app, ["--profile", "work", "--output", "json", "profiles", "list"])
+        rows = json.loads(result.output)
+        assert [(r["name"], r["url"], r["active"]) for r in rows] == [
+            ("default", "https://a.example", False),
+            ("work", "https://b.example", True),
+        ]
+        assert "password" not in rows[0]
+
+        (tmp_path / "config.json").write_text('{"http": {}}')
+        (tmp_path / "index.json").write_text("{}")
+        (tmp_path / "daemon.sock").touch()
+        assert runner.invoke(app, ["logout"]).exit_code == 0
+        assert not (tmp_path / "credentials.json").exists()
+        assert not (tmp_path / "index.json").exists()
+        assert (tmp_path / "config.json").exists() and (tmp_path / "daemon.sock").exists()
+        assert (tmp_path / "profiles" / "work" / "credentials.json").exists()
+
+        result = runner.invoke(app, ["--profile", "../x", "status"])
+        assert result.exit_code != 0
+
+    def test_credentials_are_parsed_once_until_changed(self, tmp_path, monkeypatch):
+        """Repeated lookups reuse the parsed file; a rewrite is picked up."""
+        self.login("https://a.example")
+        reads = []
+        read_text = Path.read_text
+        monkeypatch.setattr(Path, "read_text", lambda path: reads.append(path) or read_text(path))
+        for _ in range(3):
+            assert load_stored_credentials()["PLANKA_URL"] == "https://a.example"
+        assert len(reads) <= 1
+
+        self.login("https://a2.example")
+        assert load_stored_credentials()["PLANKA_URL"] == "https://a2.example"
+
+    def test_all_profiles_merges_boards_and_reports_failures(self, monkeypatch):
+        """Every profile is queried; rows carry their profile and their own instance URL."""
+        self.login("https://a.example")
+        self.login("https://b.example", "work")
+        self.login("https://c.example", "broken")
+
+        def instance(host: str):
+            def handler(request: httpx.Request) -> httpx.Response:
+                project = {"id": "1", "name": f"{host} project", "createdAt": None}
+                board = {"id": "7", "name": f"{host} board", "projectId": "1", "position": 1}
+                included = {"boards": [board], "users": [], "projectManagers": []}
+                if request.url.path == "/api/projects":
+                    return httpx.Response(200, json={"items": [project], "included": included})
+                return httpx.Response(200, json={"item": project, "included": included})
+
+            return handler
+
+        self.install(monkeypatch, "https://a.example", instance("a"))
+        self.install(monkeypatch, "https://b.example", instance("b"))
+        self.install(
+            monkeypatch,
+            "https://c.example",
+            lambda request: httpx.Response(500, json={"message": "down"}),
+        )
+
+        result = runner.invoke(app, ["--output", "ndjson", "boards", "list", "--all-profiles"])
+        lines = result.output.strip().splitlines()
+        rows = [json.loads(line) for line in lines if line.startswith("{")]
+        assert [(r["profile"], r["name"], r["url"]) for r in rows] == [
+            ("default", "a board", "https://a.example/boards/7"),
+            ("work", "b board", "https://b.example/boards/7"),
+        ]
+        assert any("Profile broken" in line for line in lines)
+
+        # Run inline, the workers must still leave the caller's profile alone.
+        argv = ["--concurrency", "1", "--output", "ndjson", "boards", "list", "--all-profiles"]
+        assert runner.invoke(app, argv).output.count('"profile"') == 2
+        assert ACTIVE_PROFILE.get() is None
+
+        result = runner.invoke(app, ["boards", "list", "--all-profiles", "1"])
+        assert result.exit_code != 0
+
+
+class TestCompletion:
+    """Test shell completion of IDs from the ID index."""
+
+    INDEX = {
+        "url": "https://p.example",
+        "boards": {"5": {"id": "5", "name": "Roadmap"}, "6": {"id": "6", "name": "Ops"}},
+        "lists": {
+            "10": {"id": "10", "name": "Backlog", "boardId": "5"},
+            "11": {"id": "11", "name": "Done", "boardId": "6"},
+            "12": {"id": "12", "name": "Doing", "boardId": "5"},
+        },
+        "cards": {
+            "20": {"id": "20", "name": "Ship it", "listId": "10", "boardId": "5"},
+            "21": {"id": "21", "name": 'Fix: "quotes"', "listId": "11", "boardId": "6"},
+        },
+    }
+
+    def complete(self, tmp_path, words: str) -> str:
+        (tmp_path / "index.json").write_text(json.dumps(self.INDEX))
+        env = {
+            "PLANKATOKENS": str(tmp_path),
+            "_PLANKA_CLI_COMPLETE": "complete_zsh",
+            "_TYPER_COMPLETE_ARGS": f"planka-cli {words}",
+        }
+        return runner.invoke(app, [], env=env, prog_name="planka-cli").output
+
+    def test_suggests_ids_with_names(self, tmp_path):
+        """Board IDs come back sorted by name, with the name as the description."""
+        output = self.complete(tmp_path, "lists list ")
+        assert '"6":"Ops"\n"5":"Roadmap"' in output
+
+    def test_narrows_to_the_given_board_or_card(self, tmp_path):
+        """--board limits list suggestions; a card limits --list-id to its board's lists."""
+        output = self.complete(tmp_path, "cards list --board 6 --list ")
+        assert '"11":"Done"' in output and '"10"' not in output
+        output = self.complete(tmp_path, "cards update 20 --list-id ")
+        assert '"10":"Backlog"\n"12":"Doing"' in output and '"11"' not in output
+        output = self.complete(tmp_path, "cards show 2")
+        assert '"20":"Ship it"' in output and '"21"' in output
+
+    def test_plain_completion_hooks_are_still_in_place(self, tmp_path):
+        """The typer and click internals completion relies on must exist and be used.
+
+        If this fails after upgrading typer or click, revisit install_plain_completion and
+        the version bounds in pyproject.toml.
+        """
+        import click.shell_completion
+        from typer import _completion_classes
+
+        assert issubclass(_completion_classes.ZshComplete, click.shell_completion.ShellComplete)
+        assert issubclass(_completion_classes.FishComplete, click.shell_completion.ShellComplete)
+        assert callable(getattr(click.Command, "_main_shell_completion", None))
+        self.complete(tmp_path, "lists list ")
+        for shell in ("zsh", "fish"):
+            completion_class = click.shell_completion.get_completion_class(shell)
+            assert completion_class.__module__ == "scripts.planka_cli", shell
+
+    def test_completion_skips_the_api_stack(self, tmp_path):
+        """Completing an ID reads index.json only: no httpx, plankapy or rich import."""
+        (tmp_path / "index.json").write_text(json.dumps(self.INDEX))
+        result = run_python(
+            "import os, sys\n"
+            "os.environ.update(_PLANKA_CLI_COMPLETE='complete_zsh',"
+            " _TYPER_COMPLETE_ARGS='planka-cli cards delete ')\n"
+            "from scripts.planka_cli import app\n"
+            "try:\n"
+            "    app(prog_name='planka-cli')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('LOADED', [m for m in ('httpx', 'plankapy', 'rich') if m in sys.modules])",
+            tmp_path,
+        )
+        assert '"20":"Ship it"' in result.stdout
+        assert result.stdout.strip().splitlines()[-1] == "LOADED []"
+
+
+class TestBatch:
+    """Test batch execution of JSONL command scripts."""
+
+    def test_batch_reuses_session_and_isolates_errors(self, tmp_path, monkeypatch):
+        """Every line should get one result; failures must not stop the run."""
+        created = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                body = json.loads(request.content)
+                created.append(body["name"])
+                return httpx.Response(200, json={"item": {"id": str(len(created)), **body}})
+            item = {"id": "10", "name": "Backlog", "boardId": "5", "position": 1, "type": "active"}
+            return httpx.Response(200, json={"item": item, "included": {"cards": []}})
+
+        install_planka(monkeypatch, tmp_path, handler)
+        script = "\n".join(
+            [
+                json.dumps({"cmd": "cards.create", "list_id": "10", "name": "One"}),
+                "not json",
+                json.dumps({"cmd": "cards.delete", "card_id": "1"}),
+                json.dumps({"cmd": "cards.create", "list_id": "10", "name": "Two"}),
+            ]
+        )
+        result = runner.invoke(app, ["batch"], input=script)
+        lines = [json.loads(line) for line in result.output.splitlines()]
+
+        assert result.exit_code == 1
+        assert [line["ok"] for line in lines] == [True, False, False, True]
+        assert "Created card" in lines[0]["output"]
+        assert created == ["One", "Two"]
+
+
+class TestDaemon:
+    """Test the resident daemon and its thin client."""
+
+    def test_split_global_options(self):
+        """The thin client must find the tokenstore and command before parsing."""
+        assert split_global_options(["--tokenstore", "/t", "cards", "list", "7"]) == (
+            "/t",
+            ("cards", "list"),
+        )
+        assert split_global_options(["--tokenstore=/t", "-v", "status"]) == ("/t", ("status",))
+        assert split_global_options(["--concurrency", "4", "login"]) == (None, ("login",))
+        assert split_global_options(["--help"]) == (None, ())
+
+    def test_streaming_commands_run_in_process(self, tmp_path, monkeypatch):
+        """Watch and attachment transfers never go to the daemon, even when it is up."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        (tmp_path / "daemon.sock").touch()
+        sent = []
+        monkeypatch.setattr(
+            "scripts.planka_cli.daemon_request", lambda *args, **kwargs: sent.append(args)
+        )
+        assert forward_to_daemon(["notifications", "watch"]) is False
+        assert forward_to_daemon(["-v", "cards", "attach", "1", "f"]) is False
+        assert forward_to_daemon(["cards", "attachments", "download", "1", "-o", "d"]) is False
+        assert sent == []
+        assert forward_to_daemon(["notifications", "all"]) is False
+        assert len(sent) == 1
+
+    def test_forwarded_commands_report_their_own_stats_and_never_prompt(
+        self, tmp_path, monkeypatch
+    ):
+        """Counters start at zero per command, and a prompt hands the command back."""
+        card = {"id": "7", "name": "Ship", "listId": "1", "boardId": "2"}
+        install_planka(
+            monkeypatch,
+            tmp_path,
+            lambda request: httpx.Response(200, json={"item": card, "included": {}}),
+        )
+        monkeypatch.setitem(HTTP_STATS, "requests", 41)
+        env = dict(os.environ)
+
+        reply = execute_forwarded({"argv": ["-v", "cards", "show", "7"], "env": env})
+        assert reply["exit_code"] == 0, reply
+        assert "Session: reused" in reply["stderr"]
+        assert HTTP_STATS["requests"] == 0
+
+        reply = execute_forwarded({"argv": ["cards", "delete", "7"], "env": env})
+        assert reply == {"fallback": True}
+
+    def test_busy_daemon_falls_back_without_sending(self, tmp_path):
+        """A client that is not greeted in time runs in-process; the daemon never sees it."""
+        import socket
+
+        socket_path = tmp_path / "daemon.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as busy:
+            busy.bind(str(socket_path))
+            busy.listen()
+            started = time.monotonic()
+            assert daemon_request(socket_path, {"op": "status"}, timeout=0.2) is None
+            assert time.monotonic() - started < 2
+            conn, _ = busy.accept()
+            with conn:
+                conn.settimeout(1)
+                assert conn.recv(1024) == b""
+
+    def test_forward_falls_back_without_daemon(self, tmp_path, monkeypatch):
+        """Without a socket the command must run in-process."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        assert forward_to_daemon(["projects", "list"]) is False
+
+    def test_daemon_runs_forwarded_commands_and_stops(self, tmp_path, monkeypatch, capsys):
+        """Forwarded argv should run in the daemon and return its output."""
+        socket_path = tmp_path / "daemon.sock"
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        server = threading.Thread(target=serve_daemon, args=(socket_path, 10))
+        server.start()
+        try:
+            for _ in range(100):
+                if daemon_request(socket_path, {"op": "status"}):
+                    break
+                time.sleep(0.02)
+
+            with pytest.raises(SystemExit) as exit_info:
+                forward_to_daemon(["projects", "--help"])
+            assert exit_info.value.code == 0
+            assert "Manage projects" in capsys.readouterr().out
+            assert daemon_request(socket_path, {"op": "status"})["requests"] == 1
+        finally:
+            daemon_request(socket_path, {"op": "stop"})
+            server.join(timeout=5)
+        assert not server.is_alive()
+        assert not socket_path.exists()
+
+
+def run_python(code: str, tmp_path) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PLANKATOKENS": str(tmp_path), "PLANKA_NO_DAEMON": "1"}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env=env,
+        check=True,
+    )
+
+
+class TestStartup:
+    """Cold-start budget: commands that never hit the network must not import the API stack."""
+
+    HEAVY_MODULES = ("httpx", "plankapy", "rich")
+
+    def test_import_skips_heavy_modules(self, tmp_path):
+        """Importing the CLI must not import httpx, plankapy or rich."""
+        result = run_python(
+            "import sys, scripts.planka_cli\n"
+            f"print([m for m in {self.HEAVY_MODULES!r} if m in sys.modules])",
+            tmp_path,
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_offline_commands_skip_plankapy(self, tmp_path):
+        """Help, logout and daemon forwarding checks must not import plankapy or httpx."""
+        result = run_python(
+            "import sys\n"
+            "from scripts.planka_cli import app, forward_to_daemon\n"
+            "forward_to_daemon(['cards', 'list', '1'])\n"
+            "for argv in (['--help'], ['logout'], ['cards', '--help']):\n"
+            "    try:\n"
+            "        app(argv)\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            "print('LOADED', [m for m in ('httpx', 'plankapy') if m in sys.modules])",
+            tmp_path,
+        )
+        assert result.stdout.strip().splitlines()[-1] == "LOADED []"
+
+    def test_import_time_budget(self, tmp_path):
+        """Importing the CLI module must stay within the startup budget."""
+        result = run_python("import scripts.planka_cli", tmp_path)
+        cumulative_us = None
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+            if len(parts) == 3 and parts[2] == "scripts.planka_cli":
+                cumulative_us = int(parts[1])
+        assert cumulative_us is not None
+        assert cumulative_us / 1000 < IMPORT_BUDGET_MS, (
+            f"import took {cumulative_us / 1000:.0f} ms, budget is {IMPORT_BUDGET_MS} ms"
+        )
+
+
+class TestOutput:
+    """Test machine-readable output modes and field projection."""
+
+    CARD = {
+        "id": "20",
+        "name": "Ship CLI",
+        "listId": "10",
+        "boardId": "5",
+        "position": 65536,
+        "type": "project",
+        "createdAt": "2025-01-31T10:30:00.000Z",
+    }
+
+    def handler(self, paths: list):
+        def handle(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            if request.url.path == "/api/projects":
+                projects = [
+                    {"id": "1", "name": "Alpha\tOne", "createdAt": "2025-01-01T00:00:00.000Z"},
+                    {"id": "2", "name": "Beta", "createdAt": "2025-01-02T00:00:00.000Z"},
+                ]
+                return httpx.Response(200, json={"items": projects, "included": {}})
+            if request.url.path == "/api/cards/20":
+                return httpx.Response(200, json={"item": self.CARD, "included": {}})
+            return httpx.Response(404, json={})
+
+        return handle
+
+    def test_diagnostics_keep_machine_output_parseable(self, tmp_path, monkeypatch):
+        """Not-found messages go to stderr, so stdout stays valid JSON."""
+        install_planka(monkeypatch, tmp_path, self.handler([]))
+        result = runner.invoke(app, ["--output", "json", "cards", "show", "20", "99"])
+        assert [row["id"] for row in json.loads(result.stdout)] == ["20"]
+        assert "Card 99 not found." in result.stderr
+
+    def test_ndjson_and_tsv_stream_rows(self, tmp_path, monkeypatch):
+        """ndjson emits one object per row; tsv escapes tabs and starts with a header."""
+        install_planka(monkeypatch, tmp_path, self.handler([]))
+
+        result = runner.invoke(app, ["--output", "ndjson", "projects", "list"])
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [row["name"] for row in rows] == ["Alpha\tOne", "Beta"]
+        assert rows[0]["created_at"] == "2025-01-01T00:00:00+00:00"
+
+        result = runner.invoke(app, ["--output", "tsv", "--fields", "name,id", "projects", "list"])
+        assert result.output.splitlines() == ["name\tid", "Alpha\\tOne\t1", "Beta\t2"]
+
+    def test_board_cards_grouped_by_list_in_one_request(self, tmp_path, monkeypatch):
+        """cards list --board reads lists, cards and labels from a single board payload."""
+        included = {
+            "lists": [
+                {"id": "11", "boardId": "5", "type": "active", "position": 2, "name": "Done"},
+                {"id": "10", "boardId": "5", "type": "active", "position": 1, "name": "Todo"},
+                {"id": "12", "boardId": "5", "type": "archive", "position": None, "name": None},
+            ],
+            "cards": [
+                {"id": "22", "listId": "11", "name": "Old", "position": 1},
+                {"id": "21", "listId": "10", "name": "Second", "position": 2},
+                {
+                    "id": "20",
+                    "listId": "10",
+                    "name": "First",
+                    "position": 1,
+                    "dueDate": "2025-03-01T00:00:00.000Z",
+                },
+                {"id": "23", "listId": "12", "name": "Archived", "position": 1},
+            ],
+            "labels": [{"id": "L1", "name": "bug"}],
+            "cardLabels": [{"id": "CL1", "cardId": "20", "labelId": "L1"}],
+        }
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            board = {"id": "5", "name": "Roadmap"}
+            return httpx.Response(200, json={"item": board, "included": included})
+
+        install_planka(monkeypatch, tmp_path, handler)
+        result = runner.invoke(app, ["--output", "ndjson", "cards", "list", "--board", "5"])
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [(row["list"], row["name"]) for row in rows] == [
+            ("Todo", "First"),
+            ("Todo", "Second"),
+            ("Done", "Old"),
+        ]
+        assert rows[0]["labels"] == ["bug"] and rows[0]["due_date"] == "2025-03-01T00:00:00+00:00"
+        assert paths == ["/api/boards/5"]
+
+        result = runner.invoke(
+            app, ["--output", "ndjson", "cards", "list", "--board", "5", "--list", "done"]
+        )
+        assert [json.loads(line)["name"] for line in result.output.splitlines()] == ["Old"]
+        result = runner.invoke(app, ["cards", "list", "--board", "5", "--list", "Nope"])
+        assert result.exit_code == 2 and "No list 'Nope'" in result.output
+
+    def test_fields_skip_unneeded_card_requests(self, tmp_path, monkeypatch):
+        """Projecting header fields must not fetch the list, attachments or comments."""
+        paths = []
+        install_planka(monkeypatch, tmp_path, self.handler(paths))
+
+        result = runner.invoke(
+            app, ["--output", "json", "--fields", "id,name", "cards", "show", "20"]
+        )
+        assert json.loads(result.output) == {"id": "20", "name": "Ship CLI"}
+        assert paths == ["/api/cards/20"]
+
+    def test_show_many_cards_in_input_order(self, tmp_path, monkeypatch):
+        """Several IDs render as one JSON array, in the order given, without skipped sections."""
+        paths = []
+        install_planka(monkeypatch, tmp_path, self.handler(paths))
+
+        result = runner.invoke(
+            app,
+            ["--output", "json", "cards", "show", "20", "20", "--no-comments", "--no-attachments"],
+        )
+        rows = json.loads(result.output)
+        assert [row["id"] for row in rows] == ["20", "20"]
+        assert "comments" not in rows[0] and "attachments" not in rows[0]
+        assert not [path for path in paths if "comments" in path or "attachments" in path]
+
+    def test_unknown_field_is_reported(self, tmp_path, monkeypatch):
+        """Unknown --fields names should list the available ones."""
+        install_planka(monkeypatch, tmp_path, self.handler([]))
+        result = runner.invoke(app, ["--fields", "nope", "projects", "list"])
+        assert "Unknown field(s): nope" in result.output
+
+
+class TestMirror:
+    """Test `sync` and answering read commands from the offline mirror."""
+
+    def board_payload(self, cards: list) -> dict:
+        return {
+            "item": {"id": "5", "name": "Roadmap", "projectId": "1"},
+            "included": {
+                "lists": [
+                    {"id": "10", "name": "Todo", "boardId": "5", "position": 1, "type": "active"},
+                    {"id": "11", "name": "Archive", "boardId": "5", "type": "archive"},
+                ],
+                "cards": cards,
+                "labels": [{"id": "30", "name": "bug", "boardId": "5", "color": "berry-red"}],
+                "cardLabels": [{"id": "40", "cardId": "20", "labelId": "30"}],
+                "boardMemberships": [{"id": "50", "boardId": "5", "userId": "7", "role": "editor"}],
+                "cardMemberships": [],
+                "attachments": [],
+                "users": [{"id": "7", "name": "Alice", "username": "alice"}],
+            },
+        }
+
+    def handler(self, paths: list, cards: list):
+        def handle(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            if request.url.path == "/api/projects":
+                board = {"id": "5", "name": "Roadmap", "projectId": "1", "position": 1}
+                return httpx.Response(
+                    200,
+                    json={
+                        "items": [{"id": "1", "name": "Alpha"}],
+                        "included": {"boards": [board]},
+                    },
+                )
+            if request.url.path == "/api/boards/5":
+                return httpx.Response(200, json=self.board_payload(cards))
+            if request.url.path == "/api/cards/20/comments":
+                return httpx.Response(200, json={"items": [{"id": "60", "text": "ship it"}]})
+            return httpx.Response(404, json={})
+
+        return handle
+
+    def test_sync_then_answer_offline(self, tmp_path, monkeypatch):
+        """Offline reads should make no requests; re-syncs rewrite only changed rows."""
+        paths = []
+        cards = [
+            {
+                "id": "20",
+                "name": "Ship CLI",
+                "listId": "10",
+                "boardId": "5",
+                "position": 2,
+                "commentsCount": 3,
+                "updatedAt": "2025-01-01T00:00:00.000Z",
+            },
+            {"id": "21", "name": "Write docs", "listId": "10", "boardId": "5", "position": 1},
+        ]
+        install_planka(monkeypatch, tmp_path, self.handler(paths, cards))
+
+        result = runner.invoke(app, ["sync"])
+        assert result.exit_code == 0, result.output
+        assert paths == ["/api/projects", "/api/boards/5"]
+        assert "rows written" in result.output
+
+        paths.clear()
+        result = runner.invoke(app, ["--offline", "--output", "json", "cards", "list", "10"])
+        assert [row["name"] for row in json.loads(result.output)] == ["Write docs", "Ship CLI"]
+        assert json.loads(result.output)[1]["url"] == "https://p.example/boards/5/cards/20"
+
+        result = runner.invoke(app, ["--offline", "--output", "json", "lists", "list", "5"])
+        assert [row["id"] for row in json.loads(result.output)] == ["10"]
+
+        result = runner.invoke(
+            app,
+            ["--offline", "--output", "json", "--fields", "list,comments", "cards", "show", "20"],
+        )
+        assert json.loads(result.output) == {"list": "Todo (10)", "comments": 3}
+        assert paths == []
+
+        # Only the edited card is rewritten; the deleted one is pruned.
+        cards[0] = dict(cards[0], name="Ship CLI v2", updatedAt="2025-01-02T00:00:00.000Z")
+        del cards[1]
+        result = runner.invoke(app, ["sync"])
+        assert "1 rows written, 1 removed" in result.output
+
+        result = runner.invoke(
+            app, ["--offline", "--output", "tsv", "--fields", "name", "cards", "list", "10"]
+        )
+        assert result.output.splitlines() == ["name", "Ship CLI v2"]
+
+    def test_search_ranks_filters_and_reindexes_incrementally(self, tmp_path, monkeypatch):
+        """Name hits rank first, filters narrow results, and re-syncs touch changed cards only."""
+        paths = []
+        cards = [
+            {
+                "id": "20",
+                "name": "Release notes",
+                "description": "Ship the CLI",
+                "listId": "10",
+                "boardId": "5",
+                "commentsCount": 1,
+                "dueDate": "2025-03-01T00:00:00.000Z",
+                "updatedAt": "2025-01-01T00:00:00.000Z",
+            },
+            {
+                "id": "21",
+                "name": "Shipping checklist",
+                "listId": "10",
+                "boardId": "5",
+                "updatedAt": "2025-01-01T00:00:00.000Z",
+            },
+        ]
+        install_planka(monkeypatch, tmp_path, self.handler(paths, cards))
+        result = runner.invoke(app, ["sync", "--comments"])
+        assert "2 cards re-indexed" in result.output
+        assert "/api/cards/20/comments" in paths
+
+        def search(*args):
+            result = runner.invoke(app, ["--output", "json", "cards", "search", *args])
+            return [row["id"] for row in json.loads(result.output)]
+
+        assert search("ship") == ["21", "20"]
+        assert search("ship it") == ["20"]
+        assert search("ship", "--label", "BUG") == ["20"]
+        assert search("ship", "--due-before", "2025-02-01") == []
+        assert search("ship", "--due-before", "2025-04-01") == ["20"]
+
+        result = runner.invoke(app, ["--output", "json", "cards", "search", "release"])
+        assert json.loads(result.output)[0]["url"] == "https://p.example/boards/5/cards/20"
+
+        paths.clear()
+        cards[1] = dict(cards[1], name="Launch checklist", updatedAt="2025-01-02T00:00:00.000Z")
+        result = runner.invoke(app, ["sync", "--comments"])
+        assert "1 cards re-indexed" in result.output
+        assert "/api/cards/20/comments" not in paths
+        assert search("ship") == ["20"]
+
+    def test_offline_without_mirror(self, tmp_path, monkeypatch):
+        """--offline should explain how to build the mirror when there is none."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        result = runner.invoke(app, ["--offline", "boards", "list"])
+        assert result.exit_code == 1
+        assert "planka-cli sync" in result.output
+
+
+class TestTransport:
+    """Test the retrying HTTP transport and its configuration."""
+
+    def make_client(self, handler, **config) -> httpx.Client:
+        transport = make_transport(
+            dict(HTTP_CONFIG_DEFAULTS, backoff=0.0, **config), httpx.MockTransport(handler)
+        )
+        return httpx.Client(base_url="https://p.example", transport=transport)
+
+    def test_retries_idempotent_requests_and_honors_retry_after(self, monkeypatch):
+        """GETs retry on 503 (waiting Retry-After); POSTs are not replayed after a 502."""
+        sleeps = []
+        monkeypatch.setattr("scripts.planka_cli.time.sleep", sleeps.append)
+        for key in HTTP_STATS:
+            monkeypatch.setitem(HTTP_STATS, key, 0)
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            if len(calls) == 1:
+                return httpx.Response(503, headers={"Retry-After": "2"})
+            if request.method == "POST":
+                return httpx.Response(502)
+            return httpx.Response(200, stream=httpx.ByteStream(b'{"item": "ok"}'))
+
+        client = self.make_client(handler)
+        assert client.get("/api/projects").json() == {"item": "ok"}
+        assert sleeps == [2.0]
+        assert client.post("/api/cards", json={}).status_code == 502
+        assert calls == ["GET", "GET", "POST"]
+        assert HTTP_STATS["requests"] == 3 and HTTP_STATS["retries"] == 1
+        assert HTTP_STATS["bytes_received"] == len(b'{"item": "ok"}')
+
+    def test_gives_up_after_retries(self, monkeypatch):
+        """Connection errors are retried, then reported with the request that failed."""
+        monkeypatch.setattr("scripts.planka_cli.time.sleep", lambda seconds: None)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        with pytest.raises(httpx.ConnectError, match="after 3 attempt"):
+            self.make_client(handler, retries=2).get("/api/projects")
+
+    def test_trace_summary_and_chrome_trace(self, tmp_path, monkeypatch):
+        """--trace-file records each request with its caller and writes trace events."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/projects":
+                project = {"id": "1", "name": "P", "createdAt": "2025-01-01T00:00:00Z"}
+                return httpx.Response(200, json={"items": [project]})
+            return httpx.Response(200, json={"item": {"id": "1", "name": "P"}, "included": {}})
+
+        install_planka(monkeypatch, tmp_path, handler, wrap=make_trace_transport)
+        trace_file = tmp_path / "trace.json"
+        result = runner.invoke(
+            app, ["--output", "json", "--trace-file", str(trace_file), "projects", "list"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Trace: 1 requests" in result.output
+        assert "GET /api/projects" in result.output
+        events = json.loads(trace_file.read_text())["traceEvents"]
+        assert [event["cat"] for event in events] == ["command", "http"]
+        assert events[1]["name"] == "GET /api/projects"
+        assert events[1]["args"]["caller"] == "list_projects"
+        assert events[1]["args"]["bytes"] > 0 and events[1]["dur"] >= 0
+
+    def test_config_file_and_env(self, tmp_path, monkeypatch):
+        """Env vars override config.json, which overrides the defaults."""
+        (tmp_path / "config.json").write_text(json.dumps({"http": {"retries": 5, "backoff": 1}}))
+        monkeypatch.setenv("PLANKA_HTTP_RETRIES", "1")
+        config = load_http_config(str(tmp_path))
+        assert config["retries"] == 1
+        assert config["backoff"] == 1.0
+        assert config["read_timeout"] == HTTP_CONFIG_DEFAULTS["read_timeout"]
+
+
+class TestFanOut:
+    """Test the bounded, order-preserving fan-out used to walk the hierarchy."""
+
+    def test_board_listing_runs_in_parallel_and_keeps_order(self, tmp_path, monkeypatch):
+        """Per-project fetches overlap, but boards come out in project order."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/projects":
+                projects = [{"id": str(i), "name": f"P{i}"} for i in range(1, 5)]
+                return httpx.Response(200, json={"items": projects, "included": {}})
+            project_id = request.url.path.rsplit("/", 1)[1]
+            with lock:
+                active.append(project_id)
+                peak.append(len(active))
+            # Later projects answer first.
+            time.sleep(0.05 * (5 - int(project_id)))
+            with lock:
+                active.remove(project_id)
+            board = {"id": f"b{project_id}", "name": "Board", "projectId": project_id}
+            return httpx.Response(200, json={"item": {}, "included": {"boards": [board]}})
+
+        install_planka(monkeypatch, tmp_path, handler)
+        result = runner.invoke(app, ["--concurrency", "3", "--output", "json", "boards", "list"])
+        assert [row["id"] for row in json.loads(result.output)] == ["b1", "b2", "b3", "b4"]
+        assert max(peak) == 3
+
+    def test_cards_show_stays_within_concurrency(self, tmp_path, monkeypatch):
+        """Several cards with their sub-requests never exceed --concurrency in flight."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                active.append(request)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(request)
+            if request.url.path.endswith("/comments"):
+                return httpx.Response(200, json={"items": [], "included": {"users": []}})
+            item_id = request.url.path.rsplit("/", 1)[1]
+            card = {"id": item_id, "name": f"Card {item_id}", "listId": "L", "boardId": "B"}
+            lst = {"id": "L", "name": "Todo", "boardId": "B", "type": "active"}
+            item = lst if "/lists/" in request.url.path else card
+            return httpx.Response(200, json={"item": item, "included": {}})
+
+        install_planka(monkeypatch, tmp_path, handler)
+        argv = ["--concurrency", "2", "--output", "ndjson", "cards", "show", "1", "2", "3", "4"]
+        result = runner.invoke(app, argv)
+        assert result.exit_code == 0, result.output
+        assert len(result.output.splitlines()) == 4
+        assert max(peak) <= 2
+
+    @pytest.mark.parametrize("engine", ["threads", "async"])
+    def test_server_errors_are_not_reported_as_missing(self, tmp_path, monkeypatch, engine):
+        """Both engines surface a 500 on a card lookup instead of calling the card missing."""
+        with FakePlanka(projects=1, boards=1, lists=1, cards=1) as server:
+            monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+            monkeypatch.setenv("PLANKA_URL", server.url)
+            monkeypatch.setenv("PLANKA_USERNAME", "alice")
+            monkeypatch.setenv("PLANKA_PASSWORD", "secret")
+            monkeypatch.setattr("scripts.planka_cli.PLANKA_SESSIONS", {})
+            card_id = next(iter(server.cards))
+            route = server.route
+
+            def failing(method, path, query, body):
+                if path.endswith(f"/cards/{card_id}"):
+                    return 500, {"message": "boom"}
+                return route(method, path, query, body)
+
+            monkeypatch.setattr(server, "route", failing)
+            result = runner.invoke(app, ["--engine", engine, "cards", "show", card_id])
+        assert "not found" not in result.output
+        assert "Error:" in result.output
+
+
+class TestImport:
+    """Test bulk card import from CSV/JSONL."""
+
+    def handler(self, created: list, fail_names: set):
+        def handle(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/lists/10" and request.method == "GET":
+                list_item = {"id": "10", "name": "Todo", "boardId": "5", "type": "active"}
+                cards = [{"id": "1", "position": 65536}]
+                return httpx.Response(200, json={"item": list_item, "included": {"cards": cards}})
+            if request.url.path == "/api/lists/10/cards":
+                payload = json.loads(request.content)
+                if payload["name"] in fail_names:
+                    return httpx.Response(500, json={"message": "boom"})
+                created.append(payload)
+                card = {"id": f"c{len(created)}", **payload}
+                return httpx.Response(200, json={"item": card, "included": {}})
+            return httpx.Response(404, json={})
+
+        return handle
+
+    def test_import_keeps_order_and_resumes(self, tmp_path, monkeypatch):
+        """Positions follow file order; --resume only retries rows that did not succeed."""
+        created = []
+        fail_names = {"Beta"}
+        install_planka(monkeypatch, tmp_path, self.handler(created, fail_names))
+        source = tmp_path / "backlog.csv"
+        source.write_text(
+            "name,description,due_date\nAlpha,first,2025-02-01\nBeta,,\n,,\nGamma,,\n"
+        )
+
+        result = runner.invoke(
+            app,
+            [
+                "--concurrency",
+                "2",
+                "cards",
+                "import",
+                str(source),
+                "--list-id",
+                "10",
+                "--rate",
+                "0",
+            ],
+        )
+        assert result.exit_code == 1
+        assert "Imported 2 cards" in result.output
+        by_name = {card["name"]: card for card in created}
+        assert by_name["Alpha"]["position"] == 2 * 65536
+        assert by_name["Gamma"]["position"] == 4 * 65536
+        assert by_name["Alpha"]["dueDate"] == "2025-02-01T00:00:00+00:00"
+        results = [json.loads(line) for line in (tmp_path / "backlog.csv.results.jsonl").open()]
+        assert {r["row"]: r["status"] for r in results} == {
+            1: "created",
+            2: "error",
+            3: "error",
+            4: "created",
+        }
+
+        fail_names.clear()
+        created.clear()
+        result = runner.invoke(
+            app, ["cards", "import", str(source), "--list-id", "10", "--resume", "--rate", "0"]
+        )
+        assert [card["name"] for card in created] == ["Beta"]
+        assert created[0]["position"] == 3 * 65536
+        assert "2 skipped" in result.output
+
+    def test_server_errors_are_not_reported_as_missing_lists(self, tmp_path, monkeypatch):
+        """A failing list lookup aborts the import instead of marking rows "not found"."""
+        created = []
+        handle = self.handler(created, set())
+
+        def failing(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/lists/11":
+                return httpx.Response(500, json={"message": "boom"})
+            return handle(request)
+
+        install_planka(monkeypatch, tmp_path, failing)
+        source = tmp_path / "backlog.csv"
+        source.write_text("name,list_id\nAlpha,11\nBeta,11\n")
+
+        result = runner.invoke(app, ["cards", "import", str(source), "--rate", "0"])
+        assert result.exit_code == 1
+        assert created == []
+        assert "not found" not in result.output
+        assert "500" in result.output
+
+
+class TestBulk:
+    """Test filter-driven bulk card changes."""
+
+    def handler(self, writes: list):
+        cards = [
+            {
+                "id": "20",
+                "name": "Old done",
+                "listId": "10",
+                "boardId": "5",
+                "position": 2,
+                "updatedAt": "2020-01-01T00:00:00.000Z",
+            },
+            {
+                "id": "21",
+                "name": "Older done",
+                "listId": "10",
+                "boardId": "5",
+                "position": 1,
+                "updatedAt": "2019-01-01T00:00:00.000Z",
+            },
+            {
+                "id": "22",
+                "name": "Fresh done",
+                "listId": "10",
+                "boardId": "5",
+                "position": 3,
+                "updatedAt": "2999-01-01T00:00:00.000Z",
+            },
+            {
+                "id": "23",
+                "name": "Old todo",
+                "listId": "12",
+                "boardId": "5",
+                "position": 1,
+                "updatedAt": "2020-01-01T00:00:00.000Z",
+            },
+        ]
+        lists = {
+            "10": {"id": "10", "name": "Done", "boardId": "5", "position": 2, "type": "active"},
+            "11": {"id": "11", "name": "Archive", "boardId": "5", "position": 3, "type": "active"},
+            "12": {"id": "12", "name": "Todo", "boardId": "5", "position": 1, "type": "active"},
+        }
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if request.method != "GET":
+                writes.append((request.method, path, json.loads(request.content or b"null")))
+                if path == "/api/cards/21" and request.method == "DELETE":
+                    return httpx.Response(403, json={"message": "nope"})
+                return httpx.Response(200, json={"item": {"id": path.rsplit("/", 1)[1]}})
+            if path.startswith("/api/lists/"):
+                list_item = lists[path.rsplit("/", 1)[1]]
+                included = {"cards": [{"id": "30", "position": 65536}]}
+                return httpx.Response(200, json={"item": list_item, "included": included})
+            if path == "/api/boards/5":
+                included = {"lists": list(lists.values()), "cards": cards}
+                return httpx.Response(200, json={"item": {"id": "5"}, "included": included})
+            return httpx.Response(404, json={})
+
+        return handle
+
+    def test_dry_run_then_move(self, tmp_path, monkeypatch):
+        """The plan lists matches in board order; applying moves them below the target."""
+        writes = []
+        install_planka(monkeypatch, tmp_path, self.handler(writes))
+        args = ["cards", "bulk", "--list", "10", "--older-than", "30", "--move-to", "11"]
+
+        result = runner.invoke(app, ["--output", "json", *args, "--dry-run"])
+        plan = json.loads(result.output)
+        assert [row["id"] for row in plan] == ["21", "20"]
+        assert plan[0]["action"] == "move to Archive (11)"
+        assert writes == []
+
+        result = runner.invoke(app, ["--output", "json", *args, "--yes"])
+        assert [row["status"] for row in json.loads(result.output)] == ["ok", "ok"]
+        assert sorted(writes, key=lambda w: w[1]) == [
+            ("PATCH", "/api/cards/20", {"listId": "11", "boardId": "5", "position": 3 * 65536}),
+            ("PATCH", "/api/cards/21", {"listId": "11", "boardId": "5", "position": 2 * 65536}),
+        ]
+
+    def test_delete_reports_each_outcome(self, tmp_path, monkeypatch):
+        """A failed item is reported without stopping the others."""
+        writes = []
+        install_planka(monkeypatch, tmp_path, self.handler(writes))
+        result = runner.invoke(
+            app,
+            ["--output", "json", "cards", "bulk", "--board", "5", "--name", "^Old", "--delete"],
+            input="y\n",
+        )
+        assert result.exit_code == 1
+        # The plan goes to stderr before the prompt, leaving stdout to the JSON results.
+        assert "Plan: 3 cards" in result.stderr and "Apply to 3 cards?" in result.stderr
+        # (CliRunner echoes the typed answer to stdout; a terminal would not.)
+        outcomes = json.loads(result.stdout.splitlines()[-1])
+        assert {o["id"]: o["status"] for o in outcomes} == {
+            "20": "ok",
+            "21": "error",
+            "23": "ok",
+        }
+
+
+class TestCache:
+    """Test the opt-in on-disk response cache."""
+
+    def test_hits_revalidates_and_invalidates(self, tmp_path, monkeypatch):
+        """Fresh entries skip the network, stale ones send If-None-Match, writes drop entries."""
+        monkeypatch.setenv("PLANKATOKENS", str(tmp_path))
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.method, request.headers.get("If-None-Match")))
+            if request.method == "GET" and request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            if request.method == "GET":
+                return httpx.Response(200, json={"items": [1, 2]}, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json={"item": {}})
+
+        config = dict(HTTP_CONFIG_DEFAULTS, cache=True)
+        transport = make_cache_transport(
+            httpx.MockTransport(handler), config, "alice", str(tmp_path)
+        )
+        client = httpx.Client(base_url="https://p.example", transport=transport)
+
+        assert client.get("/api/projects").json() == {"items": [1, 2]}
+        assert client.get("/api/projects").json() == {"items": [1, 2]}
+        assert seen == [("GET", None)]
+
+        config["cache_ttl_projects"] = 0.0
+        assert client.get("/api/projects").json() == {"items": [1, 2]}
+        assert seen[-1] == ("GET", '"v1"')
+
+        client.post("/api/projects", json={})
+        config["cache_ttl_projects"] = 300.0
+        client.get("/api/projects")
+        assert seen[-1] == ("GET", None)
+
+        result = runner.invoke(app, ["--output", "json", "cache", "stats"])
+        stats = json.loads(result.output)
+        assert (stats["hits"], stats["revalidated"], stats["misses"]) == (1, 1, 2)
+        assert stats["entries"] == 1
+
+        runner.invoke(app, ["cache", "clear"])
+        result = runner.invoke(app, ["--output", "json", "cache", "stats"])
+        assert json.loads(result.output)["entries"] == 0
+
+
+class TestNotificationsWatch:
+    """Test the polling notification feed."""
+
+    def test_watch_emits_new_notifications_once_and_marks_read(self, tmp_path, monkeypatch):
+        """Unchanged polls cost a 304; new items stream as NDJSON and exactly they are
+        acknowledged, never with a read-all that could cover unprinted arrivals."""
+        unread = {"1": "commentCard"}
+        arrivals = {3: {"2": "moveCard", "3": "commentCard"}}
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            if request.url.path == "/api/notifications/read-all":
+                unread.clear()
+                return httpx.Response(200, json={"items": []})
+            if request.method == "PATCH":
+                unread.pop(request.url.path.rsplit("/")[-1])
+                return httpx.Response(200, json={"item": {}})
+            unread.update(arrivals.pop(sum(method == "GET" for method, _ in calls), {}))
+            etag = '"' + ",".join(unread) + '"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            items = [
+                {"id": key, "type": kind, "isRead": False, "createdAt": f"2024-01-0{key}T00:00:00Z"}
+                for key, kind in unread.items()
+            ]
+            return httpx.Response(200, json={"items": items}, headers={"ETag": etag})
+
+        install_planka(monkeypatch, tmp_path, handler)
+        monkeypatch.setattr("scripts.planka_cli.time.sleep", lambda seconds: None)
+        result = runner.invoke(
+            app, ["--output", "ndjson", "notifications", "watch", "--mark-read", "--polls", "3"]
+        )
+        assert result.exit_code == 0, result.output
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [row["id"] for row in rows] == ["1", "2", "3"]
+        patched = {path.rsplit("/", 1)[1] for method, path in calls if method == "PATCH"}
+        assert patched == {"1", "2", "3"}
+        assert ("POST", "/api/notifications/read-all") not in calls
+
+
+class TestBoardArchive:
+    """Test board export and import."""
+
+    def test_export_then_import_remaps_ids(self, tmp_path, monkeypatch):
+        """An export streams every collection; an import recreates it under new IDs."""
+        board = {"id": "5", "name": "Roadmap", "projectId": "1", "position": 65536}
+        included = {
+            "labels": [
+                {"id": "L1", "boardId": "5", "position": 1, "name": "bug", "color": "berry-red"}
+            ],
+            "lists": [
+                {"id": "10", "boardId": "5", "type": "active", "position": 1, "name": "Todo"},
+                {"id": "11", "boardId": "5", "type": "trash", "position": None, "name": None},
+            ],
+            "cards": [
+                {"id": "20", "listId": "10", "type": "project", "position": 1, "name": "A"},
+                {"id": "21", "listId": "11", "type": "project", "position": 2, "name": "B"},
+            ],
+            "cardLabels": [{"id": "CL1", "cardId": "20", "labelId": "L1"}],
+            "taskLists": [{"id": "TL1", "cardId": "20", "position": 1, "name": "Steps"}],
+            "tasks": [{"id": "T1", "taskListId": "TL1", "position": 1, "name": "Do"}],
+            "attachments": [
+                {
+                    "id": "A1",
+                    "cardId": "20",
+                    "type": "link",
+                    "name": "Spec",
+                    "data": {"url": "https://x"},
+                },
+                {"id": "A2", "cardId": "20", "type": "file", "name": "log.txt", "data": {}},
+            ],
+        }
+        # Two pages for card 20, newest first.
+        pages = {
+            None: [{"id": str(100 - n), "cardId": "20", "text": f"c{100 - n}"} for n in range(50)],
+            "51": [{"id": "50", "cardId": "20", "text": "c50"}],
+        }
+
+        def export_handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/boards/5":
+                return httpx.Response(200, json={"item": board, "included": included})
+            if request.url.path.endswith("/comments"):
+                if request.url.path == "/api/cards/20/comments":
+                    items = pages[request.url.params.get("beforeId")]
+                else:
+                    items = []
+                return httpx.Response(200, json={"items": items})
+            return httpx.Response(404, json={})
+
+        install_planka(monkeypatch, tmp_path, export_handler)
+        archive = tmp_path / "board.jsonl.gz"
+        result = runner.invoke(app, ["boards", "export", "5", "-o", str(archive)])
+        assert result.exit_code == 0, result.output
+        assert "2 cards" in result.output and "51 comments" in result.output
+
+        created = []
+
+        def import_handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET" and request.url.path == "/api/boards/B5":
+                trash = {"id": "Ntrash", "type": "trash"}
+                return httpx.Response(200, json={"item": {}, "included": {"lists": [trash]}})
+            payload = json.loads(request.content)
+            kind = request.url.path.rsplit("/", 1)[-1]
+            parent = request.url.path.split("/")[-2]
+            new_id = "B5" if kind == "boards" else f"N{len(created)}"
+            created.append((kind, parent, payload))
+            return httpx.Response(200, json={"item": {"id": new_id, **payload}})
+
+        install_planka(monkeypatch, tmp_path, import_handler)
+        result = runner.invoke(app, ["boards", "import", str(archive), "--project-id", "P"])
+        assert result.exit_code == 0, result.output
+        assert "0 failed, 1 skipped" in " ".join(result.output.split())
+        kinds = [kind for kind, _, _ in created]
+        assert kinds[:3] == ["boards", "labels", "lists"]
+        new_ids = {
+            payload.get("name") or payload.get("text"): f"N{i}"
+            for i, (_, _, payload) in enumerate(created)
+        }
+        cards = {payload["name"]: parent for kind, parent, payload in created if kind == "cards"}
+        assert cards == {"A": new_ids["Todo"], "B": "Ntrash"}
+        label = next(payload for kind, _, payload in created if kind == "card-labels")
+        assert label == {"labelId": new_ids["bug"]}
+        comments = [payload["text"] for kind, _, payload in created if kind == "comments"]
+        assert comments == [f"c{n}" for n in range(50, 101)]
+        attachments = [payload for kind, _, payload in created if kind == "attachments"]
+        assert attachments == [{"type": "link", "url": "https://x", "name": "Spec"}]
+
+
+class TestPaging:
+    """Test lazily paged comments and cursor-filtered notifications."""
+
+    def comments_handler(self, requests: list):
+        comments = [
+            {"id": str(n), "cardId": "20", "userId": "1", "text": f"c{n}", "createdAt": None}
+            for n in range(120, 0, -1)
+        ]
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            requests.append(dict(request.url.params))
+            before = request.url.params.get("beforeId")
+            older = [c for c in comments if not before or int(c["id"]) < int(before)]
+            users = [{"id": "1", "name": "Al"}]
+            return httpx.Response(200, json={"items": older[:50], "included": {"users": users}})
+
+        return handle
+
+    def test_comments_fetch_only_the_pages_they_need(self, tmp_path, monkeypatch):
+        """--limit stops after one page; --all follows beforeId; --after stops at the cursor."""
+        requests = []
+        install_planka(monkeypatch, tmp_path, self.comments_handler(requests))
+
+        result = runner.invoke(
+            app, ["--output", "ndjson", "cards", "comments", "20", "--limit", "3"]
+        )
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [row["id"] for row in rows] == ["120", "119", "118"]
+        assert rows[0]["user"] == "Al"
+        assert requests == [{}]
+
+        requests.clear()
+        result = runner.invoke(app, ["--output", "ndjson", "cards", "comments", "20", "--all"])
+        assert len(result.output.splitlines()) == 120
+        assert requests == [{}, {"beforeId": "71"}, {"beforeId": "21"}]
+
+        requests.clear()
+        result = runner.invoke(
+            app,
+            [
+                "--output",
+                "ndjson",
+                "cards",
+                "comments",
+                "20",
+                "--before",
+                "60",
+                "--after",
+                "55",
+                "--all",
+            ],
+        )
+        assert [json.loads(line)["id"] for line in result.output.splitlines()] == [
+            "59",
+            "58",
+            "57",
+            "56",
+        ]
+        assert requests == [{"beforeId": "60"}]
+
+    def test_notification_cursors(self, tmp_path, monkeypatch):
+        """Notifications come newest first and honor --limit, --before and --after."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            items = [
+                {
+                    "id": str(n),
+                    "type": "commentCard",
+                    "isRead": n == 4,
+                    "createdAt": "2025-01-01T00:00:00Z",
+                }
+                for n in range(1, 6)
+            ]
+            return httpx.Response(200, json={"items": items})
+
+        install_planka(monkeypatch, tmp_path, handler)
+        result = runner.invoke(
+            app, ["--output", "ndjson", "notifications", "all", "--before", "5", "--limit", "2"]
+        )
+        assert [json.loads(line)["id"] for line in result.output.splitlines()] == ["4", "3"]
+        result = runner.invoke(
+            app, ["--output", "ndjson", "notifications", "unread", "--after", "2"]
+        )
+        assert [json.loads(line)["id"] for line in result.output.splitlines()] == ["5", "3"]
+
+
+class TestAttachments:
+    """Test streamed attachment downloads against the fake server."""
+
+    @pytest.fixture
+    def fake(self, tmp_path, monkeypatch):
+        with FakePlanka(projects=1, boards=1, lists=1, cards=2) as server:
+            monkeypatch.setenv("PLANKATOKENS", str(tmp_path / "tokens"))
+            monkeypatch.setenv("PLANKA_URL", server.url)
+            monkeypatch.setenv("PLANKA_USERNAME", "alice")
+            monkeypatch.setenv("PLANKA_PASSWORD", "secret")
+            monkeypatch.setattr("scripts.planka_cli.PLANKA_SESSIONS", {})
+            yield server
+
+    def download(self, *argv: str) -> dict[str, dict]:
+        result = runner.invoke(app, ["--output", "json", "cards", "attachments", "download", *argv])
+        assert result.exit_code == 0, result.output
+        return {Path(row["path"]).name: row for row in json.loads(result.output)}
+
+    def test_download_streams_resumes_and_skips(self, fake, tmp_path):
+        """Files are streamed to disk; a .part file resumes and complete files are skipped."""
+        import tracemalloc
+
+        first, second = list(fake.cards)
+        big = bytes(range(256)) * 128 * 1024
+        fake.add_attachment(first, "build.bin", big)
+        fake.add_attachment(first, "notes.txt", b"hello")
+        out = tmp_path / "out"
+
+        tracemalloc.start()
+        try:
+            rows = self.download(first, "-o", str(out))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Peak memory stays well under the 32 MiB file.
+        assert peak < len(big) // 4
+        assert {name: row["status"] for name, row in rows.items()} == {
+            "build.bin": "downloaded",
+            "notes.txt": "downloaded",
+        }
+        assert (out / "build.bin").read_bytes() == big
+        assert not list(out.glob("*.part"))
+
+        (out / "build.bin").unlink()
+        (out / "build.bin.part").write_bytes(big[:1000])
+        fake.reset()
+        rows = self.download(first, "-o", str(out))
+        assert rows["build.bin"]["status"] == "resumed"
+        assert rows["build.bin"]["bytes"] == len(big) - 1000
+        assert rows["notes.txt"]["status"] == "skipped"
+        assert fake.ranges == ["bytes=1000-"]
+        assert (out / "build.bin").read_bytes() == big
+
+    def test_complete_part_file_without_recorded_size(self, fake, tmp_path):
+        """A 416 on resume finalizes a complete .part file and restarts a stale one."""
+        first, _ = list(fake.cards)
+        del fake.add_attachment(first, "notes.txt", b"hello")["data"]["size"]
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "notes.txt.part").write_bytes(b"hello")
+        rows = self.download(first, "-o", str(out))
+        assert (rows["notes.txt"]["status"], rows["notes.txt"]["bytes"]) == ("resumed", 0)
+        assert (out / "notes.txt").read_bytes() == b"hello"
+
+        (out / "notes.txt").unlink()
+        (out / "notes.txt.part").write_bytes(b"hello, stale")
+        fake.reset()
+        rows = self.download(first, "-o", str(out))
+        assert rows["notes.txt"]["status"] == "downloaded"
+        assert fake.ranges == ["bytes=12-", None]
+        assert (out / "notes.txt").read_bytes() == b"hello"
+        assert not list(out.glob("*.part"))
+
+    def test_board_download_uses_a_folder_per_card(self, fake, tmp_path):
+        """--board saves every card's files under the card's ID."""
+        first, second = list(fake.cards)
+        fake.add_attachment(first, "a.txt", b"one")
+        fake.add_attachment(second, "a.txt", b"two")
+        board_id = next(iter(fake.boards))
+        out = tmp_path / "out"
+        result = runner.invoke(app, ["cards", "attachments", "download", "--board", board_id])
+        assert result.exit_code != 0
+        self.download("--board", board_id, "-o", str(out))
+        assert (out / first / "a.txt").read_bytes() == b"one"
+        assert (out / second / "a.txt").read_bytes() == b"two"
+
+    def test_attach_uploads_files_concurrently(self, fake, tmp_path):
+        """Every file is uploaded to the card and reported with its throughput."""
+        card_id = next(iter(fake.cards))
+        big = tmp_path / "build.tar.gz"
+        big.write_bytes(bytes(range(256)) * 16 * 1024)
+        small = tmp_path / "notes.txt"
+        small.write_text("release notes")
+        argv = ["--output", "json", "cards", "attach", card_id, str(big), str(small)]
+        result = runner.invoke(app, argv)
+        assert result.exit_code == 0, result.output
+        rows = json.loads(result.stdout)
+        assert [(Path(row["file"]).name, row["status"]) for row in rows] == [
+            ("build.tar.gz", "uploaded"),
+            ("notes.txt", "uploaded"),
+        ]
+        assert all(row["rate"] > 0 for row in rows)
+        assert "Uploaded 2 of 2 files" in result.stderr
+        uploaded = {fake.attachments[row["id"]]["name"]: fake.files[row["id"]] for row in rows}
+        assert uploaded == {"build.tar.gz": big.read_bytes(), "notes.txt": b"release notes"}